@@ -0,0 +1,78 @@
+"""Bulk import benchmark: 1,000 videos with their cues, saved one by one or with save_videos.
+
+Each strategy starts from an empty temporary database. "original" is the access pattern of the
+first version (a new connection and a commit per row, no cues), for comparison.
+
+Usage:
+    python bench/db_bulk_import.py --videos 1000 --cues 20 [--dir .]
+"""
+import os
+import sys
+import time
+import shutil
+import tempfile
+import argparse
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.models import database
+from src.utils.batch_ingest import SAVE_BATCH_SIZE
+from db_concurrency import legacy_init, legacy_save_video, video_row
+
+def make_videos(count, cues):
+    videos = []
+    for n in range(count):
+        video = dict(zip(database.VIDEO_COLUMNS, video_row(n)))
+        video["audio_stats"] = {"duration": 600, "audio_bytes": 5_000_000, "codec": "mp4a.40.2"}
+        video["cues"] = [{"start": i * 2.5, "duration": 2.5, "text": f"Cue {i} of video {n}"} for i in range(cues)]
+        videos.append(video)
+    return videos
+
+def original(path, videos):
+    legacy_init(path)
+    for video in videos:
+        legacy_save_video(path, tuple(video[column] for column in database.VIDEO_COLUMNS))
+
+def save_each(path, videos):
+    for video in videos:
+        database.save_videos([video])
+
+def save_batches(path, videos):
+    for start in range(0, len(videos), SAVE_BATCH_SIZE):
+        database.save_videos(videos[start:start + SAVE_BATCH_SIZE])
+
+def save_all(path, videos):
+    database.save_videos(videos)
+
+STRATEGIES = (
+    ("original: connection + commit per row, no cues", original, False),
+    ("save_videos, one transaction per video", save_each, True),
+    (f"save_videos, batches of {SAVE_BATCH_SIZE} (batch ingest)", save_batches, True),
+    ("save_videos, one transaction", save_all, True),
+)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--videos", type=int, default=1000)
+    parser.add_argument("--cues", type=int, default=20, help="Cues per video")
+    parser.add_argument("--dir", default=None, help="Where to create the temporary databases (default: system temp)")
+    args = parser.parse_args(argv)
+    videos = make_videos(args.videos, args.cues)
+    print(f"{args.videos} videos, {args.cues} cues each")
+    for name, strategy, uses_database in STRATEGIES:
+        folder = tempfile.mkdtemp(prefix="db_bench_", dir=args.dir)
+        path = os.path.join(folder, "bench.db")
+        if uses_database:
+            database.close_connections()
+            database.DATABASE_PATH = path
+            database.init_db()
+        started = time.perf_counter()
+        strategy(path, videos)
+        elapsed = time.perf_counter() - started
+        print(f"  {name:<50} {elapsed:7.3f}s  {args.videos / elapsed:9.0f} videos/s")
+        database.close_connections()
+        shutil.rmtree(folder, ignore_errors=True)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
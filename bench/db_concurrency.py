@@ -0,0 +1,148 @@
+"""Concurrent save_video / get_all_videos benchmark.
+
+Writer threads save videos while reader threads list the whole library, on a temporary
+database seeded with --rows videos. Writers re-save the seeded videos (upserts), so the library
+keeps the same size and the read cost does not depend on how many writes succeeded. Runs the current database layer (per-thread WAL connections,
+one write lock) and, for comparison, the original access pattern (a new connection per call,
+rollback journal, INSERT OR REPLACE).
+
+Usage:
+    python bench/db_concurrency.py --writers 4 --readers 4 --seconds 5 --rows 2000
+"""
+import os
+import sys
+import time
+import sqlite3
+import shutil
+import tempfile
+import argparse
+import threading
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.models import database
+
+def percentile(values, fraction):
+    if not values:
+        return 0.0
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * fraction))]
+
+def video_row(n):
+    return (f"bench{n:06d}", f"Benchmark video {n}", f"src/downloads/audio_{n}.mp3",
+            f"src/downloads/sub_{n}.json", None, f"2024-01-01 00:{n // 60 % 60:02d}:{n % 60:02d}")
+
+# --- Original access pattern (baseline commit), for comparison ---
+
+def legacy_init(path):
+    conn = sqlite3.connect(path)
+    conn.execute(
+        "CREATE TABLE IF NOT EXISTS videos (id INTEGER PRIMARY KEY AUTOINCREMENT, video_id TEXT UNIQUE, "
+        "title TEXT, audio_path TEXT, subtitle_path TEXT, thumbnail_path TEXT, download_date TIMESTAMP)")
+    conn.commit()
+    conn.close()
+
+def legacy_seed(path, rows):
+    conn = sqlite3.connect(path)
+    conn.executemany(
+        "INSERT OR REPLACE INTO videos (video_id, title, audio_path, subtitle_path, thumbnail_path, download_date) "
+        "VALUES (?, ?, ?, ?, ?, ?)", rows)
+    conn.commit()
+    conn.close()
+
+def legacy_save_video(path, row):
+    conn = sqlite3.connect(path)
+    conn.execute(
+        "INSERT OR REPLACE INTO videos (video_id, title, audio_path, subtitle_path, thumbnail_path, download_date) "
+        "VALUES (?, ?, ?, ?, ?, ?)", row)
+    conn.commit()
+    conn.close()
+
+def legacy_get_all_videos(path):
+    conn = sqlite3.connect(path)
+    conn.row_factory = sqlite3.Row
+    rows = conn.execute("SELECT * FROM videos ORDER BY download_date DESC").fetchall()
+    conn.close()
+    return rows
+
+# --- Current database layer ---
+
+def current_init(path):
+    database.close_connections()
+    database.DATABASE_PATH = path
+    database.init_db()
+
+def current_seed(path, rows):
+    database.save_videos([dict(zip(database.VIDEO_COLUMNS, row)) for row in rows])
+
+def current_save_video(path, row):
+    database.save_video(*row)
+
+def current_get_all_videos(path):
+    return database.get_all_videos()
+
+def run(name, init, seed, save_video, get_all_videos, args):
+    folder = tempfile.mkdtemp(prefix="db_bench_")
+    path = os.path.join(folder, "bench.db")
+    init(path)
+    seed(path, [video_row(n) for n in range(args.rows)])
+
+    stop = threading.Event()
+    results = {"write": [], "read": [], "errors": []}
+    lock = threading.Lock()
+    next_row = [0]
+
+    def worker(kind):
+        latencies = []
+        while not stop.is_set():
+            started = time.perf_counter()
+            try:
+                if kind == "write":
+                    with lock:
+                        n = next_row[0] % args.rows
+                        next_row[0] += 1
+                    save_video(path, video_row(n))
+                else:
+                    get_all_videos(path)
+            except sqlite3.Error as e:
+                with lock:
+                    results["errors"].append(f"{kind}: {e}")
+                continue
+            latencies.append(time.perf_counter() - started)
+        with lock:
+            results[kind].extend(latencies)
+
+    threads = ([threading.Thread(target=worker, args=("write",)) for _ in range(args.writers)]
+               + [threading.Thread(target=worker, args=("read",)) for _ in range(args.readers)])
+    for thread in threads:
+        thread.start()
+    time.sleep(args.seconds)
+    stop.set()
+    for thread in threads:
+        thread.join()
+
+    print(f"{name}:")
+    for kind in ("write", "read"):
+        latencies = results[kind]
+        print(f"  {kind:<5} {len(latencies) / args.seconds:9.1f} ops/s   "
+              f"p50 {percentile(latencies, 0.5) * 1000:7.2f} ms   p95 {percentile(latencies, 0.95) * 1000:7.2f} ms   "
+              f"max {max(latencies, default=0) * 1000:7.2f} ms")
+    print(f"  errors {len(results['errors'])}" + (f" (first: {results['errors'][0]})" if results["errors"] else ""))
+    database.close_connections()
+    shutil.rmtree(folder, ignore_errors=True)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--writers", type=int, default=4)
+    parser.add_argument("--readers", type=int, default=4)
+    parser.add_argument("--seconds", type=float, default=5.0)
+    parser.add_argument("--rows", type=int, default=2000, help="Videos in the library before the run")
+    args = parser.parse_args(argv)
+    print(f"{args.writers} writers, {args.readers} readers, {args.seconds:.0f}s, {args.rows} videos to start with")
+    run("per-call connections (original)", legacy_init, legacy_seed, legacy_save_video, legacy_get_all_videos, args)
+    run("per-thread WAL connections (current)", current_init, current_seed, current_save_video,
+        current_get_all_videos, args)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
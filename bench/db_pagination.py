@@ -0,0 +1,93 @@
+"""Library listing benchmark: the first page, a deep page and a full walk over --rows videos.
+
+Compares keyset pagination (get_videos_page, what the library view uses) with OFFSET paging and
+with loading the whole list at once, the original get_all_videos(). Each run uses a temporary
+database; the query plan of the keyset query is printed so a missing index shows up.
+
+Usage:
+    python bench/db_pagination.py --rows 50000 --page-size 50 [--dir .]
+"""
+import os
+import sys
+import time
+import shutil
+import tempfile
+import argparse
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.models import database
+
+KEYSET_QUERY = ("SELECT * FROM videos WHERE (download_date, id) < (?, ?) "
+                "ORDER BY download_date DESC, id DESC LIMIT ?")
+
+def seed(rows):
+    videos = []
+    for n in range(rows):
+        videos.append({
+            "video_id": f"page{n:06d}",
+            "title": f"Benchmark video {n}",
+            "audio_path": f"src/downloads/audio_{n}.mp3",
+            "subtitle_path": None,
+            "thumbnail_path": None,
+            # A few videos share a timestamp, as in a batch ingest, so the id tie-break is exercised
+            "download_date": f"2024-01-01 00:00:00.{n // 3:06d}",
+        })
+    database.save_videos(videos)
+
+def percentile(values, fraction):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * fraction))]
+
+def timed(fn, *args):
+    started = time.perf_counter()
+    result = fn(*args)
+    return result, (time.perf_counter() - started) * 1000
+
+def offset_page(page_size, offset):
+    return database.get_connection().execute(
+        "SELECT * FROM videos ORDER BY download_date DESC, id DESC LIMIT ? OFFSET ?", (page_size, offset)
+    ).fetchall()
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=50000)
+    parser.add_argument("--page-size", type=int, default=50)
+    parser.add_argument("--dir", default=None, help="Where to create the temporary database (default: system temp)")
+    args = parser.parse_args(argv)
+
+    folder = tempfile.mkdtemp(prefix="db_bench_", dir=args.dir)
+    try:
+        database.close_connections()
+        database.DATABASE_PATH = os.path.join(folder, "bench.db")
+        database.init_db()
+        _, seed_ms = timed(seed, args.rows)
+        print(f"{args.rows} videos seeded in {seed_ms / 1000:.2f}s, pages of {args.page_size}")
+        plan = database.get_connection().execute("EXPLAIN QUERY PLAN " + KEYSET_QUERY, ("", 0, args.page_size))
+        print("Keyset query plan: " + "; ".join(row[3] for row in plan))
+
+        # Keyset: walk every page, as scrolling to the bottom does
+        page, first_ms = timed(database.get_videos_page, args.page_size)
+        latencies = []
+        while page:
+            page, ms = timed(database.get_videos_page, args.page_size, database.page_cursor(page[-1]))
+            latencies.append(ms)
+        print(f"  keyset   first page {first_ms:7.2f} ms   walk {len(latencies)} pages: "
+              f"p50 {percentile(latencies, 0.5):6.2f} ms  p95 {percentile(latencies, 0.95):6.2f} ms  "
+              f"max {max(latencies):6.2f} ms  last {latencies[-1]:6.2f} ms")
+
+        # OFFSET: the cost of a page grows with its depth
+        _, shallow_ms = timed(offset_page, args.page_size, 0)
+        _, deep_ms = timed(offset_page, args.page_size, max(args.rows - args.page_size, 0))
+        print(f"  offset   first page {shallow_ms:7.2f} ms   last page {deep_ms:7.2f} ms")
+
+        # Original: the whole library before the first row can be shown
+        _, all_ms = timed(database.get_all_videos)
+        print(f"  all rows (original get_all_videos) {all_ms:7.2f} ms")
+    finally:
+        database.close_connections()
+        shutil.rmtree(folder, ignore_errors=True)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
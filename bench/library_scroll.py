@@ -0,0 +1,137 @@
+"""Library list benchmark: build time, memory and scroll frame time for --rows videos.
+
+"widgets" is the original list (a QListWidget with one item widget per video: labels, layouts and
+two QPushButtons); "model" is the current QListView over LibraryModel drawn by LibraryDelegate.
+Each mode runs in its own process so the memory numbers do not mix. Scrolling moves the view in
+--steps jumps over the whole list and repaints it synchronously, one frame per jump.
+
+Usage:
+    python bench/library_scroll.py --rows 10000 [--steps 300] [--mode widgets|model]
+
+Runs without a display with QT_QPA_PLATFORM=offscreen.
+"""
+import os
+import sys
+import time
+import argparse
+import subprocess
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+FRAME_BUDGET_MS = 16.0  # 60 Hz
+
+def make_videos(rows):
+    return [{
+        "id": n + 1, "video_id": f"scroll{n:06d}", "title": f"Benchmark video {n} with a reasonably long title",
+        "audio_path": f"src/downloads/audio_{n}.mp3", "subtitle_path": None, "thumbnail_path": None,
+        "download_date": f"2024-01-01 00:00:{rows - n:06d}", "duration": 600 + n % 600,
+        "audio_bytes": 5_000_000, "codec": "mp3", "cue_count": 200, "translated_cue_count": n % 200,
+    } for n in range(rows)]
+
+def rss_mb():
+    """Resident memory of this process (Linux), None elsewhere"""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / 1048576
+    except (OSError, ValueError):
+        return None
+
+def build_widgets(videos):
+    """The original list: one widget per row, as VideoItem built it"""
+    from PyQt6.QtCore import Qt
+    from PyQt6.QtWidgets import QListWidget, QListWidgetItem, QWidget, QHBoxLayout, QVBoxLayout, QLabel, QPushButton
+    view = QListWidget()
+    for video in videos:
+        widget = QWidget()
+        layout = QHBoxLayout(widget)
+        thumbnail_label = QLabel("No\nthumbnail")
+        thumbnail_label.setStyleSheet("background-color: #eee; color: #666; font-size: 10px; text-align: center;")
+        thumbnail_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
+        thumbnail_label.setFixedSize(160, 90)
+        layout.addWidget(thumbnail_label)
+        info_layout = QVBoxLayout()
+        title_label = QLabel(video["title"])
+        title_label.setStyleSheet("font-weight: bold;")
+        info_layout.addWidget(title_label)
+        info_layout.addWidget(QLabel(video["download_date"]))
+        layout.addLayout(info_layout, 1)
+        buttons_layout = QVBoxLayout()
+        play_button = QPushButton("Play")
+        play_button.setFixedWidth(80)
+        buttons_layout.addWidget(play_button)
+        overlay_button = QPushButton("Overlay")
+        overlay_button.setFixedWidth(80)
+        overlay_button.setStyleSheet("background-color: #4CAF50; color: white;")
+        buttons_layout.addWidget(overlay_button)
+        layout.addLayout(buttons_layout)
+        item = QListWidgetItem()
+        item.setSizeHint(widget.sizeHint())
+        view.addItem(item)
+        view.setItemWidget(item, widget)
+    return view, None
+
+def build_model(videos):
+    from PyQt6.QtWidgets import QListView
+    from src.ui.library_model import LibraryModel, LibraryFilterProxy, LibraryDelegate
+    model = LibraryModel()
+    proxy = LibraryFilterProxy()
+    proxy.setSourceModel(model)
+    delegate = LibraryDelegate()
+    view = QListView()
+    view.setModel(proxy)
+    view.setItemDelegate(delegate)
+    view.setUniformItemSizes(True)
+    view.setVerticalScrollMode(QListView.ScrollMode.ScrollPerPixel)
+    model.append_videos(videos)
+    return view, (model, proxy, delegate)  # Kept alive with the view
+
+def percentile(values, fraction):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * fraction))]
+
+def run_mode(mode, rows, steps):
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+    from PyQt6.QtWidgets import QApplication
+    app = QApplication.instance() or QApplication(sys.argv[:1])
+    videos = make_videos(rows)
+    rss_before = rss_mb()
+    started = time.perf_counter()
+    view, keep = (build_widgets if mode == "widgets" else build_model)(videos)
+    view.resize(800, 600)
+    view.show()
+    app.processEvents()
+    build_ms = (time.perf_counter() - started) * 1000
+    rss_after = rss_mb()
+
+    scroll_bar = view.verticalScrollBar()
+    frames = []
+    for step in range(steps + 1):
+        scroll_bar.setValue(scroll_bar.maximum() * step // steps)
+        frame_started = time.perf_counter()
+        app.processEvents()  # Layout of the new scroll position
+        view.viewport().repaint()
+        frames.append((time.perf_counter() - frame_started) * 1000)
+    memory = f"{rss_after - rss_before:7.1f} MB" if rss_before is not None else "    n/a"
+    print(f"  {mode:<8} build+show {build_ms:8.0f} ms   memory {memory}   scroll frames: "
+          f"p50 {percentile(frames, 0.5):6.2f} ms  p95 {percentile(frames, 0.95):6.2f} ms  max {max(frames):6.2f} ms  "
+          f"({sum(frame > FRAME_BUDGET_MS for frame in frames)}/{len(frames)} over {FRAME_BUDGET_MS:.0f} ms)")
+    view.close()
+    return 0
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=10000)
+    parser.add_argument("--steps", type=int, default=300, help="Scroll positions painted over the whole list")
+    parser.add_argument("--mode", choices=("widgets", "model"), default=None, help="Run only one mode in this process")
+    args = parser.parse_args(argv)
+    if args.mode:
+        return run_mode(args.mode, args.rows, args.steps)
+    print(f"{args.rows} videos, {args.steps} scroll steps")
+    status = 0
+    for mode in ("widgets", "model"):
+        status |= subprocess.call([sys.executable, os.path.abspath(__file__), "--rows", str(args.rows),
+                                   "--steps", str(args.steps), "--mode", mode])
+    return status
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,95 @@
+"""Ingest YouTube videos without starting the GUI.
+
+Usage:
+    python ingest.py urls.txt --workers 8
+    python ingest.py - <<< "https://www.youtube.com/@channel"   # playlists/channels are synced incrementally
+    python ingest.py --scan                  # check the library files and exit
+    cat urls.txt | python ingest.py --audio-mode native
+"""
+import sys
+import os
+import time
+import argparse
+
+from src.models.database import init_db, get_existing_video_ids
+from src.utils.youtube_utils import AUDIO_MODES, AUDIO_MODE_MP3, download_thumbnails
+from src.utils.batch_ingest import ingest_urls, read_urls, expand_sources, DEFAULT_WORKERS
+from src.utils.source_sync import mark_source_synced
+from src.utils.library_metadata import backfill_metadata
+from src.utils.library_scanner import scan_library
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Download YouTube audio, subtitles and thumbnails into the library (no GUI).")
+    parser.add_argument("url_file", nargs="?", default="-",
+                        help="File with one URL per line ('-' or omitted to read from stdin)")
+    parser.add_argument("-w", "--workers", type=int, default=DEFAULT_WORKERS,
+                        help=f"Number of videos downloaded in parallel (default: {DEFAULT_WORKERS})")
+    parser.add_argument("--audio-mode", choices=AUDIO_MODES, default=AUDIO_MODE_MP3,
+                        help="'native' keeps the original m4a/opus stream instead of re-encoding to MP3")
+    parser.add_argument("--download-folder", default=os.path.join("src", "downloads"),
+                        help="Where audio, subtitle and thumbnail files are stored")
+    parser.add_argument("--no-skip-existing", dest="skip_existing", action="store_false",
+                        help="Download videos again even if they are already in the library")
+    parser.add_argument("--full-resync", action="store_true",
+                        help="List channels in full instead of stopping at the last synced video")
+    parser.add_argument("--refresh-thumbnails", action="store_true",
+                        help="Revalidate the thumbnails of every video in the library (conditional requests) and exit")
+    parser.add_argument("--backfill-metadata", action="store_true",
+                        help="Fill duration/size/codec/subtitle counts of videos saved by older versions and exit")
+    parser.add_argument("--scan", action="store_true",
+                        help="Check the files referenced by the library (missing files, orphans in the download folder) and exit")
+    return parser.parse_args(argv)
+
+def refresh_thumbnails(args):
+    """Tải lại/kiểm tra thumbnail của toàn bộ thư viện"""
+    init_db()
+    video_ids = get_existing_video_ids()
+    started_at = time.monotonic()
+    paths = download_thumbnails(video_ids, args.download_folder, args.workers)
+    failed = sum(1 for path in paths.values() if not path)
+    print(f"Revalidated {len(paths) - failed}/{len(paths)} thumbnails in {time.monotonic() - started_at:.1f}s")
+    return 0 if failed == 0 else 2
+
+def main(argv=None):
+    args = parse_args(argv)
+    
+    if args.refresh_thumbnails:
+        return refresh_thumbnails(args)
+    
+    if args.backfill_metadata:
+        init_db()
+        print(f"Backfilled metadata of {backfill_metadata()} videos")
+        return 0
+    
+    if args.scan:
+        init_db()
+        report = scan_library(args.download_folder)  # Prints the report
+        return 0 if not report.dangling else 2
+    
+    # Đọc danh sách URL từ file hoặc stdin
+    if args.url_file == "-":
+        urls = read_urls(sys.stdin)
+    else:
+        with open(args.url_file, "r", encoding="utf-8") as f:
+            urls = read_urls(f)
+    
+    if not urls:
+        print("No URLs to ingest", file=sys.stderr)
+        return 1
+    
+    # Khởi tạo cơ sở dữ liệu
+    init_db()
+    
+    # Mở rộng playlist/kênh thành danh sách video mới
+    urls, listings = expand_sources(urls, args.full_resync)
+    
+    stats = ingest_urls(urls, args.download_folder, args.workers, args.audio_mode, args.skip_existing)
+    for listing in listings:
+        mark_source_synced(listing)
+    print(stats.summary())
+    if stats.succeeded:
+        print("Scaled thumbnails are created the next time the app opens the library")
+    return 0 if stats.failed == 0 else 2
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,23 +1,61 @@
 import sys
 import os
-from PyQt6.QtWidgets import QApplication
-from src.models.database import init_db
-from src.ui.main_window import MainWindow
+from src.utils import profiling
+# Bật trước khi import phần còn lại để các hàm @profiling.timed được đo (OVERLAY_PROFILE hoặc --profile)
+profiling.enable_from_environment(sys.argv)
+
+with profiling.phase("imports"):
+    from PyQt6.QtWidgets import QApplication
+    from PyQt6.QtCore import QObject, QEvent, QTimer
+    from src.ui.main_window import MainWindow
+
+# Ngân sách thời gian từ lúc chạy main.py tới khi cửa sổ chính hiện ra (khởi động nguội)
+STARTUP_BUDGET_SECONDS = 1.5
+# Thư viện mạng/dịch chỉ được import khi tải hoặc dịch lần đầu, không được có mặt lúc khởi động
+LAZY_MODULES = ("yt_dlp", "pytube", "youtube_transcript_api", "requests", "translators")
+
+def startup_check():
+    """In thời gian tới khi cửa sổ hiện ra và các thư viện nặng đã bị import sớm, rồi thoát.
+
+    Mã thoát 1 nếu vượt ngân sách hoặc có thư viện nặng bị import. Chi tiết từng module:
+    python -X importtime main.py --startup-check 2> importtime.log
+    """
+    elapsed = profiling.elapsed()
+    eager = [name for name in LAZY_MODULES if name in sys.modules]
+    print(f"Time to window: {elapsed:.3f}s (budget {STARTUP_BUDGET_SECONDS:.1f}s)")
+    if eager:
+        print(f"Imported at startup, should be lazy: {', '.join(eager)}")
+    QApplication.exit(0 if elapsed <= STARTUP_BUDGET_SECONDS and not eager else 1)
+
+class FirstPaintProbe(QObject):
+    """Ghi mốc "first paint" ở lần vẽ đầu tiên của widget rồi tự gỡ (chỉ khi bật profiling)"""
+
+    def eventFilter(self, obj, event):
+        if event.type() == QEvent.Type.Paint:
+            profiling.mark("first paint")
+            obj.removeEventFilter(self)
+        return False
 
 if __name__ == "__main__":
     # Tạo thư mục downloads nếu chưa tồn tại
     os.makedirs(os.path.join("src", "downloads"), exist_ok=True)
     
-    # Khởi tạo cơ sở dữ liệu
-    init_db()
-    
     # Tạo ứng dụng
     app = QApplication(sys.argv)
     app.setStyle("Fusion")
     
-    # Tạo và hiển thị cửa sổ chính
-    window = MainWindow()
-    window.show()
+    # Tạo và hiển thị cửa sổ chính (cơ sở dữ liệu được mở và chuyển đổi trên luồng nền của nó)
+    with profiling.phase("MainWindow"):
+        window = MainWindow()
+    if profiling.ENABLED:
+        first_paint_probe = FirstPaintProbe()
+        window.video_list.viewport().installEventFilter(first_paint_probe)
+    with profiling.phase("show"):
+        window.show()
+    
+    # Đo khởi động: chạy khi vòng lặp sự kiện đã xử lý việc hiển thị cửa sổ
+    if "--startup-check" in sys.argv:
+        QTimer.singleShot(0, startup_check)
     
     # Thực thi ứng dụng
-    sys.exit(app.exec()) 
\ No newline at end of file
+    sys.exit(app.exec())
@@ -1,87 +1,693 @@
 import sqlite3
 import os
+import json
+import atexit
+import threading
+import weakref
+from contextlib import contextmanager
+from datetime import datetime
 
 DATABASE_PATH = "youtube_subtitles.db"
 
-def init_db():
-    """Khởi tạo cơ sở dữ liệu"""
-    conn = sqlite3.connect(DATABASE_PATH)
-    c = conn.cursor()
-    c.execute('''
-    CREATE TABLE IF NOT EXISTS videos (
-        id INTEGER PRIMARY KEY AUTOINCREMENT,
-        video_id TEXT UNIQUE,
-        title TEXT,
-        audio_path TEXT,
-        subtitle_path TEXT,
-        thumbnail_path TEXT,
-        download_date TIMESTAMP
+# Cấu hình kết nối
+STATEMENT_CACHE_SIZE = 256      # Số câu lệnh đã biên dịch được giữ lại trên mỗi kết nối
+BUSY_TIMEOUT_MS = 5000          # Thời gian chờ khi cơ sở dữ liệu đang bị khóa
+CACHE_SIZE_KB = 16384           # Bộ nhớ đệm trang của SQLite (16 MB)
+MMAP_SIZE = 128 * 1024 * 1024   # Đọc file qua memory-map (128 MB)
+
+# --- Quản lý kết nối ---
+# Mỗi luồng có một kết nối riêng, được tạo một lần và dùng lại cho mọi truy vấn.
+# Chế độ WAL cho phép nhiều luồng đọc song song với một luồng ghi; các thao tác ghi
+# được tuần tự hóa bằng _write_lock để không có hai luồng tranh nhau khóa ghi.
+_local = threading.local()
+_write_lock = threading.RLock()
+_open_holders = weakref.WeakSet()
+
+class _ConnectionHolder:
+    """Giữ kết nối của một luồng; kết nối được đóng khi luồng kết thúc"""
+
+    def __init__(self, path):
+        self.path = path
+        self.conn = _open_connection(path)
+        self.write_depth = 0
+        self.pending_changes = []  # Thông báo thay đổi chờ giao dịch hiện tại COMMIT
+
+    def close(self):
+        if self.conn is not None:
+            try:
+                self.conn.close()
+            except sqlite3.Error:
+                pass
+            self.conn = None
+
+    def __del__(self):
+        self.close()
+
+def _open_connection(path):
+    """Mở kết nối mới với WAL và các PRAGMA đã tinh chỉnh"""
+    conn = sqlite3.connect(
+        path,
+        timeout=BUSY_TIMEOUT_MS / 1000,
+        cached_statements=STATEMENT_CACHE_SIZE,
+        isolation_level=None,  # Tự quản lý giao dịch (xem write_transaction)
+        check_same_thread=False,  # Để có thể đóng mọi kết nối khi thoát ứng dụng
     )
-    ''')
-    conn.commit()
-    conn.close()
+    conn.row_factory = sqlite3.Row
+    conn.execute("PRAGMA journal_mode = WAL")
+    conn.execute("PRAGMA synchronous = NORMAL")
+    conn.execute(f"PRAGMA busy_timeout = {BUSY_TIMEOUT_MS}")
+    conn.execute(f"PRAGMA cache_size = -{CACHE_SIZE_KB}")
+    conn.execute(f"PRAGMA mmap_size = {MMAP_SIZE}")
+    conn.execute("PRAGMA temp_store = MEMORY")
+    return conn
+
+def _get_holder():
+    holder = getattr(_local, "holder", None)
+    if holder is None or holder.conn is None or holder.path != DATABASE_PATH:
+        if holder is not None:
+            holder.close()
+        holder = _ConnectionHolder(DATABASE_PATH)
+        _local.holder = holder
+        _open_holders.add(holder)
+    return holder
+
+def get_connection():
+    """Lấy kết nối của luồng hiện tại (tạo mới nếu chưa có)"""
+    return _get_holder().conn
+
+@contextmanager
+def write_transaction():
+    """Giao dịch ghi. Chỉ một luồng được ghi tại một thời điểm; lồng nhau thì dùng chung giao dịch ngoài cùng."""
+    with _write_lock:
+        holder = _get_holder()
+        conn = holder.conn
+        if holder.write_depth > 0:
+            holder.write_depth += 1
+            try:
+                yield conn
+            finally:
+                holder.write_depth -= 1
+            return
+
+        conn.execute("BEGIN IMMEDIATE")
+        holder.write_depth = 1
+        holder.pending_changes = []
+        try:
+            yield conn
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        else:
+            conn.execute("COMMIT")
+        finally:
+            holder.write_depth = 0
+            changes = holder.pending_changes
+            holder.pending_changes = []
+    # Chỉ báo thay đổi sau khi đã COMMIT (không tới được đây nếu ROLLBACK)
+    for kind, ids in changes:
+        _dispatch_change(kind, ids)
+
+def close_connections():
+    """Đóng tất cả kết nối đang mở (gọi khi thoát ứng dụng)"""
+    for holder in list(_open_holders):
+        holder.close()
+    _local.__dict__.pop("holder", None)
+
+atexit.register(close_connections)
+
+# --- Thông báo thay đổi ---
+# Các hàm ghi báo (loại, danh sách id của bảng videos) cho listener sau khi giao dịch COMMIT, để giao diện
+# cập nhật đúng các dòng bị ảnh hưởng thay vì tải lại cả thư viện. Listener chạy trên luồng đã ghi.
+CHANGE_INSERT = "insert"
+CHANGE_UPDATE = "update"
+CHANGE_DELETE = "delete"
+CHANGE_RESET = "reset"  # Quá nhiều thay đổi để liệt kê, tải lại toàn bộ
+_change_listeners = []
+
+def add_change_listener(listener):
+    """Đăng ký listener(kind, ids) nhận thông báo thay đổi của bảng videos"""
+    _change_listeners.append(listener)
+
+def remove_change_listener(listener):
+    if listener in _change_listeners:
+        _change_listeners.remove(listener)
+
+def _notify_change(kind, ids=()):
+    """Báo thay đổi; bên trong write_transaction thì chờ đến khi COMMIT"""
+    ids = list(ids)
+    if kind != CHANGE_RESET and not ids:
+        return
+    holder = getattr(_local, "holder", None)
+    if holder is not None and holder.write_depth > 0:
+        holder.pending_changes.append((kind, ids))
+    else:
+        _dispatch_change(kind, ids)
+
+def _dispatch_change(kind, ids):
+    for listener in list(_change_listeners):
+        try:
+            listener(kind, ids)
+        except Exception as e:
+            print(f"Error in database change listener: {e}")
+
+# --- Migration schema ---
+# Mỗi migration là (phiên bản, mô tả, danh sách bước). Một bước là câu lệnh SQL hoặc hàm nhận conn.
+# Phiên bản hiện tại của file được lưu trong PRAGMA user_version. Chỉ thêm migration mới vào cuối,
+# không sửa các migration đã phát hành.
+MIGRATIONS = [
+    (1, "Bảng videos và sources", [
+        '''
+        CREATE TABLE IF NOT EXISTS videos (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            video_id TEXT UNIQUE,
+            title TEXT,
+            audio_path TEXT,
+            subtitle_path TEXT,
+            thumbnail_path TEXT,
+            download_date TIMESTAMP
+        )
+        ''',
+        # Nguồn playlist/kênh và vị trí đồng bộ gần nhất
+        '''
+        CREATE TABLE IF NOT EXISTS sources (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            url TEXT UNIQUE,
+            kind TEXT,
+            title TEXT,
+            last_video_id TEXT,
+            last_synced_at TIMESTAMP
+        )
+        ''',
+    ]),
+    (2, "Chỉ mục cho sắp xếp và tìm kiếm thư viện", [
+        # Danh sách thư viện: ORDER BY download_date DESC, id DESC
+        "CREATE INDEX IF NOT EXISTS idx_videos_download_date ON videos (download_date DESC, id DESC)",
+        # Sắp xếp/tìm theo tiêu đề không phân biệt hoa thường
+        "CREATE INDEX IF NOT EXISTS idx_videos_title ON videos (title COLLATE NOCASE, id)",
+        # Đồng bộ nguồn: các nguồn cần đồng bộ lại theo thời gian
+        "CREATE INDEX IF NOT EXISTS idx_sources_last_synced_at ON sources (last_synced_at)",
+    ]),
+    (3, "Bảng phụ đề (cues) và nhập các file JSON hiện có", [
+        '''
+        CREATE TABLE IF NOT EXISTS cues (
+            video_id TEXT NOT NULL,
+            idx INTEGER NOT NULL,
+            start_ms INTEGER NOT NULL,
+            end_ms INTEGER NOT NULL,
+            text TEXT,
+            PRIMARY KEY (video_id, idx)
+        ) WITHOUT ROWID
+        ''',
+        "CREATE INDEX IF NOT EXISTS idx_cues_video_start ON cues (video_id, start_ms)",
+        '''
+        CREATE TABLE IF NOT EXISTS cue_translations (
+            video_id TEXT NOT NULL,
+            idx INTEGER NOT NULL,
+            lang TEXT NOT NULL,
+            text TEXT,
+            PRIMARY KEY (video_id, idx, lang)
+        ) WITHOUT ROWID
+        ''',
+        '''
+        CREATE TABLE IF NOT EXISTS cue_tracks (
+            video_id TEXT PRIMARY KEY,
+            cue_count INTEGER NOT NULL,
+            max_duration_ms INTEGER NOT NULL
+        )
+        ''',
+        # Cột cue_count chỉ có từ migration 4, migration 4 tự tính lại số dòng
+        lambda conn: _import_subtitle_json_files(conn, refresh_counts=False),
+    ]),
+    (4, "Cột metadata tính sẵn cho danh sách thư viện", [
+        # NULL nghĩa là chưa biết; metadata_ready = 0 là dòng còn chờ backfill (xem get_videos_pending_metadata)
+        "ALTER TABLE videos ADD COLUMN duration REAL",
+        "ALTER TABLE videos ADD COLUMN audio_bytes INTEGER",
+        "ALTER TABLE videos ADD COLUMN codec TEXT",
+        "ALTER TABLE videos ADD COLUMN cue_count INTEGER",
+        "ALTER TABLE videos ADD COLUMN translated_cue_count INTEGER",
+        "ALTER TABLE videos ADD COLUMN last_played_at TIMESTAMP",
+        "ALTER TABLE videos ADD COLUMN metadata_ready INTEGER NOT NULL DEFAULT 0",
+        "CREATE INDEX IF NOT EXISTS idx_videos_metadata_pending ON videos (id) WHERE metadata_ready = 0",
+        # Số dòng phụ đề đã có sẵn trong cơ sở dữ liệu, không cần đọc file
+        lambda conn: _refresh_cue_counts(conn),
+    ]),
+    (5, "Trạng thái file (tồn tại, kích thước) do trình quét thư viện ghi lại", [
+        # NULL: chưa quét từ lần lưu gần nhất; 0/1: file không có/có lúc quét
+        "ALTER TABLE videos ADD COLUMN audio_exists INTEGER",
+        "ALTER TABLE videos ADD COLUMN subtitle_exists INTEGER",
+        "ALTER TABLE videos ADD COLUMN thumbnail_exists INTEGER",
+        "ALTER TABLE videos ADD COLUMN files_bytes INTEGER",
+        "ALTER TABLE videos ADD COLUMN files_checked_at TIMESTAMP",
+    ]),
+]
+SCHEMA_VERSION = MIGRATIONS[-1][0]
+
+def apply_migrations():
+    """Chạy các migration còn thiếu trong một giao dịch duy nhất. Trả về danh sách phiên bản đã áp dụng."""
+    applied = []
+    with write_transaction() as conn:
+        # Đọc phiên bản bên trong giao dịch ghi để hai tiến trình không migrate cùng lúc
+        current = conn.execute("PRAGMA user_version").fetchone()[0]
+        if current > SCHEMA_VERSION:
+            print(f"WARNING: database schema v{current} is newer than this application (v{SCHEMA_VERSION})")
+            return applied
+        for version, description, steps in MIGRATIONS:
+            if version <= current:
+                continue
+            for step in steps:
+                if callable(step):
+                    step(conn)
+                else:
+                    conn.execute(step)
+            applied.append(version)
+            print(f"Applied database migration {version}: {description}")
+        if applied:
+            conn.execute(f"PRAGMA user_version = {applied[-1]}")
+    return applied
+
+def init_db():
+    """Khởi tạo cơ sở dữ liệu và cập nhật schema lên phiên bản mới nhất"""
+    apply_migrations()
+
+def get_source(url):
+    """Lấy thông tin nguồn (playlist/kênh) theo URL"""
+    return get_connection().execute("SELECT * FROM sources WHERE url = ?", (url,)).fetchone()
+
+def save_source_sync(url, kind, title, last_video_id, last_synced_at):
+    """Lưu vị trí đồng bộ gần nhất của một nguồn"""
+    with write_transaction() as conn:
+        conn.execute(
+            "INSERT INTO sources (url, kind, title, last_video_id, last_synced_at) VALUES (?, ?, ?, ?, ?) "
+            "ON CONFLICT(url) DO UPDATE SET kind = excluded.kind, title = excluded.title, "
+            "last_video_id = excluded.last_video_id, last_synced_at = excluded.last_synced_at",
+            (url, kind, title, last_video_id, last_synced_at)
+        )
 
 def get_all_videos():
     """Lấy danh sách tất cả video"""
-    conn = sqlite3.connect(DATABASE_PATH)
-    conn.row_factory = sqlite3.Row
-    c = conn.cursor()
-    c.execute("SELECT * FROM videos ORDER BY download_date DESC")
-    videos = c.fetchall()
-    conn.close()
-    return videos
+    return get_connection().execute("SELECT * FROM videos ORDER BY download_date DESC, id DESC").fetchall()
+
+def get_videos_page(limit=50, after=None):
+    """Lấy một trang video theo thứ tự mới nhất trước (phân trang keyset).
+
+    after là (download_date, id) của dòng cuối trang trước, None để lấy trang đầu.
+    Truy vấn luôn đi theo idx_videos_download_date nên chi phí không phụ thuộc vào số trang.
+    """
+    conn = get_connection()
+    if after is None:
+        return conn.execute(
+            "SELECT * FROM videos ORDER BY download_date DESC, id DESC LIMIT ?", (limit,)
+        ).fetchall()
+    return conn.execute(
+        "SELECT * FROM videos WHERE (download_date, id) < (?, ?) ORDER BY download_date DESC, id DESC LIMIT ?",
+        (after[0], after[1], limit)
+    ).fetchall()
+
+def page_cursor(row):
+    """Khóa keyset của một dòng, dùng làm tham số after cho trang tiếp theo"""
+    return (row["download_date"], row["id"])
+
+def get_video_titles():
+    """(id, video_id, title, download_date) của mọi video, để dựng chỉ mục lọc trong bộ nhớ"""
+    return get_connection().execute("SELECT id, video_id, title, download_date FROM videos").fetchall()
 
 def get_video_by_id(video_id):
     """Lấy thông tin video theo ID"""
-    conn = sqlite3.connect(DATABASE_PATH)
-    conn.row_factory = sqlite3.Row
-    c = conn.cursor()
-    c.execute("SELECT * FROM videos WHERE id = ?", (video_id,))
-    video = c.fetchone()
-    conn.close()
-    return video
+    return get_connection().execute("SELECT * FROM videos WHERE id = ?", (video_id,)).fetchone()
 
-def save_video(video_id, title, audio_path, subtitle_path, thumbnail_path, download_date):
-    """Lưu thông tin video vào cơ sở dữ liệu"""
-    # Đảm bảo không có giá trị None cho các trường không nullable
-    video_id = video_id or ""
-    title = title or ""
-    audio_path = audio_path or ""
-    download_date = download_date or ""
-    
-    # Subtitle và thumbnail có thể là None
-    
-    conn = sqlite3.connect(DATABASE_PATH)
-    c = conn.cursor()
-    c.execute(
-        "INSERT OR REPLACE INTO videos (video_id, title, audio_path, subtitle_path, thumbnail_path, download_date) VALUES (?, ?, ?, ?, ?, ?)",
-        (video_id, title, audio_path, subtitle_path, thumbnail_path, download_date)
+def get_existing_video_ids():
+    """Lấy tập hợp video_id (YouTube) đã có trong thư viện"""
+    return {row[0] for row in get_connection().execute("SELECT video_id FROM videos")}
+
+VIDEO_COLUMNS = ("video_id", "title", "audio_path", "subtitle_path", "thumbnail_path", "download_date")
+# Metadata ghi lúc tải (từ audio_stats) hoặc bằng backfill; cue_count/translated_cue_count do _write_cues cập nhật
+METADATA_COLUMNS = ("duration", "audio_bytes", "codec")
+# Trạng thái file do src/utils/library_scanner.py ghi
+FILE_STATUS_COLUMNS = ("audio_exists", "subtitle_exists", "thumbnail_exists", "files_bytes")
+SAVE_CHUNK_SIZE = 500  # Số tham số tối đa cho mỗi câu lệnh IN (...)
+
+def _video_params(video):
+    """Tham số INSERT cho một video, đảm bảo không có None ở các trường không nullable"""
+    params = []
+    for column in VIDEO_COLUMNS:
+        value = video.get(column)
+        # Subtitle và thumbnail có thể là None
+        if value is None and column not in ("subtitle_path", "thumbnail_path"):
+            value = ""
+        params.append(value)
+    # Metadata lấy từ video hoặc từ audio_stats của download_youtube_video, None nếu không có
+    audio_stats = video.get("audio_stats") or {}
+    for column in METADATA_COLUMNS:
+        value = video.get(column)
+        params.append(value if value is not None else audio_stats.get(column))
+    params.append(1 if audio_stats else 0)
+    return params
+
+def save_videos(videos):
+    """Lưu nhiều video (kèm phụ đề nếu có khóa "cues") trong một giao dịch.
+
+    Video đã tồn tại (cùng video_id) được cập nhật tại chỗ và giữ nguyên id. Video không có
+    video_id bị bỏ qua kèm cảnh báo (video_id là khóa duy nhất). Trả về {video_id: id}.
+    """
+    valid_videos = [video for video in videos if video.get("video_id")]
+    if len(valid_videos) != len(videos):
+        print(f"WARNING: skipped {len(videos) - len(valid_videos)} videos without a video_id")
+    videos = valid_videos
+    if not videos:
+        return {}
+    all_columns = VIDEO_COLUMNS + METADATA_COLUMNS + ("metadata_ready",)
+    columns = ", ".join(all_columns)
+    placeholders = ", ".join("?" for _ in all_columns)
+    # Metadata đã biết được giữ lại nếu lần lưu này không có
+    updates = ", ".join(
+        [f"{column} = excluded.{column}" for column in VIDEO_COLUMNS if column != "video_id"]
+        + [f"{column} = COALESCE(excluded.{column}, {column})" for column in METADATA_COLUMNS]
+        + ["metadata_ready = MAX(excluded.metadata_ready, metadata_ready)"]
+        # Đường dẫn có thể đã đổi, trạng thái file chưa biết cho đến lần quét sau
+        + [f"{column} = NULL" for column in FILE_STATUS_COLUMNS]
     )
-    conn.commit()
-    last_id = c.lastrowid
-    conn.close()
-    return last_id
+    video_ids = [video["video_id"] for video in videos]
+    ids = {}
+    with write_transaction() as conn:
+        # id của các video đã có, để phân biệt thêm mới và cập nhật khi báo thay đổi
+        existing_ids = set(_ids_by_video_id(conn, video_ids).values())
+        conn.executemany(
+            f"INSERT INTO videos ({columns}) VALUES ({placeholders}) ON CONFLICT(video_id) DO UPDATE SET {updates}",
+            [_video_params(video) for video in videos]
+        )
+        for video in videos:
+            if video.get("cues") is not None:
+                _write_cues(conn, video["video_id"], video["cues"])
+
+        ids = _ids_by_video_id(conn, video_ids)
+        _notify_change(CHANGE_INSERT, [row_id for row_id in ids.values() if row_id not in existing_ids])
+        _notify_change(CHANGE_UPDATE, [row_id for row_id in ids.values() if row_id in existing_ids])
+    return ids
+
+def _ids_by_video_id(conn, video_ids):
+    """{video_id (YouTube): id} của các video đã có trong cơ sở dữ liệu"""
+    ids = {}
+    for start in range(0, len(video_ids), SAVE_CHUNK_SIZE):
+        chunk = video_ids[start:start + SAVE_CHUNK_SIZE]
+        rows = conn.execute(
+            f"SELECT id, video_id FROM videos WHERE video_id IN ({', '.join('?' for _ in chunk)})", chunk
+        )
+        ids.update((row["video_id"], row["id"]) for row in rows)
+    return ids
+
+def get_videos_by_ids(video_ids):
+    """Các dòng videos theo danh sách ID (thứ tự không xác định)"""
+    video_ids = list(video_ids)
+    conn = get_connection()
+    rows = []
+    for start in range(0, len(video_ids), SAVE_CHUNK_SIZE):
+        chunk = video_ids[start:start + SAVE_CHUNK_SIZE]
+        rows.extend(conn.execute(f"SELECT * FROM videos WHERE id IN ({', '.join('?' for _ in chunk)})", chunk))
+    return rows
+
+def save_video(video_id, title, audio_path, subtitle_path, thumbnail_path, download_date):
+    """Lưu thông tin video vào cơ sở dữ liệu, trả về id của dòng.
+
+    Raises ValueError nếu video_id trống: video_id là khóa duy nhất nên không thể lưu.
+    """
+    if not video_id:
+        raise ValueError("Cannot save a video without a video_id")
+    ids = save_videos([{
+        "video_id": video_id,
+        "title": title,
+        "audio_path": audio_path,
+        "subtitle_path": subtitle_path,
+        "thumbnail_path": thumbnail_path,
+        "download_date": download_date,
+    }])
+    return ids.get(video_id)
+
+def mark_video_played(video_id, played_at=None):
+    """Ghi thời điểm mở video gần nhất (theo ID)"""
+    played_at = played_at or datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    with write_transaction() as conn:
+        conn.execute("UPDATE videos SET last_played_at = ? WHERE id = ?", (played_at, video_id))
+        _notify_change(CHANGE_UPDATE, [video_id])
+
+def get_videos_pending_metadata(limit=100):
+    """Các video chưa có metadata tính sẵn (dòng cũ trước migration 4), dùng idx_videos_metadata_pending"""
+    return get_connection().execute(
+        "SELECT * FROM videos WHERE metadata_ready = 0 ORDER BY id LIMIT ?", (limit,)
+    ).fetchall()
+
+def save_video_metadata(updates):
+    """Ghi metadata do backfill tính được và đánh dấu các dòng đã xong.
+
+    updates là danh sách dict có khóa id và các cột trong METADATA_COLUMNS, cue_count, translated_cue_count;
+    giá trị None giữ nguyên giá trị hiện có.
+    """
+    columns = METADATA_COLUMNS + ("cue_count", "translated_cue_count")
+    assignments = ", ".join(f"{column} = COALESCE(?, {column})" for column in columns)
+    with write_transaction() as conn:
+        conn.executemany(
+            f"UPDATE videos SET {assignments}, metadata_ready = 1 WHERE id = ?",
+            [[update.get(column) for column in columns] + [update["id"]] for update in updates]
+        )
+        _notify_change(CHANGE_UPDATE, [update["id"] for update in updates])
+
+def get_file_references():
+    """Đường dẫn file của mọi video (cho trình quét thư viện)"""
+    return get_connection().execute(
+        "SELECT id, video_id, title, audio_path, subtitle_path, thumbnail_path FROM videos"
+    ).fetchall()
+
+def save_file_status(statuses, checked_at=None):
+    """Lưu kết quả quét file trong một giao dịch. Trả về số video có trạng thái thay đổi.
+
+    statuses là danh sách dict có khóa id và các cột trong FILE_STATUS_COLUMNS.
+    """
+    checked_at = checked_at or datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    assignments = ", ".join(f"{column} = ?" for column in FILE_STATUS_COLUMNS)
+    changed_condition = " OR ".join(f"{column} IS NOT ?" for column in FILE_STATUS_COLUMNS)
+    changed_ids = []
+    with write_transaction() as conn:
+        for status in statuses:
+            values = [status.get(column) for column in FILE_STATUS_COLUMNS]
+            cursor = conn.execute(
+                f"UPDATE videos SET {assignments} WHERE id = ? AND ({changed_condition})",
+                values + [status["id"]] + values
+            )
+            if cursor.rowcount:
+                changed_ids.append(status["id"])
+        conn.execute("UPDATE videos SET files_checked_at = ?", (checked_at,))
+        _notify_change(CHANGE_UPDATE, changed_ids)
+    return len(changed_ids)
+
+def get_dangling_videos():
+    """Các video mà lần quét gần nhất không tìm thấy file âm thanh"""
+    return get_connection().execute(
+        "SELECT id, video_id, title, audio_path FROM videos WHERE audio_exists = 0 ORDER BY id"
+    ).fetchall()
+
+def _delete_cues_of(conn, where, params=()):
+    """Xóa phụ đề của các video thỏa điều kiện where trên bảng videos"""
+    subquery = f"SELECT video_id FROM videos WHERE {where}"
+    for table in ("cues", "cue_translations", "cue_tracks"):
+        conn.execute(f"DELETE FROM {table} WHERE video_id IN ({subquery})", params)
+
+def get_video_files(video_ids=None):
+    """Đường dẫn file (id, audio_path, subtitle_path, thumbnail_path) của các video theo ID, None là tất cả"""
+    conn = get_connection()
+    if video_ids is None:
+        return conn.execute("SELECT id, audio_path, subtitle_path, thumbnail_path FROM videos").fetchall()
+    video_ids = list(video_ids)
+    rows = []
+    for start in range(0, len(video_ids), SAVE_CHUNK_SIZE):
+        chunk = video_ids[start:start + SAVE_CHUNK_SIZE]
+        rows.extend(conn.execute(
+            f"SELECT id, audio_path, subtitle_path, thumbnail_path FROM videos WHERE id IN ({', '.join('?' for _ in chunk)})",
+            chunk
+        ))
+    return rows
+
+def delete_videos(video_ids):
+    """Xóa nhiều video (kèm phụ đề) theo ID trong một giao dịch. Trả về số video đã xóa."""
+    video_ids = list(video_ids)
+    deleted_ids = []
+    with write_transaction() as conn:
+        for start in range(0, len(video_ids), SAVE_CHUNK_SIZE):
+            chunk = video_ids[start:start + SAVE_CHUNK_SIZE]
+            placeholders = ", ".join("?" for _ in chunk)
+            # Chỉ báo các ID thực sự có trong bảng (đọc trong cùng giao dịch, trước khi xóa)
+            existing = [row[0] for row in conn.execute(f"SELECT id FROM videos WHERE id IN ({placeholders})", chunk)]
+            if not existing:
+                continue
+            placeholders = ", ".join("?" for _ in existing)
+            _delete_cues_of(conn, f"id IN ({placeholders})", existing)
+            conn.execute(f"DELETE FROM videos WHERE id IN ({placeholders})", existing)
+            deleted_ids.extend(existing)
+        if deleted_ids:
+            _notify_change(CHANGE_DELETE, deleted_ids)
+    return len(deleted_ids)
 
 def delete_video(video_id):
-    """Xóa video theo ID"""
-    conn = sqlite3.connect(DATABASE_PATH)
-    c = conn.cursor()
-    c.execute("DELETE FROM videos WHERE id = ?", (video_id,))
-    conn.commit()
-    conn.close()
+    """Xóa video theo ID (chỉ dữ liệu, xóa cả file thì dùng src/utils/library_delete.py)"""
+    delete_videos([video_id])
 
 def delete_all_videos():
     """Xóa tất cả video khỏi cơ sở dữ liệu và trả về danh sách đường dẫn file để xóa"""
-    conn = sqlite3.connect(DATABASE_PATH)
-    c = conn.cursor()
-    
-    # Lấy tất cả đường dẫn file trước khi xóa
-    c.execute("SELECT audio_path, subtitle_path, thumbnail_path FROM videos")
-    file_paths = c.fetchall()
-    
-    # Xóa tất cả dữ liệu
-    c.execute("DELETE FROM videos")
-    conn.commit()
-    conn.close()
-    
-    return file_paths 
\ No newline at end of file
+    with write_transaction() as conn:
+        # Lấy tất cả đường dẫn file trước khi xóa
+        file_paths = conn.execute("SELECT audio_path, subtitle_path, thumbnail_path FROM videos").fetchall()
+
+        # Xóa tất cả dữ liệu
+        for table in ("cues", "cue_translations", "cue_tracks", "videos"):
+            conn.execute(f"DELETE FROM {table}")
+        _notify_change(CHANGE_RESET)
+
+    return file_paths
+
+# --- Phụ đề (cues) ---
+# Mỗi dòng phụ đề lưu một dòng trong bảng cues, bản dịch lưu riêng trong cue_translations theo ngôn ngữ.
+# cue_tracks giữ số dòng và độ dài dòng dài nhất, để truy vấn theo khoảng thời gian chỉ cần quét chỉ mục.
+DEFAULT_TRANSLATION_LANG = "vi"
+
+def _cue_to_row(video_id, idx, cue):
+    start_ms = int(round(float(cue.get("start", 0)) * 1000))
+    end_ms = start_ms + int(round(float(cue.get("duration", 0)) * 1000))
+    return (video_id, idx, start_ms, end_ms, cue.get("text", ""))
+
+def _row_to_cue(row, lang=DEFAULT_TRANSLATION_LANG):
+    """Chuyển dòng cues thành dictionary cùng định dạng với file JSON phụ đề"""
+    return {
+        "idx": row["idx"],
+        "text": row["text"],
+        "start": row["start_ms"] / 1000,
+        "duration": (row["end_ms"] - row["start_ms"]) / 1000,
+        f"{lang}_text": row["translation"] or "",
+    }
+
+def _write_cues(conn, video_id, cues, lang=DEFAULT_TRANSLATION_LANG, refresh_counts=True):
+    """Ghi (thay thế) toàn bộ phụ đề của một video, dùng bên trong write_transaction"""
+    translation_key = f"{lang}_text"
+    rows = [_cue_to_row(video_id, idx, cue) for idx, cue in enumerate(cues)]
+    conn.execute("DELETE FROM cues WHERE video_id = ?", (video_id,))
+    conn.execute("DELETE FROM cue_translations WHERE video_id = ?", (video_id,))
+    conn.executemany(
+        "INSERT INTO cues (video_id, idx, start_ms, end_ms, text) VALUES (?, ?, ?, ?, ?)", rows
+    )
+    conn.executemany(
+        "INSERT INTO cue_translations (video_id, idx, lang, text) VALUES (?, ?, ?, ?)",
+        [(video_id, idx, lang, cue[translation_key]) for idx, cue in enumerate(cues) if cue.get(translation_key)]
+    )
+    max_duration_ms = max((row[3] - row[2] for row in rows), default=0)
+    conn.execute(
+        "INSERT OR REPLACE INTO cue_tracks (video_id, cue_count, max_duration_ms) VALUES (?, ?, ?)",
+        (video_id, len(rows), max_duration_ms)
+    )
+    if refresh_counts:
+        _refresh_cue_counts(conn, video_id)
+
+def _notify_cues_changed(conn, video_id):
+    """Báo cập nhật cho video có phụ đề vừa thay đổi (cue_count, translated_cue_count)"""
+    _notify_change(CHANGE_UPDATE, _ids_by_video_id(conn, [video_id]).values())
+
+def _refresh_cue_counts(conn, video_id=None):
+    """Tính lại cue_count và translated_cue_count trên bảng videos từ các bảng phụ đề.
+
+    video_id=None tính lại cho mọi video đã có phụ đề trong cơ sở dữ liệu.
+    """
+    where = "WHERE video_id IN (SELECT video_id FROM cue_tracks)"
+    params = [DEFAULT_TRANSLATION_LANG]
+    if video_id is not None:
+        where = "WHERE video_id = ? AND video_id IN (SELECT video_id FROM cue_tracks)"
+        params.append(video_id)
+    conn.execute(
+        "UPDATE videos SET "
+        "cue_count = (SELECT cue_count FROM cue_tracks t WHERE t.video_id = videos.video_id), "
+        "translated_cue_count = (SELECT COUNT(*) FROM cue_translations t "
+        "WHERE t.video_id = videos.video_id AND t.lang = ? AND t.text != '') "
+        + where,
+        params
+    )
+
+def _import_subtitle_json_files(conn, refresh_counts=True):
+    """Nhập các file JSON phụ đề hiện có vào bảng cues (các video chưa có phụ đề trong cơ sở dữ liệu)"""
+    rows = conn.execute(
+        "SELECT video_id, subtitle_path FROM videos "
+        "WHERE subtitle_path IS NOT NULL AND subtitle_path != '' "
+        "AND video_id NOT IN (SELECT video_id FROM cue_tracks)"
+    ).fetchall()
+    imported = 0
+    for row in rows:
+        try:
+            with open(row["subtitle_path"], 'r', encoding='utf-8') as f:
+                cues = json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"Could not import subtitles from {row['subtitle_path']}: {e}")
+            continue
+        _write_cues(conn, row["video_id"], cues, refresh_counts=refresh_counts)
+        imported += 1
+    if rows:
+        print(f"Imported subtitles of {imported}/{len(rows)} videos into the database")
+    return imported
+
+def save_cues(video_id, cues, lang=DEFAULT_TRANSLATION_LANG):
+    """Lưu toàn bộ phụ đề của video (danh sách dict text/start/duration/<lang>_text)"""
+    with write_transaction() as conn:
+        _write_cues(conn, video_id, cues, lang)
+        _notify_cues_changed(conn, video_id)
+
+def has_cues(video_id):
+    """Video đã có phụ đề trong cơ sở dữ liệu chưa"""
+    return get_connection().execute(
+        "SELECT 1 FROM cue_tracks WHERE video_id = ?", (video_id,)
+    ).fetchone() is not None
+
+def get_cues(video_id, lang=DEFAULT_TRANSLATION_LANG):
+    """Lấy toàn bộ phụ đề của video theo thứ tự; None nếu video chưa có phụ đề trong cơ sở dữ liệu"""
+    if not has_cues(video_id):
+        return None
+    rows = get_connection().execute(
+        "SELECT c.idx, c.start_ms, c.end_ms, c.text, t.text AS translation FROM cues c "
+        "LEFT JOIN cue_translations t ON t.video_id = c.video_id AND t.idx = c.idx AND t.lang = ? "
+        "WHERE c.video_id = ? ORDER BY c.idx",
+        (lang, video_id)
+    ).fetchall()
+    return [_row_to_cue(row, lang) for row in rows]
+
+def get_cues_in_range(video_id, start_ms, end_ms, lang=DEFAULT_TRANSLATION_LANG):
+    """Lấy các dòng phụ đề giao với khoảng [start_ms, end_ms)"""
+    conn = get_connection()
+    track = conn.execute("SELECT max_duration_ms FROM cue_tracks WHERE video_id = ?", (video_id,)).fetchone()
+    if track is None:
+        return []
+    # Một dòng giao với khoảng chỉ khi nó bắt đầu không sớm hơn start_ms - (độ dài dòng dài nhất),
+    # nên cả hai cận đều nằm trên chỉ mục (video_id, start_ms)
+    rows = conn.execute(
+        "SELECT c.idx, c.start_ms, c.end_ms, c.text, t.text AS translation FROM cues c "
+        "LEFT JOIN cue_translations t ON t.video_id = c.video_id AND t.idx = c.idx AND t.lang = ? "
+        "WHERE c.video_id = ? AND c.start_ms >= ? AND c.start_ms < ? AND c.end_ms > ? ORDER BY c.start_ms, c.idx",
+        (lang, video_id, start_ms - track["max_duration_ms"], end_ms, start_ms)
+    ).fetchall()
+    return [_row_to_cue(row, lang) for row in rows]
+
+def save_cue_translations(video_id, translations, lang=DEFAULT_TRANSLATION_LANG):
+    """Cập nhật bản dịch của nhiều dòng ({idx: text}) trong một giao dịch"""
+    with write_transaction() as conn:
+        conn.executemany(
+            "INSERT OR REPLACE INTO cue_translations (video_id, idx, lang, text) VALUES (?, ?, ?, ?)",
+            [(video_id, idx, lang, text) for idx, text in translations.items()]
+        )
+        if lang == DEFAULT_TRANSLATION_LANG:
+            _refresh_cue_counts(conn, video_id)
+            _notify_cues_changed(conn, video_id)
+
+def load_subtitles(video_id, subtitle_path=None, lang=DEFAULT_TRANSLATION_LANG):
+    """Tải phụ đề của video: từ cơ sở dữ liệu nếu có, nếu không thì từ file JSON cũ.
+
+    Trả về (danh sách phụ đề, True nếu lấy từ cơ sở dữ liệu).
+    """
+    if video_id:
+        cues = get_cues(video_id, lang)
+        if cues is not None:
+            return cues, True
+    if subtitle_path and os.path.exists(subtitle_path):
+        with open(subtitle_path, 'r', encoding='utf-8') as f:
+            return json.load(f), False
+    return [], False
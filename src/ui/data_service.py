@@ -0,0 +1,90 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from PyQt6.QtCore import QObject, Qt, pyqtSignal
+
+from src.models.database import add_change_listener, remove_change_listener
+
+class LibraryDataService(QObject):
+    """Run database and file-system work on a worker thread and deliver results on the GUI thread.
+
+    Tasks run one at a time in submission order, so a write followed by a read sees the write.
+    Tasks submitted with a key supersede older tasks with the same key: an older task that has
+    not started yet is skipped, and its result is dropped if it already finished.
+
+    library_changed(kind, ids) relays the database change notifications (whatever thread wrote)
+    to the GUI thread.
+    """
+    # (on_result, on_error, key, generation, result, error) - emitted from the worker thread,
+    # delivered on the GUI thread through a queued connection
+    _task_finished = pyqtSignal(object)
+    library_changed = pyqtSignal(str, list)
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="library-data")
+        self._generations = {}
+        self._lock = threading.Lock()
+        self._stopped = False
+        self._task_finished.connect(self._deliver, Qt.ConnectionType.QueuedConnection)
+        add_change_listener(self._on_library_changed)
+
+    def submit(self, fn, *args, on_result=None, on_error=None, key=None, **kwargs):
+        """Run fn(*args, **kwargs) on the worker thread; on_result/on_error are called on the GUI thread.
+
+        After shutdown() (e.g. a download thread finishing while the window closes) the task is
+        dropped with a message and None is returned.
+        """
+        generation = self._next_generation(key) if key is not None else None
+        try:
+            if self._stopped:
+                raise RuntimeError("data service is shut down")
+            return self._executor.submit(self._run, fn, args, kwargs, on_result, on_error, key, generation)
+        except RuntimeError as e:
+            print(f"Dropped background task {getattr(fn, '__name__', fn)}: {e}")
+            return None
+
+    def cancel(self, key):
+        """Drop pending work and undelivered results for key"""
+        self._next_generation(key)
+
+    def is_current(self, key, generation):
+        with self._lock:
+            return key is None or self._generations.get(key) == generation
+
+    def shutdown(self):
+        self._stopped = True
+        remove_change_listener(self._on_library_changed)
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+    def _on_library_changed(self, kind, ids):
+        # Called on the writing thread; the signal is queued to receivers on the GUI thread
+        self.library_changed.emit(kind, list(ids))
+
+    def _next_generation(self, key):
+        with self._lock:
+            generation = self._generations.get(key, 0) + 1
+            self._generations[key] = generation
+            return generation
+
+    def _run(self, fn, args, kwargs, on_result, on_error, key, generation):
+        if not self.is_current(key, generation):
+            return  # Superseded before it started
+        result = None
+        error = None
+        try:
+            result = fn(*args, **kwargs)
+        except Exception as e:
+            print(f"Background task {getattr(fn, '__name__', fn)} failed: {e}")
+            error = e
+        self._task_finished.emit((on_result, on_error, key, generation, result, error))
+
+    def _deliver(self, payload):
+        on_result, on_error, key, generation, result, error = payload
+        if not self.is_current(key, generation):
+            return  # A newer request with the same key was submitted
+        if error is not None:
+            if on_error:
+                on_error(error)
+        elif on_result:
+            on_result(result)
@@ -0,0 +1,356 @@
+from PyQt6.QtCore import Qt, QAbstractListModel, QSortFilterProxyModel, QModelIndex, QRect, QSize, QEvent, pyqtSignal
+from PyQt6.QtGui import QColor, QFont, QPen
+from PyQt6.QtWidgets import QStyledItemDelegate, QStyle
+
+from src.utils.youtube_utils import THUMBNAIL_LIST_SIZE
+from src.utils import profiling
+from src.ui.thumbnail_cache import cached_thumbnail
+
+VideoRole = Qt.ItemDataRole.UserRole + 1
+ThumbnailRole = Qt.ItemDataRole.UserRole + 2
+
+def format_video_details(video):
+    """One-line summary of the precomputed metadata, e.g. 12:34 · 11.5 MB mp3 · 120/300 translated"""
+    parts = []
+    # File status cached by the library scanner (None = not scanned since the last save)
+    if video.get("audio_exists") == 0:
+        parts.append("audio file missing")
+    duration = video.get("duration")
+    if duration:
+        minutes, seconds = divmod(int(duration), 60)
+        hours, minutes = divmod(minutes, 60)
+        parts.append(f"{hours}:{minutes:02d}:{seconds:02d}" if hours else f"{minutes}:{seconds:02d}")
+    if video.get("audio_bytes"):
+        size = f"{video['audio_bytes'] / 1048576:.1f} MB"
+        parts.append(f"{size} {video['codec']}" if video.get("codec") else size)
+    cue_count = video.get("cue_count")
+    if cue_count is not None:
+        translated = video.get("translated_cue_count") or 0
+        if cue_count and translated >= cue_count:
+            parts.append("translated")
+        else:
+            parts.append(f"{translated}/{cue_count} translated")
+    return " · ".join(parts)
+
+def sort_key(video):
+    """Library order key, the list is sorted by it descending (same as ORDER BY download_date DESC, id DESC)"""
+    return (str(video.get("download_date") or ""), video.get("id") or 0)
+
+class LibraryModel(QAbstractListModel):
+    """The library as a flat list of video dictionaries (see video_row_to_dict), newest first.
+
+    Thumbnails are not stored here: ThumbnailRole reads the bounded pixmap cache, so memory does
+    not grow with the library size. thumbnail_loaded() repaints the rows of a newly cached thumbnail.
+    Rows are found by binary search on sort_key, so single-row inserts, updates and removes do not
+    depend on the library size.
+    """
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.videos = []
+        self._by_id = {}
+        self._ids_by_thumbnail = {}
+        self.failed_thumbnails = set()
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.videos)
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid() or index.row() >= len(self.videos):
+            return None
+        video = self.videos[index.row()]
+        if role == VideoRole:
+            return video
+        if role == ThumbnailRole:
+            return cached_thumbnail(video.get("thumbnail_path"), THUMBNAIL_LIST_SIZE)
+        if role == Qt.ItemDataRole.DisplayRole:
+            return video.get("title", "")
+        if role == Qt.ItemDataRole.ToolTipRole:
+            return video.get("title", "")
+        return None
+
+    def clear(self):
+        self.beginResetModel()
+        self.videos = []
+        self._by_id = {}
+        self._ids_by_thumbnail = {}
+        self.failed_thumbnails = set()
+        self.endResetModel()
+
+    def _insert_position(self, key):
+        """First row whose key is not greater than key (the list is sorted descending)"""
+        low, high = 0, len(self.videos)
+        while low < high:
+            middle = (low + high) // 2
+            if sort_key(self.videos[middle]) > key:
+                low = middle + 1
+            else:
+                high = middle
+        return low
+
+    def row_of(self, video_id):
+        """Row of the video with this database id, -1 if it is not loaded"""
+        video = self._by_id.get(video_id)
+        if video is None:
+            return -1
+        row = self._insert_position(sort_key(video))
+        if row < len(self.videos) and self.videos[row] is video:
+            return row
+        return -1
+
+    def _track(self, video):
+        self._by_id[video["id"]] = video
+        if video.get("thumbnail_path"):
+            self._ids_by_thumbnail.setdefault(video["thumbnail_path"], set()).add(video["id"])
+
+    def _untrack(self, video):
+        self._by_id.pop(video["id"], None)
+        ids = self._ids_by_thumbnail.get(video.get("thumbnail_path"))
+        if ids is not None:
+            ids.discard(video["id"])
+            if not ids:
+                del self._ids_by_thumbnail[video["thumbnail_path"]]
+
+    def append_videos(self, videos):
+        """Add a page loaded after the current last row (rows that are already loaded are skipped)"""
+        videos = [video for video in videos if video["id"] not in self._by_id]
+        if not videos:
+            return
+        if self.videos and sort_key(self.videos[-1]) < sort_key(videos[0]):
+            # Filter matches loaded ahead of their page sit after it, insert between them
+            for video in videos:
+                self.insert_video(video)
+            return
+        first = len(self.videos)
+        self.beginInsertRows(QModelIndex(), first, first + len(videos) - 1)
+        for video in videos:
+            self.videos.append(video)
+            self._track(video)
+        self.endInsertRows()
+
+    def insert_video(self, video, loaded_until=None):
+        """Insert a video at its sorted position (or update it if loaded).
+
+        Videos sorting after loaded_until (the key of the last row of the last loaded page) are
+        skipped: they belong to a page that has not been loaded yet and will come with it.
+        """
+        if video["id"] in self._by_id:
+            return self.update_video(video)
+        key = sort_key(video)
+        if loaded_until is not None and key < loaded_until:
+            return False
+        row = self._insert_position(key)
+        self.beginInsertRows(QModelIndex(), row, row)
+        self.videos.insert(row, video)
+        self._track(video)
+        self.endInsertRows()
+        return True
+
+    def update_video(self, video):
+        """Replace the loaded row of a video, moving it if its sort key changed"""
+        row = self.row_of(video["id"])
+        if row < 0:
+            return False
+        old = self.videos[row]
+        if sort_key(old) != sort_key(video):
+            self.remove_video(video["id"])
+            return self.insert_video(video)
+        self._untrack(old)
+        self.videos[row] = video
+        self._track(video)
+        index = self.index(row)
+        self.dataChanged.emit(index, index)
+        return True
+
+    def remove_video(self, video_id):
+        row = self.row_of(video_id)
+        if row < 0:
+            return False
+        self.beginRemoveRows(QModelIndex(), row, row)
+        self._untrack(self.videos.pop(row))
+        self.endRemoveRows()
+        return True
+
+    def remove_after(self, loaded_until):
+        """Remove the rows sorting after loaded_until (filter matches loaded ahead of their page)"""
+        row = self._insert_position(loaded_until)
+        if row < len(self.videos) and sort_key(self.videos[row]) == loaded_until:
+            row += 1
+        if row >= len(self.videos):
+            return
+        self.beginRemoveRows(QModelIndex(), row, len(self.videos) - 1)
+        for video in self.videos[row:]:
+            self._untrack(video)
+        del self.videos[row:]
+        self.endRemoveRows()
+
+    def has_video(self, video_id):
+        return video_id in self._by_id
+
+    def video_at(self, row):
+        return self.videos[row] if 0 <= row < len(self.videos) else None
+
+    def needs_thumbnail(self, row):
+        """Thumbnail path of a row that still shows a placeholder, None if there is nothing to load"""
+        video = self.video_at(row)
+        if video is None:
+            return None
+        path = video.get("thumbnail_path")
+        # Thumbnails the last scan found missing, or that failed to decode, are not looked up again
+        if not path or video.get("thumbnail_exists") == 0 or path in self.failed_thumbnails:
+            return None
+        if cached_thumbnail(path, THUMBNAIL_LIST_SIZE) is not None:
+            return None
+        return path
+
+    def thumbnail_loaded(self, path, pixmap):
+        """Repaint the rows showing path (pixmap=None marks the thumbnail as unreadable)"""
+        if pixmap is None:
+            self.failed_thumbnails.add(path)
+            return
+        for video_id in self._ids_by_thumbnail.get(path, ()):
+            row = self.row_of(video_id)
+            if row >= 0:
+                index = self.index(row)
+                self.dataChanged.emit(index, index, [ThumbnailRole])
+
+class LibraryFilterProxy(QSortFilterProxyModel):
+    """Shows the LibraryModel rows whose id is in the match set of the filter (all rows without a filter).
+
+    Rows keep the library order, nothing is sorted here; the matching itself is done by LibraryIndex.
+    """
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.matches = None
+
+    def set_matches(self, matches):
+        """Set of ids to show, None to show every row"""
+        self.matches = matches
+        self.invalidateFilter()
+
+    def filterAcceptsRow(self, source_row, source_parent):
+        if self.matches is None:
+            return True
+        video = self.sourceModel().video_at(source_row)
+        return video is not None and video["id"] in self.matches
+
+    def source_row(self, row):
+        return self.mapToSource(self.index(row, 0)).row()
+
+class LibraryDelegate(QStyledItemDelegate):
+    """Paints a library row (thumbnail, title, date, details, buttons) and handles button clicks"""
+    play_clicked = pyqtSignal(dict)
+    overlay_clicked = pyqtSignal(dict)
+    delete_clicked = pyqtSignal(dict)
+
+    ROW_HEIGHT = 100
+    MARGIN = 5
+    BUTTON_WIDTH = 80
+    BUTTON_HEIGHT = 26
+    BUTTON_SPACING = 4
+    # (name, label, background, text color), same colors as the old per-row QPushButtons
+    BUTTONS = (
+        ("play", "Play", "#e0e0e0", "#000000"),
+        ("overlay", "Overlay", "#4CAF50", "#ffffff"),
+        ("delete", "Delete", "#f44336", "#ffffff"),
+    )
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.pressed = None  # (row, button name) under the mouse button
+
+    def sizeHint(self, option, index):
+        return QSize(0, self.ROW_HEIGHT)
+
+    def button_rects(self, rect):
+        """{name: QRect} of the buttons of a row, stacked at the right edge"""
+        total_height = len(self.BUTTONS) * self.BUTTON_HEIGHT + (len(self.BUTTONS) - 1) * self.BUTTON_SPACING
+        x = rect.right() - self.MARGIN - self.BUTTON_WIDTH
+        y = rect.top() + (rect.height() - total_height) // 2
+        rects = {}
+        for name, _, _, _ in self.BUTTONS:
+            rects[name] = QRect(x, y, self.BUTTON_WIDTH, self.BUTTON_HEIGHT)
+            y += self.BUTTON_HEIGHT + self.BUTTON_SPACING
+        return rects
+
+    @profiling.timed("library row paint")
+    def paint(self, painter, option, index):
+        video = index.data(VideoRole)
+        if video is None:
+            return
+        painter.save()
+        rect = option.rect
+        if option.state & QStyle.StateFlag.State_Selected:
+            painter.fillRect(rect, option.palette.highlight())
+        painter.setPen(QColor("#dddddd"))
+        painter.drawLine(rect.bottomLeft(), rect.bottomRight())
+
+        # Thumbnail, or the placeholder until the thumbnail loader delivers it
+        thumbnail_rect = QRect(rect.left() + self.MARGIN, rect.top() + (rect.height() - THUMBNAIL_LIST_SIZE[1]) // 2,
+                               THUMBNAIL_LIST_SIZE[0], THUMBNAIL_LIST_SIZE[1])
+        pixmap = index.data(ThumbnailRole)
+        if pixmap is not None:
+            target = pixmap.rect()
+            target.moveCenter(thumbnail_rect.center())
+            painter.drawPixmap(target, pixmap)
+        else:
+            painter.fillRect(thumbnail_rect, QColor("#eeeeee"))
+            painter.setPen(QColor("#666666"))
+            font = QFont(option.font)
+            font.setPixelSize(10)
+            painter.setFont(font)
+            painter.drawText(thumbnail_rect, Qt.AlignmentFlag.AlignCenter, "No\nthumbnail")
+
+        # Title, date and details
+        text_left = thumbnail_rect.right() + 2 * self.MARGIN
+        text_width = rect.right() - self.MARGIN - self.BUTTON_WIDTH - self.MARGIN - text_left
+        line_height = option.fontMetrics.height() + 4
+        y = rect.top() + (rect.height() - 3 * line_height) // 2
+        title_font = QFont(option.font)
+        title_font.setBold(True)
+        painter.setFont(title_font)
+        painter.setPen(option.palette.text().color())
+        title = painter.fontMetrics().elidedText(video.get("title") or "No title", Qt.TextElideMode.ElideRight, text_width)
+        painter.drawText(QRect(text_left, y, text_width, line_height), Qt.AlignmentFlag.AlignVCenter, title)
+        painter.setFont(option.font)
+        painter.drawText(QRect(text_left, y + line_height, text_width, line_height), Qt.AlignmentFlag.AlignVCenter,
+                         video.get("download_date") or "")
+        details = format_video_details(video)
+        if details:
+            painter.setPen(QColor("#c62828" if video.get("audio_exists") == 0 else "#666666"))
+            details = painter.fontMetrics().elidedText(details, Qt.TextElideMode.ElideRight, text_width)
+            painter.drawText(QRect(text_left, y + 2 * line_height, text_width, line_height),
+                             Qt.AlignmentFlag.AlignVCenter, details)
+
+        # Buttons
+        rects = self.button_rects(rect)
+        for name, label, background, color in self.BUTTONS:
+            button_rect = rects[name]
+            fill = QColor(background)
+            painter.setPen(QPen(fill.darker(115)))
+            painter.setBrush(fill)
+            painter.drawRoundedRect(button_rect.adjusted(0, 0, -1, -1), 3, 3)
+            painter.setPen(QColor(color))
+            painter.drawText(button_rect, Qt.AlignmentFlag.AlignCenter, label)
+        painter.restore()
+
+    def editorEvent(self, event, model, option, index):
+        """Turn clicks on the painted buttons into play/overlay/delete signals"""
+        if event.type() not in (QEvent.Type.MouseButtonPress, QEvent.Type.MouseButtonRelease):
+            return False
+        hit = None
+        for name, rect in self.button_rects(option.rect).items():
+            if rect.contains(event.position().toPoint()):
+                hit = name
+                break
+        if event.type() == QEvent.Type.MouseButtonPress:
+            self.pressed = (index.row(), hit) if hit else None
+            return hit is not None
+        # Release: only a click that started on the same button counts
+        clicked = hit is not None and self.pressed == (index.row(), hit)
+        self.pressed = None
+        if clicked:
+            video = index.data(VideoRole)
+            getattr(self, f"{hit}_clicked").emit(video)
+        return hit is not None
@@ -1,86 +1,63 @@
 import os
-import json
-import shutil
-from datetime import datetime
-from PyQt6.QtWidgets import (QMainWindow, QWidget, QVBoxLayout, QHBoxLayout,
-                            QLabel, QLineEdit, QPushButton, QListWidget, QListWidgetItem,
-                            QMessageBox, QSplitter, QProgressBar, QDialog, QFileDialog, QTextEdit)
-from PyQt6.QtCore import Qt, QThread, pyqtSignal, QUrl, QSize
-from PyQt6.QtGui import QPixmap, QImage, QIcon
-from PyQt6.QtMultimedia import QMediaPlayer, QAudioOutput
+from PyQt6.QtWidgets import (QMainWindow, QWidget, QVBoxLayout, QHBoxLayout, QLabel, QLineEdit, QPushButton,
+                            QListView, QMessageBox, QProgressBar, QTextEdit, QCheckBox)
+from PyQt6.QtCore import Qt, QThread, pyqtSignal, QTimer
 
-from src.utils.youtube_utils import download_youtube_video, extract_video_id
-from src.models.database import get_all_videos, save_video, get_video_by_id, delete_all_videos
+from src.utils.youtube_utils import (download_youtube_video, extract_video_id, AUDIO_MODE_MP3, AUDIO_MODE_NATIVE,
+                                     is_collection_url, ProgressAggregator, ProgressEvent, STAGE_PREPARE,
+                                     THUMBNAIL_LIST_SIZE)
+from src.utils.source_sync import list_new_videos, mark_source_synced
+from src.models.database import (init_db, get_videos_page, page_cursor, save_videos, get_videos_by_ids,
+                                 mark_video_played, CHANGE_INSERT, CHANGE_UPDATE, CHANGE_DELETE, CHANGE_RESET)
+from src.utils.library_metadata import backfill_metadata_batch
+from src.utils.library_scanner import scan_library
+from src.utils.library_delete import delete_library_videos, DeleteProgress
+from src.utils.library_index import build_library_index
+from src.utils import profiling
+from src.ui.data_service import LibraryDataService
+from src.ui.thumbnail_cache import configure_thumbnail_cache, generate_thumbnail_variants, generate_variants_batch
+from src.ui.thumbnail_loader import ThumbnailLoader
+from src.ui.library_model import LibraryModel, LibraryFilterProxy, LibraryDelegate, VideoRole
 from src.ui.video_player import VideoPlayerWindow
 from src.ui.overlay_subtitle import OverlaySubtitle
+from src.ui.playback_manager import PlaybackManager
 
 class DownloadThread(QThread):
-    download_progress = pyqtSignal(int)
     download_complete = pyqtSignal(dict)
     download_error = pyqtSignal(str)
     status_update = pyqtSignal(str)
     
-    def __init__(self, url, download_folder):
+    def __init__(self, url, download_folder, audio_mode=AUDIO_MODE_MP3, progress_aggregator=None):
         super().__init__()
         self.url = url
         self.download_folder = download_folder
-        self.current_progress = 0
-        # Weights for each step (total = 100%)
-        self.weights = {
-            "prepare": 5,       # Preparation: 5%
-            "audio": 60,        # Audio download: 60%
-            "subtitle": 25,     # Subtitles: 25%
-            "thumbnail": 10     # Thumbnail: 10%
-        }
+        self.audio_mode = audio_mode
+        # Progress events are written to the aggregator from this thread and read by the GUI
+        # at its own refresh rate, instead of emitting a signal for every yt-dlp tick
+        self.progress_aggregator = progress_aggregator or ProgressAggregator()
         
     def run(self):
         try:
-            self.current_progress = 0
-            self.download_progress.emit(self.current_progress)
             self.status_update.emit("Preparing to download video...")
+            self.progress_aggregator.update(self.url, ProgressEvent(STAGE_PREPARE, 0.0))
             
-            # Preparation step
-            self.update_progress("prepare", 0)
-            
-            # Define callback to update progress
+            # Milestone messages only, progress goes through the aggregator
             def status_callback(status):
-                # Update status
                 self.status_update.emit(status)
-                
-                # Update progress based on status message
-                if "Downloading audio:" in status:
-                    try:
-                        # If there's percentage in the message (e.g., "Downloading audio: 42.0% (1.21MiB/s)")
-                        percent_str = status.split('%')[0].split(':')[1].strip()
-                        percent = float(percent_str)
-                        self.update_progress("audio", percent)
-                    except (IndexError, ValueError):
-                        pass
-                elif "Preparing to download audio" in status:
-                    self.update_progress("audio", 0)
-                elif "Audio download and processing complete" in status:
-                    self.update_progress("audio", 100)
-                    
-                elif "Searching for subtitles" in status:
-                    self.update_progress("subtitle", 0)
-                elif "Translating subtitles" in status:
-                    self.update_progress("subtitle", 30)
-                elif "Subtitle translation complete" in status:
-                    self.update_progress("subtitle", 80)
-                elif "Saving subtitles complete" in status:
-                    self.update_progress("subtitle", 100)
-                    
-                elif "Downloading thumbnail" in status:
-                    self.update_progress("thumbnail", 0)
-                elif "Thumbnail download complete" in status or "Default thumbnail downloaded" in status:
-                    self.update_progress("thumbnail", 100)
             
-            # Download video with callback
-            video_info = download_youtube_video(self.url, self.download_folder, status_callback)
+            def progress_callback(event):
+                self.progress_aggregator.update(self.url, event)
+            
+            # Download video with callbacks
+            video_info = download_youtube_video(self.url, self.download_folder, status_callback,
+                                                self.audio_mode, progress_callback)
+            
+            # Pre-scaled thumbnails for the list and the player, so they are never scaled at display time
+            try:
+                generate_thumbnail_variants(video_info.get("thumbnail_path"))
+            except Exception as e:
+                print(f"Could not create thumbnail variants: {e}")
             
-            # Ensure 100% when completed
-            self.current_progress = 100
-            self.download_progress.emit(self.current_progress)
             self.status_update.emit("Download completed!")
             self.download_complete.emit(video_info)
             
@@ -88,120 +65,77 @@ class DownloadThread(QThread):
             error_message = str(e)
             self.download_error.emit(error_message)
             self.status_update.emit(f"Error: {error_message}")
-            
-    def update_progress(self, step, percent):
-        """
-        Update progress based on the step and its completion percentage
-        step: "prepare", "audio", "subtitle", "thumbnail"
-        percent: 0-100 for current step
-        """
-        # Calculate overall progress
-        weight = self.weights.get(step, 0)
-        step_progress = (percent / 100) * weight
-        
-        # Calculate total progress
-        if step == "prepare":
-            self.current_progress = step_progress
-        elif step == "audio":
-            self.current_progress = self.weights["prepare"] + step_progress
-        elif step == "subtitle":
-            self.current_progress = self.weights["prepare"] + self.weights["audio"] + step_progress
-        elif step == "thumbnail":
-            self.current_progress = self.weights["prepare"] + self.weights["audio"] + self.weights["subtitle"] + step_progress
-        
-        # Round and limit progress from 0-100
-        self.current_progress = min(100, max(0, round(self.current_progress)))
-        
-        # Emit update signal
-        self.download_progress.emit(self.current_progress)
+        finally:
+            self.progress_aggregator.remove(self.url)
 
-class VideoItem(QWidget):
-    def __init__(self, video, parent=None):
-        super().__init__(parent)
-        self.video = video
-        
-        # Ensure all required keys exist in the dictionary
-        required_keys = ["thumbnail_path", "title", "download_date", "audio_path", "subtitle_path", "video_id"]
-        for key in required_keys:
-            if key not in video:
-                print(f"Missing key {key} in video: {video}")
-                if key == "thumbnail_path" or key == "subtitle_path":
-                    video[key] = None
-                else:
-                    video[key] = ""
-        
-        layout = QHBoxLayout(self)
-        
-        # Thumbnail image
-        thumbnail_label = QLabel()
-        thumbnail_path = video.get("thumbnail_path")
-        
-        if thumbnail_path:
-            # Try loading with absolute path
-            abs_thumbnail_path = os.path.abspath(thumbnail_path)
-            if os.path.exists(abs_thumbnail_path):
-                pixmap = QPixmap(abs_thumbnail_path)
-                thumbnail_label.setPixmap(pixmap.scaled(160, 90, Qt.AspectRatioMode.KeepAspectRatio))
+METADATA_KEYS = ("duration", "audio_bytes", "codec", "cue_count", "translated_cue_count", "last_played_at",
+                 "audio_exists", "subtitle_exists", "thumbnail_exists", "files_bytes")
+
+def video_row_to_dict(video):
+    """Convert a videos table row into the dictionary used by the UI widgets"""
+    video_dict = {
+        "id": video["id"],
+        "video_id": video["video_id"],
+        "title": video["title"],
+        "audio_path": video["audio_path"],
+        "subtitle_path": video["subtitle_path"],
+        "thumbnail_path": video["thumbnail_path"],
+        "download_date": video["download_date"],
+        # Precomputed metadata (None until ingest or the backfill has filled it)
+        "duration": video["duration"],
+        "audio_bytes": video["audio_bytes"],
+        "codec": video["codec"],
+        "cue_count": video["cue_count"],
+        "translated_cue_count": video["translated_cue_count"],
+        "last_played_at": video["last_played_at"],
+        # File status cached by the library scanner
+        "audio_exists": video["audio_exists"],
+        "subtitle_exists": video["subtitle_exists"],
+        "thumbnail_exists": video["thumbnail_exists"],
+        "files_bytes": video["files_bytes"]
+    }
+    
+    # Check required keys
+    for key, value in video_dict.items():
+        if value is None:
+            if key in ["subtitle_path", "thumbnail_path"] or key in METADATA_KEYS:
+                video_dict[key] = None
             else:
-                # Try with relative path from current directory
-                current_dir = os.getcwd()
-                alternative_path = os.path.join(current_dir, thumbnail_path)
-                
-                if os.path.exists(alternative_path):
-                    pixmap = QPixmap(alternative_path)
-                    thumbnail_label.setPixmap(pixmap.scaled(160, 90, Qt.AspectRatioMode.KeepAspectRatio))
-                else:
-                    # Thumbnail not found
-                    thumbnail_label.setText("No\nthumbnail")
-                    thumbnail_label.setStyleSheet("background-color: #eee; color: #666; font-size: 10px; text-align: center;")
-                    thumbnail_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
-        else:
-            thumbnail_label.setText("No\nthumbnail")
-            thumbnail_label.setStyleSheet("background-color: #eee; color: #666; font-size: 10px; text-align: center;")
-            thumbnail_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
-        
-        thumbnail_label.setFixedSize(160, 90)
-        layout.addWidget(thumbnail_label)
-        
-        # Video information
-        info_layout = QVBoxLayout()
-        title_label = QLabel(video.get("title", "No title"))
-        title_label.setStyleSheet("font-weight: bold;")
-        date_label = QLabel(video.get("download_date", ""))
-        info_layout.addWidget(title_label)
-        info_layout.addWidget(date_label)
-        layout.addLayout(info_layout, 1)
-        
-        # Control buttons
-        buttons_layout = QVBoxLayout()
-        
-        # Play button
-        play_button = QPushButton("Play")
-        play_button.setFixedWidth(80)
-        play_button.clicked.connect(self.play_video)
-        buttons_layout.addWidget(play_button)
-        
-        # Overlay subtitle button
-        overlay_button = QPushButton("Overlay")
-        overlay_button.setFixedWidth(80)
-        overlay_button.setStyleSheet("background-color: #4CAF50; color: white;")
-        overlay_button.clicked.connect(self.show_overlay_subtitle)
-        buttons_layout.addWidget(overlay_button)
-        
-        layout.addLayout(buttons_layout)
-        
-        self.setLayout(layout)
-        
-    def play_video(self):
-        self.player_window = VideoPlayerWindow(self.video)
-        self.player_window.show()
+                video_dict[key] = ""
+    return video_dict
+
+@profiling.timed("fetch_library_page")
+def fetch_library_page(limit, cursor):
+    """Load one page of the library (runs on the data service thread)"""
+    rows = get_videos_page(limit, cursor)
+    return [video_row_to_dict(row) for row in rows], (page_cursor(rows[-1]) if rows else None)
+
+@profiling.timed("fetch_library_videos")
+def fetch_library_videos(ids):
+    """Load the given videos, in no particular order (runs on the data service thread)"""
+    return [video_row_to_dict(row) for row in get_videos_by_ids(ids)]
+
+class SourceSyncThread(QThread):
+    """Expand playlist/channel URLs into the videos that are not in the library yet"""
+    sync_complete = pyqtSignal(list, list)  # listings, error messages
     
-    def show_overlay_subtitle(self):
-        self.overlay_window = OverlaySubtitle(self.video)
-        self.overlay_window.show()
+    def __init__(self, source_urls):
+        super().__init__()
+        self.source_urls = source_urls
+    
+    def run(self):
+        listings = []
+        errors = []
+        for url in self.source_urls:
+            try:
+                listings.append(list_new_videos(url))
+            except Exception as e:
+                print(f"Could not list source {url}: {e}")
+                errors.append(f"{url}: {e}")
+        self.sync_complete.emit(listings, errors)
 
 class TemplateItem(QWidget):
-    def __init__(self, template, parent=None):
+    def __init__(self, template, parent=None, thumbnail_loader=None):
         super().__init__(parent)
         self.template = template
         
@@ -216,36 +150,22 @@ class TemplateItem(QWidget):
                 else:
                     template[key] = ""
         
-        # Thumbnail image
-        thumbnail_label = QLabel()
-        thumbnail_path = template.get("thumbnail_path")
-        
-        if thumbnail_path:
-            # Try loading with absolute path
-            abs_thumbnail_path = os.path.abspath(thumbnail_path)
-            if os.path.exists(abs_thumbnail_path):
-                pixmap = QPixmap(abs_thumbnail_path)
-                thumbnail_label.setPixmap(pixmap.scaled(160, 90, Qt.AspectRatioMode.KeepAspectRatio))
-            else:
-                # Try with relative path from current directory
-                current_dir = os.getcwd()
-                alternative_path = os.path.join(current_dir, thumbnail_path)
-                
-                if os.path.exists(alternative_path):
-                    pixmap = QPixmap(alternative_path)
-                    thumbnail_label.setPixmap(pixmap.scaled(160, 90, Qt.AspectRatioMode.KeepAspectRatio))
-                else:
-                    # Thumbnail not found
-                    thumbnail_label.setText("No\nthumbnail")
-                    thumbnail_label.setStyleSheet("background-color: #eee; color: #666; font-size: 10px; text-align: center;")
-                    thumbnail_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
+        # Thumbnail image, decoded by the thumbnail loader; a placeholder is shown until it arrives
+        self.thumbnail_label = QLabel()
+        self.thumbnail_label.setStyleSheet("background-color: #eee; color: #666; font-size: 10px; text-align: center;")
+        self.thumbnail_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
+        self.thumbnail_label.setFixedSize(160, 90)
+        self.thumbnail_loader = thumbnail_loader or ThumbnailLoader(self, THUMBNAIL_LIST_SIZE, max_threads=1)
+        self.thumbnail_loader.thumbnail_ready.connect(self.on_thumbnail_ready)
+        thumbnail = None
+        if template.get("thumbnail_path"):
+            self.thumbnail_label.setText("Loading...")
+            thumbnail = self.thumbnail_loader.request(template["thumbnail_path"])
         else:
-            thumbnail_label.setText("No\nthumbnail")
-            thumbnail_label.setStyleSheet("background-color: #eee; color: #666; font-size: 10px; text-align: center;")
-            thumbnail_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
-        
-        thumbnail_label.setFixedSize(160, 90)
-        layout.addWidget(thumbnail_label)
+            self.thumbnail_label.setText("No\nthumbnail")
+        if thumbnail is not None:
+            self.on_thumbnail_ready(template["thumbnail_path"], thumbnail)
+        layout.addWidget(self.thumbnail_label)
         
         # Video information
         info_layout = QVBoxLayout()
@@ -273,6 +193,16 @@ class TemplateItem(QWidget):
         layout.addLayout(buttons_layout)
         
         self.setLayout(layout)
+    
+    def on_thumbnail_ready(self, path, pixmap):
+        if path != self.template.get("thumbnail_path"):
+            return
+        if pixmap is not None:
+            self.thumbnail_label.setStyleSheet("")
+            self.thumbnail_label.setPixmap(pixmap)
+        else:
+            # Thumbnail not found
+            self.thumbnail_label.setText("No\nthumbnail")
         
     def play_video(self):
         self.player_window = VideoPlayerWindow(self.template)
@@ -283,15 +213,46 @@ class TemplateItem(QWidget):
         self.overlay_window.show()
 
 class MainWindow(QMainWindow):
+    # How often download progress is pulled into the GUI (10 Hz)
+    PROGRESS_REFRESH_MS = 100
+    # Number of videos loaded per page while scrolling the library
+    PAGE_SIZE = 50
+    # Rows above/below the viewport whose thumbnails are decoded ahead of scrolling
+    THUMBNAIL_ROW_MARGIN = 5
+    THUMBNAIL_UPDATE_DELAY_MS = 30
+    # Bigger change notifications (bulk deletes, rescans) reload the list instead of patching rows
+    MAX_INCREMENTAL_CHANGES = 500
+    # Pause after the last keystroke before the filter is applied
+    FILTER_DELAY_MS = 80
+    # Thumbnails given scaled variants per data service task during the post-scan backfill
+    VARIANT_BATCH_SIZE = 20
+    
     def __init__(self):
         super().__init__()
         
         self.setWindowTitle("YouTube Subtitle Application")
         self.setGeometry(100, 100, 800, 600)
         
+        # Database and file-system work runs on this service's worker thread, never on the GUI thread
+        self.data_service = LibraryDataService(self)
+        # Saves, deletes, scans and backfills anywhere in the app update the list row by row
+        self.data_service.library_changed.connect(self.on_library_changed)
+        # Open the database (and run its migrations) first: every later task queues behind it
+        profiling.begin("init_db")
+        self.data_service.submit(init_db, on_result=self.on_library_opened, on_error=self.on_library_open_error)
+        configure_thumbnail_cache()
+        
+        # List thumbnails are decoded on a thread pool, only for rows near the viewport
+        self.thumbnail_loader = ThumbnailLoader(self)
+        self.thumbnail_loader.thumbnail_ready.connect(self.on_thumbnail_ready)
+        self.thumbnail_update_timer = QTimer(self)
+        self.thumbnail_update_timer.setSingleShot(True)
+        self.thumbnail_update_timer.setInterval(self.THUMBNAIL_UPDATE_DELAY_MS)
+        self.thumbnail_update_timer.timeout.connect(self.update_visible_thumbnails)
+        
         # Video download folder
         self.download_folder = os.path.join("src", "downloads")
-        os.makedirs(self.download_folder, exist_ok=True)
+        self.data_service.submit(os.makedirs, self.download_folder, exist_ok=True)
         
         # Main widget
         central_widget = QWidget()
@@ -312,9 +273,17 @@ class MainWindow(QMainWindow):
         self.download_button = QPushButton("Download")
         self.download_button.clicked.connect(self.download_videos)
         
+        # Keep the native m4a/opus stream instead of re-encoding every file to MP3
+        self.native_audio_checkbox = QCheckBox("Keep native audio (no MP3)")
+        self.native_audio_checkbox.setToolTip("Skip MP3 re-encoding and keep the original m4a/opus audio stream")
+        
+        download_controls_layout = QVBoxLayout()
+        download_controls_layout.addWidget(self.download_button)
+        download_controls_layout.addWidget(self.native_audio_checkbox)
+        
         url_layout.addWidget(url_label)
         url_layout.addWidget(self.url_input, 1)
-        url_layout.addWidget(self.download_button)
+        url_layout.addLayout(download_controls_layout)
         
         main_layout.addLayout(url_layout)
         
@@ -328,12 +297,44 @@ class MainWindow(QMainWindow):
         self.progress_bar.setVisible(False)
         progress_layout.addWidget(self.progress_bar)
         
+        # Playlists/channels of the current batch, marked as synced when the batch ends
+        self.source_listings = []
+        
+        # Progress from all download threads is coalesced here and applied on a fixed refresh timer
+        self.progress_aggregator = ProgressAggregator()
+        self.progress_timer = QTimer(self)
+        self.progress_timer.setInterval(self.PROGRESS_REFRESH_MS)
+        self.progress_timer.timeout.connect(self.refresh_progress)
+        
+        # Progress of a running delete (see start_delete)
+        self.delete_progress = None
+        self.delete_progress_timer = QTimer(self)
+        self.delete_progress_timer.setInterval(self.PROGRESS_REFRESH_MS)
+        self.delete_progress_timer.timeout.connect(self.refresh_delete_progress)
+        
         main_layout.addLayout(progress_layout)
         
         # Downloaded videos list and delete all button
         header_layout = QHBoxLayout()
         header_layout.addWidget(QLabel("<h3>Downloaded Videos</h3>"))
         
+        # As-you-type filter on titles and video ids, answered from the in-memory library index
+        self.filter_input = QLineEdit()
+        self.filter_input.setPlaceholderText("Filter by title or video ID")
+        self.filter_input.setClearButtonEnabled(True)
+        self.filter_input.textChanged.connect(self.schedule_filter)
+        header_layout.addWidget(self.filter_input, 1)
+        self.filter_timer = QTimer(self)
+        self.filter_timer.setSingleShot(True)
+        self.filter_timer.setInterval(self.FILTER_DELAY_MS)
+        self.filter_timer.timeout.connect(self.apply_filter)
+        
+        # Plays the selected videos (or every listed one) in one overlay, one after the other
+        self.play_queue_button = QPushButton("Play Queue")
+        self.play_queue_button.setToolTip("Play the selected videos (or all listed videos) back-to-back in the overlay, oldest first")
+        self.play_queue_button.clicked.connect(self.play_queue)
+        header_layout.addWidget(self.play_queue_button)
+        
         # Add Delete All button
         self.delete_all_button = QPushButton("Delete All")
         self.delete_all_button.setStyleSheet("background-color: #f44336; color: white;")
@@ -342,61 +343,366 @@ class MainWindow(QMainWindow):
         
         main_layout.addLayout(header_layout)
         
-        self.video_list = QListWidget()
-        self.video_list.setStyleSheet("QListWidget::item { border-bottom: 1px solid #ddd; }")
+        # The library is a model painted by a delegate: no widget per video, rows are only painted when visible
+        self.library_model = LibraryModel(self)
+        self.library_delegate = LibraryDelegate(self)
+        self.library_delegate.play_clicked.connect(self.play_video)
+        self.library_delegate.overlay_clicked.connect(self.show_overlay_subtitle)
+        self.library_delegate.delete_clicked.connect(self.delete_video)
+        # The view shows the model through the filter proxy
+        self.library_proxy = LibraryFilterProxy(self)
+        self.library_proxy.setSourceModel(self.library_model)
+        self.video_list = QListView()
+        self.video_list.setModel(self.library_proxy)
+        self.video_list.setItemDelegate(self.library_delegate)
+        self.video_list.setUniformItemSizes(True)
+        self.video_list.setSelectionMode(QListView.SelectionMode.ExtendedSelection)
+        self.video_list.setVerticalScrollMode(QListView.ScrollMode.ScrollPerPixel)
+        self.video_list.verticalScrollBar().valueChanged.connect(self.on_video_list_scrolled)
         main_layout.addWidget(self.video_list)
         
-        # Load video list
+        # Shown instead of the list when it is empty or could not be loaded
+        self.list_message_label = QLabel()
+        self.list_message_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
+        self.list_message_label.setVisible(False)
+        main_layout.addWidget(self.list_message_label)
+        
+        # At most one player window and one overlay per video, sharing one media player
+        self.playback = PlaybackManager(self, self.data_service)
+        
+        # Keyset pagination state
+        self.page_cursor = None
+        self.has_more_videos = True
+        self.page_request_pending = False
+        
+        # Filter state: matching ids (None without a filter) and the matches past the loaded pages
+        # that are still to be fetched, in library order
+        self.library_index = None
+        self.filter_matches = None
+        self.filter_pending = []
+        self.filter_request_pending = False
+        
+        # Downloads and deletes write from their own threads: wait for the migrations
+        self.download_button.setEnabled(False)
+        self.delete_all_button.setEnabled(False)
+        self.status_label.setText("Opening library...")
+        
+        # Load video list and index it for the filter
         self.load_videos()
+        self.build_filter_index()
+        
+        # Fill the metadata columns of videos saved before they existed, one batch at a time so
+        # page loads queued on the data service are not held up behind the whole backfill
+        self.metadata_backfilled = 0
+        self.missing_variants = []
+        self.variants_backfilled = 0
+        self.backfill_next_batch()
+    
+    def on_library_opened(self, result):
+        profiling.end("init_db")
+        self.download_button.setEnabled(True)
+        self.delete_all_button.setEnabled(True)
+        self.status_label.setText("Ready to download")
+    
+    def on_library_open_error(self, error):
+        profiling.end("init_db")
+        self.status_label.setText(f"Could not open the library: {error}")
+    
+    def backfill_next_batch(self):
+        self.data_service.submit(backfill_metadata_batch, on_result=self.on_metadata_batch_backfilled)
+    
+    def on_metadata_batch_backfilled(self, processed):
+        if processed:
+            self.metadata_backfilled += processed
+            self.backfill_next_batch()
+        else:
+            if self.metadata_backfilled:
+                print(f"Metadata backfill complete ({self.metadata_backfilled} videos)")
+            # Then check the files referenced by the library
+            self.data_service.submit(scan_library, self.download_folder,
+                                     on_result=self.on_library_scanned, on_error=self.on_library_scan_error)
+    
+    def on_library_scanned(self, report):
+        """Show the result of scan_library (changed rows arrive through on_library_changed)"""
+        self.metadata_backfilled = 0
+        if report.dangling or report.orphans:
+            self.status_label.setText(
+                f"Library check: {len(report.dangling)} videos with missing audio, "
+                f"{len(report.orphans)} orphaned files ({report.orphan_bytes / 1048576:.1f} MB) in {self.download_folder}")
+        # Videos saved by ingest.py have no scaled thumbnails yet (it runs without Qt): create them now,
+        # in small batches so page loads are not held up
+        self.missing_variants = list(report.missing_variants)
+        self.variants_backfilled = 0
+        self.backfill_next_variants()
+    
+    def backfill_next_variants(self):
+        batch = self.missing_variants[:self.VARIANT_BATCH_SIZE]
+        del self.missing_variants[:self.VARIANT_BATCH_SIZE]
+        if batch:
+            self.data_service.submit(generate_variants_batch, batch, on_result=self.on_variants_backfilled)
+        elif self.variants_backfilled:
+            print(f"Thumbnail variant backfill complete ({self.variants_backfilled} thumbnails)")
+    
+    def on_variants_backfilled(self, processed):
+        self.variants_backfilled += processed
+        self.backfill_next_variants()
+    
+    def on_library_scan_error(self, error):
+        print(f"Library check failed: {error}")
+        self.metadata_backfilled = 0
+    
+    def on_library_changed(self, kind, ids):
+        """Apply a database change notification to the loaded rows and the filter index"""
+        if kind == CHANGE_UPDATE and len(ids) > self.MAX_INCREMENTAL_CHANGES:
+            # Bulk updates come from scans and metadata backfills, which do not change titles:
+            # only the loaded rows need them, the others come up to date with their page
+            ids = [video_id for video_id in ids if self.library_model.has_video(video_id)]
+        if kind == CHANGE_RESET or len(ids) > self.MAX_INCREMENTAL_CHANGES:
+            self.load_videos()
+            self.build_filter_index()
+            return
+        if kind == CHANGE_DELETE:
+            if self.library_index is not None:
+                self.library_index.remove(ids)
+            for video_id in ids:
+                self.library_model.remove_video(video_id)
+            self.update_list_message()
+            self.schedule_thumbnail_update()
+            return
+        if ids:
+            self.data_service.submit(fetch_library_videos, ids,
+                                     on_result=lambda videos: self.apply_changed_videos(kind, videos))
+    
+    def apply_changed_videos(self, kind, videos):
+        """Insert or update the videos fetched for a change notification"""
+        for video in videos:
+            if kind == CHANGE_INSERT:
+                # Older than the last loaded row: it will arrive with a later page
+                self.library_model.insert_video(video, self.loaded_until())
+            else:
+                self.library_model.update_video(video)
+        if self.library_index is not None:
+            self.library_index.add_rows(videos)
+            if self.filter_matches is not None:
+                self.apply_filter()
+        self.update_list_message()
+        self.schedule_thumbnail_update()
+    
+    def loaded_until(self):
+        """Sort key of the last row of the last loaded page, None once every page is loaded"""
+        if not self.has_more_videos or self.page_cursor is None:
+            return None
+        return (str(self.page_cursor[0] or ""), self.page_cursor[1])
+    
+    def build_filter_index(self):
+        """Index the whole library for the filter on the data service thread"""
+        self.data_service.submit(build_library_index, on_result=self.on_library_index_built, key="library-index")
+    
+    def on_library_index_built(self, index):
+        self.library_index = index
+        if self.filter_input.text().strip():
+            self.apply_filter()
+    
+    def schedule_filter(self):
+        self.filter_timer.start()
+    
+    @profiling.timed("apply_filter")
+    def apply_filter(self):
+        """Show the videos matching the filter text, fetching the matches that are not loaded yet"""
+        if self.library_index is None:
+            return  # Applied when the index is built
+        matches = self.library_index.search(self.filter_input.text())
+        self.data_service.cancel("library-filter")
+        self.filter_request_pending = False
+        if matches is None:
+            if self.filter_matches is not None:
+                # Drop the matches loaded ahead of their page so the full list has no gaps
+                self.filter_matches = None
+                self.filter_pending = []
+                if self.loaded_until() is not None:
+                    self.library_model.remove_after(self.loaded_until())
+                elif self.has_more_videos:
+                    self.library_model.clear()
+                    self.load_next_page()
+            self.library_proxy.set_matches(None)
+        else:
+            self.filter_matches = matches
+            self.filter_pending = [video_id for video_id in self.library_index.sorted_ids(matches, self.loaded_until())
+                                   if not self.library_model.has_video(video_id)]
+            self.library_proxy.set_matches(matches)
+            self.load_next_page()
+        self.update_list_message()
+        self.schedule_thumbnail_update()
+        QTimer.singleShot(0, self.fill_viewport)
+    
+    def load_next_filter_page(self):
+        """Fetch the next page of filter matches that no loaded page contains"""
+        if not self.filter_pending or self.filter_request_pending:
+            return
+        ids = self.filter_pending[:self.PAGE_SIZE]
+        del self.filter_pending[:self.PAGE_SIZE]
+        self.filter_request_pending = True
+        self.data_service.submit(fetch_library_videos, ids, on_result=self.on_filter_page_loaded,
+                                 on_error=self.on_filter_page_error, key="library-filter")
+    
+    def on_filter_page_loaded(self, videos):
+        self.filter_request_pending = False
+        for video in videos:
+            self.library_model.insert_video(video)
+        self.update_list_message()
+        self.schedule_thumbnail_update()
+        QTimer.singleShot(0, self.fill_viewport)
+    
+    def on_filter_page_error(self, error):
+        print(f"Error loading filtered videos: {str(error)}")
+        self.filter_request_pending = False
+        self.filter_pending = []
+    
+    def can_load_more(self):
+        if self.filter_matches is not None:
+            return bool(self.filter_pending)
+        return self.has_more_videos
+    
+    def update_list_message(self):
+        """Show why the list is empty, if it is"""
+        if self.library_proxy.rowCount():
+            self.list_message_label.setVisible(False)
+        elif self.filter_matches is not None:
+            if not self.filter_pending and not self.filter_request_pending:
+                self.list_message_label.setText("No videos match the filter")
+                self.list_message_label.setVisible(True)
+        elif not self.has_more_videos:
+            self.list_message_label.setText("No videos downloaded yet")
+            self.list_message_label.setVisible(True)
+    
+    def on_video_opened(self, video):
+        """Record when a video was last played"""
+        self.data_service.submit(mark_video_played, video["id"])
     
     def load_videos(self):
-        self.video_list.clear()
-        try:
-            videos = get_all_videos()
-            
-            if not videos:
-                empty_item = QListWidgetItem("No videos downloaded yet")
-                empty_item.setTextAlignment(Qt.AlignmentFlag.AlignCenter)
-                self.video_list.addItem(empty_item)
-                return
-            
-            for video in videos:
-                try:
-                    # Create dictionary with fixed keys (column order in database)
-                    # video is a tuple with order (id, video_id, title, audio_path, subtitle_path, thumbnail_path, download_date)
-                    video_dict = {
-                        "id": video[0],
-                        "video_id": video[1],
-                        "title": video[2],
-                        "audio_path": video[3],
-                        "subtitle_path": video[4],
-                        "thumbnail_path": video[5],
-                        "download_date": video[6]
-                    }
-                    
-                    # Check required keys
-                    required_keys = ["video_id", "title", "audio_path", "subtitle_path", "thumbnail_path", "download_date"]
-                    for key in required_keys:
-                        if key not in video_dict or video_dict[key] is None:
-                            if key in ["subtitle_path", "thumbnail_path"]:
-                                video_dict[key] = None
-                            else:
-                                video_dict[key] = ""
-                    
-                    # Create ListWidgetItem
-                    item = QListWidgetItem()
-                    item.setSizeHint(QSize(0, 100))  # Fixed height for each item
-                    self.video_list.addItem(item)
-                    
-                    # Create and assign video widget
-                    video_widget = VideoItem(video_dict)
-                    self.video_list.setItemWidget(item, video_widget)
-                except Exception as e:
-                    print(f"Error loading video from database: {str(e)}")
-                    continue  # Skip problematic video
-        except Exception as e:
-            print(f"Error loading video list: {str(e)}")
-            self.video_list.addItem("Error loading video list")
+        """Reload the library list from the first page"""
+        profiling.begin("load_videos")
+        self.library_model.clear()
+        self.list_message_label.setVisible(False)
+        self.thumbnail_loader.cancel_all()
+        self.page_cursor = None
+        self.has_more_videos = True
+        self.page_request_pending = False
+        if self.filter_matches is not None:
+            # The matches are fetched again by id
+            self.apply_filter()
+        else:
+            self.load_next_page()
+    
+    def load_next_page(self):
+        """Request the next page of videos (keyset pagination on download_date, id) from the data service"""
+        if self.filter_matches is not None:
+            self.load_next_filter_page()
+            return
+        if not self.has_more_videos or self.page_request_pending:
+            return
+        self.page_request_pending = True
+        # Same key for every page request: a reload (load_videos) drops results of older requests
+        self.data_service.submit(
+            fetch_library_page, self.PAGE_SIZE, self.page_cursor,
+            on_result=self.on_page_loaded, on_error=self.on_page_error, key="library-page"
+        )
+    
+    def on_page_loaded(self, page):
+        """Add a page fetched by fetch_library_page to the list"""
+        entries, next_cursor = page
+        self.page_request_pending = False
+        profiling.end("load_videos")
+        self.has_more_videos = len(entries) == self.PAGE_SIZE
+        
+        if not entries and self.page_cursor is None:
+            self.update_list_message()
+            return
+        
+        if next_cursor is not None:
+            self.page_cursor = next_cursor
+        
+        self.library_model.append_videos(entries)
+        self.schedule_thumbnail_update()
+        # Checked after the view has laid out the new rows
+        QTimer.singleShot(0, self.fill_viewport)
+    
+    def fill_viewport(self):
+        """Keep loading until the list can scroll, otherwise the user can't trigger the next page"""
+        if self.can_load_more() and self.video_list.verticalScrollBar().maximum() == 0:
+            self.load_next_page()
+    
+    def schedule_thumbnail_update(self):
+        """Coalesce scroll/page events into one update_visible_thumbnails call"""
+        self.thumbnail_update_timer.start()
+    
+    def visible_rows(self):
+        """(first, last) row in or near the viewport of the video list"""
+        viewport = self.video_list.viewport().rect()
+        first = self.video_list.indexAt(viewport.topLeft()).row()
+        last = self.video_list.indexAt(viewport.bottomLeft()).row()
+        if first < 0:
+            first = 0
+        if last < 0:
+            last = self.library_proxy.rowCount() - 1
+        return first - self.THUMBNAIL_ROW_MARGIN, last + self.THUMBNAIL_ROW_MARGIN
+    
+    @profiling.timed("update_visible_thumbnails")
+    def update_visible_thumbnails(self):
+        """Queue decodes for placeholders near the viewport, cancel the ones scrolled away"""
+        first, last = self.visible_rows()
+        wanted = set()
+        for row in range(max(first, 0), min(last, self.library_proxy.rowCount() - 1) + 1):
+            path = self.library_model.needs_thumbnail(self.library_proxy.source_row(row))
+            if path:
+                wanted.add(path)
+        for path in self.thumbnail_loader.pending_paths():
+            if path not in wanted:
+                self.thumbnail_loader.cancel(path)
+        for path in wanted:
+            pixmap = self.thumbnail_loader.request(path)
+            if pixmap is not None:
+                self.on_thumbnail_ready(path, pixmap)
+    
+    def on_thumbnail_ready(self, path, pixmap):
+        """Repaint the rows of a thumbnail decoded by the thumbnail loader"""
+        self.library_model.thumbnail_loaded(path, pixmap)
+    
+    def on_page_error(self, error):
+        print(f"Error loading video list: {str(error)}")
+        self.page_request_pending = False
+        self.has_more_videos = False
+        self.list_message_label.setText("Error loading video list")
+        self.list_message_label.setVisible(True)
+    
+    def on_video_list_scrolled(self, value):
+        """Fetch the next page when the list is scrolled near the bottom"""
+        self.schedule_thumbnail_update()
+        scroll_bar = self.video_list.verticalScrollBar()
+        if self.can_load_more() and value >= scroll_bar.maximum() - scroll_bar.pageStep():
+            self.load_next_page()
+    
+    def play_video(self, video):
+        self.playback.show_player(video)
+        self.on_video_opened(video)
+    
+    def show_overlay_subtitle(self, video):
+        self.playback.show_overlay(video)
+        self.on_video_opened(video)
+    
+    def play_queue(self):
+        """Play the selected videos, or all listed videos, in the overlay in download order"""
+        rows = sorted(index.row() for index in self.video_list.selectionModel().selectedRows())
+        if not rows:
+            rows = range(self.library_proxy.rowCount())
+        # The list is newest first
+        videos = [self.library_proxy.index(row, 0).data(VideoRole) for row in reversed(rows)]
+        overlay = self.playback.show_overlay_queue(videos)
+        if overlay is None:
+            QMessageBox.information(self, "Play Queue", "No playable videos to queue")
+            return
+        self.on_video_opened(overlay.video)
+        overlay.video_changed.connect(self.on_video_opened)
     
     def download_videos(self):
         """Download a list of videos from the entered URLs"""
@@ -418,10 +724,14 @@ class MainWindow(QMainWindow):
             QMessageBox.warning(self, "Error", "No valid URLs found")
             return
         
-        # Check validity of URLs
+        # Check validity of URLs, playlists/channels are expanded in the background
         invalid_urls = []
         valid_urls = []
+        source_urls = []
         for url in urls:
+            if is_collection_url(url):
+                source_urls.append(url)
+                continue
             video_id = extract_video_id(url)
             if not video_id:
                 invalid_urls.append(url)
@@ -435,6 +745,42 @@ class MainWindow(QMainWindow):
             QMessageBox.warning(self, "Invalid URLs", 
                                f"The following URLs are not valid YouTube URLs:\n{invalid_msg}")
         
+        self.source_listings = []
+        if source_urls:
+            # List playlists/channels off the GUI thread, then continue with the combined list
+            self.download_button.setEnabled(False)
+            self.status_label.setText(f"Listing {len(source_urls)} playlists/channels...")
+            self.source_sync_thread = SourceSyncThread(source_urls)
+            self.source_sync_thread.sync_complete.connect(
+                lambda listings, errors: self.on_sources_listed(valid_urls, listings, errors))
+            self.source_sync_thread.start()
+            return
+        
+        self.start_downloads(valid_urls)
+    
+    def on_sources_listed(self, valid_urls, listings, errors):
+        """Handle playlists/channels expanded by SourceSyncThread"""
+        self.download_button.setEnabled(True)
+        self.status_label.setText("Ready to download")
+        if errors:
+            QMessageBox.warning(self, "Playlist error", "Could not list:\n" + "\n".join(errors[:5]))
+        
+        self.source_listings = listings
+        urls = list(valid_urls)
+        for listing in listings:
+            urls.extend(listing.video_urls)
+        
+        if not urls:
+            if listings:
+                # Nothing new, but the sources are up to date
+                for listing in listings:
+                    self.data_service.submit(mark_source_synced, listing)
+                QMessageBox.information(self, "Up to date", "No new videos in the playlists/channels.")
+            return
+        self.start_downloads(urls)
+    
+    def start_downloads(self, valid_urls):
+        """Confirm and start downloading the given video URLs"""
         if not valid_urls:
             return  # No valid URLs to download
         
@@ -454,11 +800,14 @@ class MainWindow(QMainWindow):
         self.download_button.setEnabled(False)
         self.progress_bar.setValue(0)
         self.progress_bar.setVisible(True)
+        self.progress_timer.start()
         
         # Create a queue of URLs to download sequentially
         self.urls_queue = valid_urls.copy()
         self.total_videos = len(self.urls_queue)
         self.processed_videos = 0
+        self.saved_videos = 0  # Downloaded and saved to the library
+        self.unsaved_videos = []  # (video_info, error) downloaded but not saved, can be retried
         
         # Start downloading the first video
         self.download_next_video()
@@ -478,8 +827,8 @@ class MainWindow(QMainWindow):
         self.status_label.setText(f"Downloading video {self.processed_videos}/{self.total_videos}: {url}")
         
         # Create and start download thread
-        self.download_thread = DownloadThread(url, self.download_folder)
-        self.download_thread.download_progress.connect(self.update_progress)
+        audio_mode = AUDIO_MODE_NATIVE if self.native_audio_checkbox.isChecked() else AUDIO_MODE_MP3
+        self.download_thread = DownloadThread(url, self.download_folder, audio_mode, self.progress_aggregator)
         self.download_thread.download_complete.connect(self.on_single_download_complete)
         self.download_thread.download_error.connect(self.on_download_error)
         self.download_thread.status_update.connect(self.update_status)
@@ -487,15 +836,8 @@ class MainWindow(QMainWindow):
     
     def on_single_download_complete(self, video_info):
         """Handle when a single video is downloaded successfully"""
-        # Save video information to database
-        save_video(
-            video_info["video_id"],
-            video_info["title"],
-            video_info["audio_path"],
-            video_info["subtitle_path"],
-            video_info["thumbnail_path"],
-            video_info["download_date"]
-        )
+        # Save video information and its subtitle cues to database (in the background)
+        self.save_downloaded_videos([video_info])
         
         # Continue with the next video in the queue
         if self.urls_queue:
@@ -505,20 +847,75 @@ class MainWindow(QMainWindow):
     
     def on_all_downloads_complete(self):
         """Handle when all videos have been downloaded or processed"""
-        # Reload video list
-        self.load_videos()
+        # Remember the sync position of the playlists/channels this batch came from. Queued after the
+        # saves on the same worker, so videos that failed are not skipped by the next sync
+        for listing in self.source_listings:
+            self.data_service.submit(mark_source_synced, listing)
+        self.source_listings = []
         
         # Reset interface
+        self.progress_timer.stop()
         self.url_input.clear()
-        self.download_button.setEnabled(True)
         self.progress_bar.setVisible(False)
+        self.show_summary_after_saves()
+    
+    def save_downloaded_videos(self, videos):
+        """Save downloaded videos on the data service; the ones that fail are kept for a retry"""
+        self.data_service.submit(save_videos, videos,
+                                 on_result=lambda result: self.on_downloads_saved(videos),
+                                 on_error=lambda error: self.on_downloads_save_error(videos, error))
+    
+    def on_downloads_saved(self, videos):
+        self.saved_videos += len(videos)
+    
+    def on_downloads_save_error(self, videos, error):
+        self.unsaved_videos.extend((video, str(error)) for video in videos)
+    
+    def show_summary_after_saves(self):
+        """Show the download summary once the saves queued before it are done (the worker runs tasks in order)"""
+        self.status_label.setText("Saving to the library...")
+        if self.data_service.submit(lambda: None, on_result=lambda result: self.show_download_summary()) is None:
+            self.show_download_summary()
+    
+    def show_download_summary(self):
+        """Report the videos saved to the library, offer to retry the ones that could not be saved"""
+        self.download_button.setEnabled(True)
         self.status_label.setText("Ready to download")
-        
-        # Show success message
-        QMessageBox.information(self, "Success", f"Successfully downloaded {self.processed_videos} videos!")
+        if not self.unsaved_videos:
+            QMessageBox.information(self, "Success", f"Successfully downloaded {self.saved_videos} videos!")
+            return
+        message = QMessageBox(self)
+        message.setIcon(QMessageBox.Icon.Warning)
+        message.setWindowTitle("Library error")
+        message.setText(f"Saved {self.saved_videos} videos. {len(self.unsaved_videos)} downloaded videos "
+                        f"could not be saved to the library.")
+        message.setInformativeText("Their files are kept. Try saving them again?")
+        message.setDetailedText("\n".join(f"{video.get('title') or video.get('video_id')}: {error}"
+                                          for video, error in self.unsaved_videos))
+        message.setStandardButtons(QMessageBox.StandardButton.Retry | QMessageBox.StandardButton.Close)
+        if message.exec() == QMessageBox.StandardButton.Retry:
+            videos = [video for video, _ in self.unsaved_videos]
+            self.unsaved_videos = []
+            self.download_button.setEnabled(False)
+            self.save_downloaded_videos(videos)
+            self.show_summary_after_saves()
     
-    def update_progress(self, value):
-        self.progress_bar.setValue(value)
+    def refresh_progress(self):
+        """Apply the latest coalesced progress events (called by progress_timer)"""
+        changed = self.progress_aggregator.drain()
+        if not changed:
+            return
+        self.progress_bar.setValue(round(self.progress_aggregator.overall_fraction() * 100))
+        
+        # Show transfer details for the most recent event that has them
+        for event in changed.values():
+            if event.speed and event.total_bytes:
+                details = f"{event.downloaded_bytes / 1048576:.1f}/{event.total_bytes / 1048576:.1f} MiB, {event.speed / 1048576:.2f} MiB/s"
+                if event.eta is not None:
+                    details += f", ETA {int(event.eta)}s"
+                self.status_label.setText(f"Downloading {event.stage} ({details})")
+            elif event.message:
+                self.status_label.setText(event.message)
     
     def update_status(self, status):
         self.status_label.setText(status)
@@ -546,6 +943,18 @@ class MainWindow(QMainWindow):
             # If no more videos in the queue, finish the process
             self.on_all_downloads_complete()
     
+    def delete_video(self, video):
+        """Delete one video and its files after confirmation"""
+        confirm = QMessageBox.question(
+            self,
+            "Confirm deletion",
+            f"Delete \"{video.get('title', '')}\" and its downloaded files?",
+            QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No,
+            QMessageBox.StandardButton.No
+        )
+        if confirm == QMessageBox.StandardButton.Yes:
+            self.start_delete([video["id"]], f"Deleting \"{video.get('title', '')}\"...")
+    
     def delete_all_videos(self):
         """Delete all downloaded videos and data from database"""
         # Show confirmation dialog
@@ -558,53 +967,65 @@ class MainWindow(QMainWindow):
         )
         
         if confirm == QMessageBox.StandardButton.Yes:
-            try:
-                # Get all file paths from database and delete data
-                file_paths = delete_all_videos()
-                deleted_count = 0
-                
-                # Delete files
-                for paths in file_paths:
-                    audio_path, subtitle_path, thumbnail_path = paths
-                    
-                    # Delete audio file
-                    if audio_path and os.path.exists(audio_path):
-                        try:
-                            os.remove(audio_path)
-                            deleted_count += 1
-                        except Exception as e:
-                            print(f"Error deleting audio file {audio_path}: {str(e)}")
-                    
-                    # Delete subtitle file
-                    if subtitle_path and os.path.exists(subtitle_path):
-                        try:
-                            os.remove(subtitle_path)
-                            deleted_count += 1
-                        except Exception as e:
-                            print(f"Error deleting subtitle file {subtitle_path}: {str(e)}")
-                    
-                    # Delete thumbnail file
-                    if thumbnail_path and os.path.exists(thumbnail_path):
-                        try:
-                            os.remove(thumbnail_path)
-                            deleted_count += 1
-                        except Exception as e:
-                            print(f"Error deleting thumbnail file {thumbnail_path}: {str(e)}")
-                
-                # Reload video list (will be empty)
-                self.load_videos()
-                
-                # Show success message
-                QMessageBox.information(
-                    self,
-                    "Delete successful",
-                    f"Deleted all data and {deleted_count} files."
-                )
-                
-            except Exception as e:
-                # Show error message
-                QMessageBox.critical(
-                    self,
-                    "Error deleting",
-                    f"An error occurred while deleting data: {str(e)}"
-                ) 
\ No newline at end of file
+            self.start_delete(None, "Deleting all videos...")
+    
+    def start_delete(self, video_ids, message):
+        """Delete rows and files on the data service thread (video_ids=None deletes everything)"""
+        self.delete_all_button.setEnabled(False)
+        self.status_label.setText(message)
+        # Files are removed after the rows, progress is polled like the download progress
+        self.delete_progress = DeleteProgress()
+        self.progress_bar.setValue(0)
+        self.progress_bar.setVisible(True)
+        self.delete_progress_timer.start()
+        self.data_service.submit(delete_library_videos, video_ids, self.delete_progress,
+                                 on_result=lambda result: self.on_videos_deleted(result, video_ids is None),
+                                 on_error=self.on_delete_error)
+    
+    def refresh_delete_progress(self):
+        if self.delete_progress is not None:
+            self.progress_bar.setValue(round(self.delete_progress.fraction() * 100))
+    
+    def finish_delete(self):
+        self.delete_progress_timer.stop()
+        self.delete_progress = None
+        self.progress_bar.setVisible(False)
+        self.delete_all_button.setEnabled(True)
+        self.status_label.setText("Ready to download")
+    
+    def on_videos_deleted(self, result, deleted_all=False):
+        """Handle the DeleteResult of delete_library_videos"""
+        self.finish_delete()
+        
+        # The list was updated by the delete notification
+        if result.failures:
+            failed = "\n".join(f"{path}: {error}" for path, error in result.failures[:5])
+            QMessageBox.warning(
+                self,
+                "Delete incomplete",
+                f"Deleted {result.videos_deleted} videos and {result.files_deleted} files, "
+                f"but {len(result.failures)} files could not be removed:\n{failed}"
+            )
+        elif deleted_all:
+            # Show success message
+            QMessageBox.information(
+                self,
+                "Delete successful",
+                f"Deleted all data ({result.videos_deleted} videos) and {result.files_deleted} files."
+            )
+    
+    def on_delete_error(self, error):
+        self.finish_delete()
+        # Show error message
+        QMessageBox.critical(
+            self,
+            "Error deleting",
+            f"An error occurred while deleting data: {str(error)}"
+        )
+    
+    def closeEvent(self, event):
+        """Close the players and stop the data service thread when the main window closes"""
+        self.playback.close_all()
+        self.data_service.shutdown()
+        self.thumbnail_loader.shutdown()
+        super().closeEvent(event)
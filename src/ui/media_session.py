@@ -0,0 +1,141 @@
+import os
+import threading
+
+from PyQt6.QtCore import QObject, QUrl, pyqtSignal
+from PyQt6.QtMultimedia import QMediaPlayer, QAudioOutput
+
+from src.models.database import load_subtitles, get_cues_in_range
+
+FIRST_CUES_MS = 120000  # Cues of the first two minutes, read (by range) before the whole track
+
+class MediaSession(QObject):
+    """The media engine of one video (QMediaPlayer, QAudioOutput and the subtitle cues), shared by
+    the player window and the overlay of that video.
+
+    Windows attach() when they open and detach() when they close; when the last one detaches the
+    session stops playback and frees the decoder and the subtitles. Player signals connected through
+    connect() are disconnected on detach(), so a closed window never receives updates.
+
+    Cues are read off the GUI thread, on the LibraryDataService worker when one is given:
+    request_subtitles() returns them if they are loaded, otherwise subtitles_ready follows. The
+    cues of the first FIRST_CUES_MS come first, by a range query on the cues table, so playback
+    shows them while the whole track is read; subtitles_complete tells the two apart.
+    """
+    released = pyqtSignal()
+    subtitles_ready = pyqtSignal()
+    _background_finished = pyqtSignal(object, object)  # (on_result, result), from a fallback thread
+
+    def __init__(self, video, parent=None, data_service=None):
+        super().__init__(parent)
+        self.video = video
+        self.data_service = data_service
+        self.player = QMediaPlayer(self)
+        self.audio_output = QAudioOutput(self)
+        self.player.setAudioOutput(self.audio_output)
+        self.subtitles = None
+        self.subtitles_in_db = False
+        self.subtitles_complete = False  # False while subtitles only holds the first cues
+        self.cue_starts = []  # Start time of each cue, for bisect lookups
+        self._subtitles_requested = False
+        self._connections = {}  # window -> [(signal, slot)]
+        self._background_finished.connect(lambda on_result, result: on_result(result))
+
+    def attach(self, window):
+        self._connections.setdefault(window, [])
+
+    def detach(self, window):
+        for signal, slot in self._connections.pop(window, ()):
+            try:
+                signal.disconnect(slot)
+            except TypeError:
+                pass  # Already disconnected
+        if not self._connections:
+            self.release()
+
+    def connect(self, window, signal_name, slot):
+        """Connect a player signal (or subtitles_ready) to a slot of window, undone by detach(window)"""
+        signal = self.subtitles_ready if signal_name == "subtitles_ready" else getattr(self.player, signal_name)
+        signal.connect(slot)
+        self._connections.setdefault(window, []).append((signal, slot))
+
+    def run_in_background(self, fn, *args, on_result=None):
+        """Run fn(*args) off the GUI thread (on the data service if there is one); on_result(result)
+        is called on the GUI thread"""
+        if self.data_service is not None:
+            self.data_service.submit(fn, *args, on_result=on_result)
+            return
+        def run():
+            try:
+                result = fn(*args)
+            except Exception as e:
+                print(f"Background task {getattr(fn, '__name__', fn)} failed: {e}")
+                return
+            if on_result is not None:
+                try:
+                    self._background_finished.emit(on_result, result)
+                except RuntimeError:
+                    pass  # Session released in the meantime
+        threading.Thread(target=run, daemon=True).start()
+
+    def _read_subtitles(self):
+        try:
+            return load_subtitles(self.video.get("video_id"), self.video.get("subtitle_path"))
+        except Exception as e:
+            print(f"Error reading subtitles: {str(e)}")
+            return [], False
+
+    def set_subtitles(self, subtitles, in_db=None):
+        self.subtitles = subtitles
+        if in_db is not None:
+            self.subtitles_in_db = in_db
+        self.cue_starts = [cue["start"] for cue in subtitles]
+
+    def request_subtitles(self):
+        """Subtitle cues of the video if they are loaded, otherwise None after starting to read them
+        (once for every window of the session); subtitles_ready is emitted when they arrive"""
+        if self.subtitles is None and not self._subtitles_requested:
+            self._subtitles_requested = True
+            if self.video.get("video_id"):
+                self.run_in_background(get_cues_in_range, self.video["video_id"], 0, FIRST_CUES_MS,
+                                       on_result=self._on_first_cues_loaded)
+            self.run_in_background(self._read_subtitles, on_result=self._on_subtitles_loaded)
+        return self.subtitles
+
+    def preload(self):
+        """Open the audio file and read the cues in the background, ahead of playback"""
+        audio_path = self.video.get("audio_path")
+        if audio_path and self.video.get("audio_exists") != 0:
+            self.set_source(audio_path)  # QMediaPlayer opens the file asynchronously
+        self.request_subtitles()
+
+    def _on_first_cues_loaded(self, cues):
+        # Empty when the cues are not in the database (legacy JSON file): wait for the whole read
+        if cues and self.subtitles is None and self.player is not None:
+            self.set_subtitles(cues, in_db=True)
+            self.subtitles_ready.emit()
+
+    def _on_subtitles_loaded(self, result):
+        if not self.subtitles_complete and self.player is not None:
+            self.set_subtitles(*result)
+            self.subtitles_complete = True
+            self.subtitles_ready.emit()
+
+    def set_source(self, audio_path):
+        """Load the audio file unless another window of the session already did"""
+        if self.player.source().isEmpty():
+            self.player.setSource(QUrl.fromLocalFile(os.path.abspath(audio_path)))
+
+    def release(self):
+        """Stop playback, free the decoder and the cues (the session cannot be used afterwards)"""
+        if self.player is None:
+            return
+        self.player.stop()
+        self.player.setSource(QUrl())
+        self.player.deleteLater()
+        self.audio_output.deleteLater()
+        self.player = None
+        self.audio_output = None
+        self.subtitles = None
+        self.cue_starts = []
+        self.released.emit()
+        self.deleteLater()
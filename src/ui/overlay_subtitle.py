@@ -1,23 +1,37 @@
-import os
 import json
+from bisect import bisect_right
 from PyQt6.QtWidgets import QWidget, QLabel, QVBoxLayout, QPushButton, QHBoxLayout, QSlider, QCheckBox, QMessageBox
-from PyQt6.QtCore import Qt, QTimer, QUrl, QSettings, QThread, pyqtSignal
-from PyQt6.QtMultimedia import QMediaPlayer, QAudioOutput
-from PyQt6.QtGui import QFont, QFontMetrics
+from PyQt6.QtCore import Qt, QTimer, QSettings, QThread, pyqtSignal
+from PyQt6.QtMultimedia import QMediaPlayer
+from PyQt6.QtGui import QColor, QBrush, QPainter
 
-# Try to import translation library
-try:
-    import translators as ts
-    TRANSLATORS_AVAILABLE = True
-except ImportError:
-    TRANSLATORS_AVAILABLE = False
-    print("The 'translators' library is not installed. Automatic translation feature will not work.")
-    print("Run 'pip install translators' to install.")
+from src.models.database import save_cue_translations
+from src.ui.media_session import MediaSession
+from src.ui.subtitle_view import SubtitleView
+# The translation library is imported on the first translation, not with the window
+from src.utils.youtube_utils import get_translators
 
 # Identifiers for QSettings
 ORGANIZATION_NAME = "ntrantrong"
 APPLICATION_NAME = "OverlaySubtitles"
 
+def save_translations(video, subtitles_in_db, new_translations, subtitles):
+    """Save only the new translations when subtitles live in the database, otherwise the
+    updated subtitles to their file if possible (runs off the GUI thread)"""
+    if subtitles_in_db:
+        try:
+            save_cue_translations(video["video_id"], new_translations)
+            print(f"Saved {len(new_translations)} translations to the database")
+        except Exception as e:
+            print(f"Error saving translations: {e}")
+    elif video.get("subtitle_path"):
+        try:
+            with open(video["subtitle_path"], 'w', encoding='utf-8') as f:
+                json.dump(subtitles, f, ensure_ascii=False, indent=4)
+            print("Translations saved to subtitle file")
+        except Exception as e:
+            print(f"Error saving translations: {e}")
+
 # --- Translation Thread --- (Background thread for translation)
 class TranslationThread(QThread):
     translation_complete = pyqtSignal(list)
@@ -28,7 +42,8 @@ class TranslationThread(QThread):
         self.subtitles_to_translate = subtitles_list
 
     def run(self):
-        if not TRANSLATORS_AVAILABLE:
+        ts = get_translators()
+        if ts is None:
             self.translation_error.emit("The 'translators' library is not installed.")
             return
             
@@ -83,16 +98,29 @@ class OverlaySubtitle(QWidget):
     # Slider mapping: 25 -> 0.25x, 50 -> 0.5x, 100 -> 1.0x, 200 -> 2.0x
     SLIDER_TO_RATE_FACTOR = 100
     DEFAULT_SHOW_VIETSUB = False # Default to not showing Vietnamese subtitles
+    SETTINGS_SAVE_DELAY_MS = 500 # Settings are written once the sliders stop moving
+    # Queue mode: the next video is opened and its cues read this long before the current one ends
+    PRELOAD_AHEAD_MS = 30000
+    closed = pyqtSignal()
+    video_changed = pyqtSignal(dict)  # Queue mode moved on to another video
 
-    def __init__(self, video):
+    def __init__(self, video, session=None, queue=None, session_factory=None):
         super().__init__()
         
         self.video = video
-        self.subtitles = []
+        # Queue mode: videos played back to back (video is queue[0]), sessions come from
+        # session_factory so they are shared with the player windows of the same videos
+        self.queue = list(queue or [video])
+        self.queue_position = 0
+        self.session_factory = session_factory or MediaSession
+        self.next_session = None
+        self.subtitles = None  # None until the session has read the cues
+        self.subtitles_in_db = False
+        self.cue_starts = []
         self.current_subtitle_index = -1
         self.drag_position = None
         self.translations_attempted = False # Flag to mark if translation has been attempted
-        self.translation_thread = None # Keep reference to translation thread
+        self.translation_threads = [] # Keep references to translation threads (one per queued video at most)
 
         # Load settings
         self.settings = QSettings(ORGANIZATION_NAME, APPLICATION_NAME)
@@ -104,14 +132,11 @@ class OverlaySubtitle(QWidget):
         self.current_font_size = max(self.MIN_FONT_SIZE, min(self.MAX_FONT_SIZE, self.current_font_size))
         self.current_playback_rate = max(self.MIN_PLAYBACK_RATE, min(self.MAX_PLAYBACK_RATE, self.current_playback_rate))
         
-        # Load subtitles
-        if self.video.get("subtitle_path") and os.path.exists(self.video["subtitle_path"]):
-            try:
-                with open(self.video["subtitle_path"], 'r', encoding='utf-8') as f:
-                    self.subtitles = json.load(f)
-            except Exception as e:
-                print(f"Error reading subtitle file: {str(e)}")
-                self.subtitles = []
+        # Player and subtitles shared with the player window of the same video (PlaybackManager),
+        # or owned by this overlay when no session is given
+        self.session = session or MediaSession(video)
+        self.session.attach(self)
+        self.player = self.session.player
         
         # Setup overlay window
         self.setWindowTitle("Subtitle Overlay")
@@ -121,6 +146,19 @@ class OverlaySubtitle(QWidget):
             Qt.WindowType.Tool
         )
         self.setAttribute(Qt.WidgetAttribute.WA_TranslucentBackground)
+        # The translucent background is painted in paintEvent with a cached brush; this stylesheet is
+        # set once, so moving the transparency slider does not restyle the child widgets
+        self.background_brush = QBrush()
+        self.setStyleSheet("""
+            QLabel { color: white; }
+            QPushButton, QCheckBox, QSlider { background-color: transparent; }
+        """)
+        
+        # Settings are written shortly after the last change instead of on every slider tick
+        self.settings_timer = QTimer(self)
+        self.settings_timer.setSingleShot(True)
+        self.settings_timer.setInterval(self.SETTINGS_SAVE_DELAY_MS)
+        self.settings_timer.timeout.connect(self.save_settings)
         
         # Main layout
         main_layout = QVBoxLayout(self)
@@ -148,12 +186,10 @@ class OverlaySubtitle(QWidget):
         toggle_layout.addWidget(self.toggle_controls_button)
         main_layout.insertLayout(0, toggle_layout)
         
-        # Subtitle display
-        self.subtitle_label = QLabel("...")
-        self.subtitle_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
-        self.subtitle_label.setWordWrap(True)
-        self.subtitle_label.setTextFormat(Qt.TextFormat.RichText)
-        main_layout.addWidget(self.subtitle_label)
+        # Subtitle display: painted from cached layouts, so a cue switch does not re-parse or re-layout text
+        self.subtitle_view = SubtitleView()
+        self.subtitle_view.set_cue("...")
+        main_layout.addWidget(self.subtitle_view)
         
         # Control layout
         control_layout = QHBoxLayout()
@@ -273,6 +309,9 @@ class OverlaySubtitle(QWidget):
         
         controls_widget = QWidget()
         controls_widget.setLayout(control_layout)
+        controls_font = controls_widget.font()
+        controls_font.setBold(True)
+        controls_widget.setFont(controls_font)
         controls_widget.setVisible(False)  # Initially hidden
         
         main_layout.addWidget(controls_widget)
@@ -281,44 +320,33 @@ class OverlaySubtitle(QWidget):
         # Controls state variables
         self.controls_pinned = self.settings.value("overlay/controlsPinned", False, type=bool)  # Load from settings
         
-        # Media player
-        self.player = QMediaPlayer()
-        self.audio_output = QAudioOutput()
-        self.player.setAudioOutput(self.audio_output)
-        
-        # Initial style, font, and speed update
-        self.update_font_size(self.current_font_size)
-        self.update_background_transparency(self.background_alpha)
+        # Initial background, font, and speed update
+        self.subtitle_view.set_font_sizes(self.current_font_size, self.translation_font_size())
+        self.background_brush.setColor(QColor(0, 0, 0, self.alpha_to_byte(self.background_alpha)))
+        self.background_brush.setStyle(Qt.BrushStyle.SolidPattern)
         # Update initial playback rate for player (AFTER PLAYER IS CREATED)
         self.player.setPlaybackRate(self.current_playback_rate)
 
-        # Load audio
+        # Load audio, trusting the file status cached by the library scanner instead of
+        # checking the disk here; a file removed since the scan is reported by QMediaPlayer
         audio_path = self.video.get("audio_path", "")
-        if audio_path:
-            abs_audio_path = os.path.abspath(audio_path)
-            
-            if os.path.exists(abs_audio_path):
-                self.player.setSource(QUrl.fromLocalFile(abs_audio_path))
-                print(f"Found audio file at: {abs_audio_path}")
-            else:
-                current_dir = os.getcwd()
-                alternative_path = os.path.join(current_dir, audio_path)
-                
-                if os.path.exists(alternative_path):
-                    self.player.setSource(QUrl.fromLocalFile(alternative_path))
-                    print(f"Found audio file at: {alternative_path}")
-                else:
-                    print(f"Could not find audio file: {audio_path}")
-        
-        # Connect signals
-        self.player.durationChanged.connect(self.update_duration)
-        self.player.positionChanged.connect(self.update_position)
+        if audio_path and self.video.get("audio_exists") != 0:
+            self.session.set_source(audio_path)
+        else:
+            print(f"Could not find audio file: {audio_path}")
         
         # Timer for subtitle update
         self.timer = QTimer(self)
         self.timer.setInterval(100)  # 100ms
         self.timer.timeout.connect(self.update_subtitle)
         
+        self.connect_player()
+        
+        # Subtitles (cues table, or the legacy JSON file) are read in the background, once per session;
+        # "Loading subtitles..." is shown until they arrive
+        if self.session.request_subtitles() is not None:
+            self.on_subtitles_ready()
+        
         # Calculate initial size based on screen width
         screen_width = self.screen().geometry().width()
         self.setMinimumWidth(int(screen_width * 0.6)) # Increase width a bit to fit new sliders
@@ -329,18 +357,76 @@ class OverlaySubtitle(QWidget):
         
         # Start playing
         self.player.play()
-        self.play_button.setText("⏸")
-        self.timer.start()
+        self.update_playback_state(self.player.playbackState())
         
         # Set initial controls visibility based on saved setting
         if self.controls_pinned:
             self.controls_widget.setVisible(True)
             self.toggle_controls_button.setText("❌")
         
+    def connect_player(self):
+        """Connect the player of the current session (through it, so they are disconnected when the overlay closes)"""
+        self.session.connect(self, "subtitles_ready", self.on_subtitles_ready)
+        self.session.connect(self, "durationChanged", self.update_duration)
+        self.session.connect(self, "positionChanged", self.update_position)
+        self.session.connect(self, "mediaStatusChanged", self.handle_status_changed)
+        self.session.connect(self, "errorOccurred", self.handle_player_error)
+        self.session.connect(self, "playbackStateChanged", self.update_playback_state)
+        self.update_duration(self.player.duration())
+    
+    def on_subtitles_ready(self):
+        """Show the cues of the current session once they are read"""
+        self.subtitles = self.session.subtitles
+        self.subtitles_in_db = self.session.subtitles_in_db
+        self.cue_starts = self.session.cue_starts
+        self.current_subtitle_index = -1
+        self.update_subtitle(force_update=True)
         # Automatically start translation if setting is enabled
         if self.show_vietnamese and not self.translations_attempted:
             self.start_translation()
+    
+    def has_next(self):
+        return self.queue_position + 1 < len(self.queue)
+    
+    def preload_next(self):
+        """Open the next queued video and read its cues in the background"""
+        if self.next_session is not None or not self.has_next():
+            return
+        self.next_session = self.session_factory(self.queue[self.queue_position + 1])
+        self.next_session.attach(self)
+        self.next_session.preload()
+    
+    def play_next(self):
+        """Switch to the next queued video; returns False at the end of the queue"""
+        if not self.has_next():
+            return False
+        self.preload_next()
+        previous = self.session
+        self.session = self.next_session
+        self.next_session = None
+        self.queue_position += 1
+        self.timer.stop()
+        previous.detach(self)
+        
+        self.video = self.session.video
+        self.player = self.session.player
+        self.subtitles = None
+        self.subtitles_in_db = False
+        self.cue_starts = []
+        self.current_subtitle_index = -1
+        self.translations_attempted = False
+        self.subtitle_view.clear()
         
+        self.player.setPlaybackRate(self.current_playback_rate)
+        self.connect_player()
+        self.player.play()
+        self.update_playback_state(self.player.playbackState())
+        self.video_changed.emit(self.video)
+        # Already read by the preload, unless it is still running
+        if self.session.request_subtitles() is not None:
+            self.on_subtitles_ready()
+        return True
+    
     def move_to_bottom(self):
         """Move overlay to bottom of screen"""
         screen_geometry = self.screen().geometry()
@@ -351,12 +437,26 @@ class OverlaySubtitle(QWidget):
     def toggle_play(self):
         if self.player.playbackState() == QMediaPlayer.PlaybackState.PlayingState:
             self.player.pause()
-            self.play_button.setText("⏵")
-            self.timer.stop()
         else:
             self.player.play()
+    
+    def update_playback_state(self, state):
+        """Follow the player state, which the player window of the same video can change too"""
+        if state == QMediaPlayer.PlaybackState.PlayingState:
             self.play_button.setText("⏸")
             self.timer.start()
+        else:
+            self.play_button.setText("⏵")
+            self.timer.stop()
+    
+    def handle_player_error(self, error, error_string):
+        print(f"Could not play audio file {self.video.get('audio_path')}: {error_string}")
+        # Queue mode: skip to the next video
+        self.play_next()
+    
+    def handle_status_changed(self, status):
+        if status == QMediaPlayer.MediaStatus.EndOfMedia:
+            self.play_next()
     
     def set_position(self, position):
         self.player.setPosition(position)
@@ -368,6 +468,9 @@ class OverlaySubtitle(QWidget):
     def update_position(self, position):
         self.time_slider.setValue(position)
         self.update_time_label()
+        duration = self.player.duration()
+        if self.next_session is None and duration > 0 and duration - position <= self.PRELOAD_AHEAD_MS:
+            self.preload_next()
     
     def update_time_label(self):
         position = self.player.position()
@@ -381,54 +484,61 @@ class OverlaySubtitle(QWidget):
         
         self.time_label.setText(f"{position_minutes:02d}:{position_seconds:02d} / {duration_minutes:02d}:{duration_seconds:02d}")
     
+    def find_cue_index(self, current_time):
+        """Index of the cue shown at current_time, -1 between cues (binary search on the start times).
+
+        When cues overlap, as automatic captions do, the one that started last wins.
+        """
+        i = bisect_right(self.cue_starts, current_time) - 1
+        # A short cue can start and end inside a longer one: fall back to the previous cue
+        for candidate in (i, i - 1):
+            if candidate >= 0:
+                cue = self.subtitles[candidate]
+                if current_time < cue["start"] + cue["duration"]:
+                    return candidate
+        return -1
+    
+    def cue_texts(self, subtitle):
+        """English text and, if shown and available, the Vietnamese translation of a cue"""
+        vi_text = subtitle.get("vi_text") if self.show_vietnamese else None
+        return subtitle["text"], vi_text or None
+    
+    def translation_font_size(self):
+        # Slightly smaller for Vietnamese text
+        return max(self.MIN_FONT_SIZE, self.current_font_size - 4)
+    
     def update_subtitle(self, force_update=False):
         current_time = self.player.position() / 1000  # Convert from ms to s
-        
-        found_subtitle_this_cycle = False
-        current_display_subtitle_index = self.current_subtitle_index
 
+        if self.subtitles is None:
+            self.subtitle_view.set_cue("Loading subtitles...")
+            return
         if not self.subtitles:
-            if self.subtitle_label.text() != "No subtitles":
-                 self.subtitle_label.setText("No subtitles")
+            self.subtitle_view.set_cue("No subtitles")
             return
 
-        for i, subtitle in enumerate(self.subtitles):
-            start_time = subtitle["start"]
-            end_time = start_time + subtitle["duration"]
-            
-            if start_time <= current_time < end_time:
-                found_subtitle_this_cycle = True
-                # Only update label if index changed OR forced (due to toggle vietsub)
-                if i != self.current_subtitle_index or force_update:
-                    self.current_subtitle_index = i
-                    en_text = subtitle["text"]
-                    display_text = en_text # Default to English
-
-                    if self.show_vietnamese:
-                        print(f"Attempting to get vi_text for: {subtitle}") # DEBUG PRINT
-                        vi_text = subtitle.get("vi_text", "") # Get Vietnamese text (assuming key is vi_text)
-                        print(f"Got vi_text: '{vi_text}'") # DEBUG PRINT
-                        if vi_text: # If Vietnamese text exists
-                            # Use HTML for line breaks and styling
-                            # Light gray and slightly smaller for Vietnamese text
-                            vi_font_size = max(self.MIN_FONT_SIZE, self.current_font_size - 4) 
-                            display_text = (f"{en_text}<br>"
-                                            f"<i style='color: #cccccc; font-size: {vi_font_size}pt;'>{vi_text}</i>")
-                            print("vi_text found, formatting...") # DEBUG PRINT
-                    
-                    self.subtitle_label.setText(display_text)
-                return # Exit immediately when suitable subtitle is found
-
-        # If loop ends without finding a subtitle in the current time range
-        if not found_subtitle_this_cycle:
-            # Only clear text if previously displaying a subtitle
-            if self.current_subtitle_index != -1 or force_update:
-                 self.subtitle_label.setText("")
-                 self.current_subtitle_index = -1
+        i = self.find_cue_index(current_time)
+        if i >= 0:
+            # Only update the view if index changed OR forced (due to toggle vietsub)
+            if i != self.current_subtitle_index or force_update:
+                self.current_subtitle_index = i
+                self.subtitle_view.set_cue(*self.cue_texts(self.subtitles[i]))
+                return
+        # No subtitle in the current time range: only clear text if previously displaying a subtitle
+        elif self.current_subtitle_index != -1 or force_update:
+            self.subtitle_view.clear()
+            self.current_subtitle_index = -1
+            return
+        
+        # Nothing changed this tick: lay out the upcoming cue now rather than when it starts
+        next_index = bisect_right(self.cue_starts, current_time)
+        if next_index < len(self.subtitles):
+            self.subtitle_view.prepare(*self.cue_texts(self.subtitles[next_index]))
     
     def toggle_vietnamese_display(self, checked):
         """Toggle Vietnamese subtitle display on/off"""
         self.show_vietnamese = checked
+        self.schedule_settings_save()
         
         # If turning on Vietnamese subtitles and haven't attempted translation yet
         if checked and not self.translations_attempted:
@@ -441,6 +551,8 @@ class OverlaySubtitle(QWidget):
         """Start background translation if needed"""
         if not self.subtitles or self.translations_attempted:
             return
+        if not self.session.subtitles_complete:
+            return  # Only the first cues are read: on_subtitles_ready starts it with the whole track
             
         # Check if subtitles already have translations
         need_translation = False
@@ -452,66 +564,85 @@ class OverlaySubtitle(QWidget):
         if need_translation:
             self.translations_attempted = True # Mark as attempted regardless of success
             
-            # Create and start translation thread
-            self.translation_thread = TranslationThread(self.subtitles)
-            self.translation_thread.translation_complete.connect(self.on_translation_complete)
-            self.translation_thread.translation_error.connect(self.on_translation_error)
-            self.translation_thread.start()
+            # Create and start translation thread; it remembers its video, as queue mode can move on before it ends
+            thread = TranslationThread(self.subtitles)
+            thread.video = self.video
+            thread.session = self.session
+            thread.subtitles_in_db = self.subtitles_in_db
+            thread.translation_complete.connect(lambda subtitles: self.on_translation_complete(subtitles, thread))
+            thread.translation_error.connect(self.on_translation_error)
+            self.translation_threads.append(thread)
+            thread.start()
             
             # Show "translating" message
             QMessageBox.information(self, "Translation", "Translating subtitles in the background.\nThis may take a few minutes.")
     
-    def on_translation_complete(self, translated_subtitles):
-        """Handle completed translations"""
-        # Update subtitles with translated versions
-        self.subtitles = translated_subtitles
-        
-        # Save updated subtitles to file if possible
-        if self.video.get("subtitle_path"):
-            try:
-                with open(self.video["subtitle_path"], 'w', encoding='utf-8') as f:
-                    json.dump(self.subtitles, f, ensure_ascii=False, indent=4)
-                print("Translations saved to subtitle file")
-            except Exception as e:
-                print(f"Error saving translations: {e}")
-        
-        # Update current display if needed
-        self.update_subtitle(force_update=True)
+    def on_translation_complete(self, translated_subtitles, thread):
+        """Handle completed translations of the video the thread was started for"""
+        video = thread.video
+        # Translations that did not exist before this run
+        new_translations = {
+            sub.get("idx", i): sub["vi_text"]
+            for i, (old, sub) in enumerate(zip(thread.subtitles_to_translate, translated_subtitles))
+            if sub.get("vi_text") and not old.get("vi_text")
+        }
+        
+        # Update subtitles with translated versions (the session may have been released since)
+        if thread.session.player is not None:
+            thread.session.set_subtitles(translated_subtitles)
+        showing = thread.session is self.session and self.player is not None
+        if showing:
+            self.subtitles = translated_subtitles
+            self.cue_starts = self.session.cue_starts
+        
+        # Save in the background, the way the session reads its cues
+        thread.session.run_in_background(save_translations, video, thread.subtitles_in_db,
+                                         new_translations, translated_subtitles)
+        
+        # Update current display if needed (the overlay may have been closed or moved on while translating)
+        if showing:
+            self.update_subtitle(force_update=True)
         
     def on_translation_error(self, error_message):
         """Handle translation errors"""
         QMessageBox.warning(self, "Translation Error", error_message)
     
+    @staticmethod
+    def alpha_to_byte(value):
+        """Transparency slider value (0-100) to a color alpha (0-255)"""
+        return round(value * 255 / 100)
+    
     def update_background_transparency(self, value):
-        """Update background transparency and apply style"""
+        """Update background transparency: only the cached brush changes, then the overlay is repainted"""
+        if value == self.background_alpha:
+            return
         self.background_alpha = value
-        background_color = f"rgba(0, 0, 0, {value/100})"
-        
-        # Style for main window - change QLabel background to match main background instead of transparent
-        self.setStyleSheet(f"""
-            QWidget {{ background-color: {background_color}; }}
-            QLabel {{ color: white; font-weight: bold; background-color: {background_color}; }}
-            QPushButton, QCheckBox, QSlider {{ background-color: transparent; }}
-        """)
-        
-        # Style for subtitle text
-        self.update_font_size(self.current_font_size) # This also updates the font style
+        self.background_brush.setColor(QColor(0, 0, 0, self.alpha_to_byte(value)))
+        self.update()
+        self.schedule_settings_save()
     
     def update_font_size(self, size):
         """Update font size for subtitle text"""
         self.current_font_size = size
-        
-        font = QFont()
-        font.setPointSize(size)
-        font.setBold(True)
-        self.subtitle_label.setFont(font)
-        
-        # Set drop shadow style for better readability but keep background from parent style
-        self.subtitle_label.setStyleSheet(f"""
-            color: white; 
-            font-size: {size}pt;
-            text-shadow: 1px 1px 2px black, 0 0 1em black;
-        """)
+        self.subtitle_view.set_font_sizes(size, self.translation_font_size())
+        self.schedule_settings_save()
+    
+    def paintEvent(self, event):
+        """Paint the translucent background behind the subtitles and controls"""
+        painter = QPainter(self)
+        painter.fillRect(event.rect(), self.background_brush)
+        painter.end()
+    
+    def schedule_settings_save(self):
+        self.settings_timer.start()
+    
+    def save_settings(self):
+        self.settings_timer.stop()
+        self.settings.setValue("overlay/backgroundAlpha", self.background_alpha)
+        self.settings.setValue("overlay/fontSize", self.current_font_size)
+        self.settings.setValue("overlay/playbackRate", self.current_playback_rate)
+        self.settings.setValue("overlay/showVietnamese", self.show_vietnamese)
+        self.settings.setValue("overlay/controlsPinned", self.controls_pinned)  # Save controls state
     
     def update_playback_speed(self, value):
         # Convert slider value to playback rate
@@ -524,6 +655,7 @@ class OverlaySubtitle(QWidget):
         self.player.setPlaybackRate(self.current_playback_rate)
         self.speed_label.setText(f"{self.current_playback_rate:.2f}x")
         self.speed_slider.setValue(int(self.current_playback_rate * self.SLIDER_TO_RATE_FACTOR))
+        self.schedule_settings_save()
     
     def toggle_controls_visibility(self):
         """Toggle visibility of the controls panel"""
@@ -535,6 +667,7 @@ class OverlaySubtitle(QWidget):
             self.toggle_controls_button.setText("❌")
         else:
             self.toggle_controls_button.setText("⚙️")
+        self.schedule_settings_save()
     
     def enterEvent(self, event):
         """Show controls when mouse moves into overlay only if not pinned"""
@@ -565,27 +698,30 @@ class OverlaySubtitle(QWidget):
         super().mouseMoveEvent(event)
     
     def closeEvent(self, event):
-        """Save settings, stop translation thread (if running) and stop playback when closing window"""
-        # Stop translation thread if running
-        if self.translation_thread and self.translation_thread.isRunning():
-            print("Requesting translation thread to stop...")
-            # No direct way to hard stop thread, but can request exit
-            # However, translation might be nearly complete, so let it finish or error on its own
-            # Just ensure not to use results if widget is closed
-            self.translation_thread.quit() # Request exit from event loop (if any)
-            # self.translation_thread.wait(1000) # Wait maximum 1 second
+        """Save settings, stop translation threads (if running) and stop playback when closing window"""
+        # Stop translation threads if running
+        for thread in self.translation_threads:
+            if thread.isRunning():
+                print("Requesting translation thread to stop...")
+                # No direct way to hard stop thread, but can request exit
+                # However, translation might be nearly complete, so let it finish or error on its own
+                # Just ensure not to use results if widget is closed
+                thread.quit() # Request exit from event loop (if any)
+        
+        # The preloaded next item of the queue is not needed anymore
+        if self.next_session is not None:
+            self.next_session.detach(self)
+            self.next_session = None
             
-        # Save settings
-        self.settings.setValue("overlay/backgroundAlpha", self.background_alpha)
-        self.settings.setValue("overlay/fontSize", self.current_font_size)
-        self.settings.setValue("overlay/playbackRate", self.current_playback_rate)
-        self.settings.setValue("overlay/showVietnamese", self.show_vietnamese)
-        self.settings.setValue("overlay/controlsPinned", self.controls_pinned)  # Save controls state
+        # Save settings (including a change still waiting for the debounce timer)
+        self.save_settings()
         
-        # Stop playback
-        self.player.stop()
+        # Playback stops and the player is released when the last window of the video closes
         self.timer.stop()
+        self.session.detach(self)
+        self.player = None
         super().closeEvent(event)
+        self.closed.emit()
     
     def adjust_transparency(self, delta):
         """Adjust transparency by adding delta to current value"""
@@ -0,0 +1,94 @@
+from PyQt6.QtCore import QObject
+
+from src.ui.media_session import MediaSession
+from src.ui.video_player import VideoPlayerWindow
+from src.ui.overlay_subtitle import OverlaySubtitle
+
+PLAYER = "player"
+OVERLAY = "overlay"
+QUEUE = "queue"  # Window key of the queue overlay, in place of a video id
+
+class PlaybackManager(QObject):
+    """Opens at most one player window and one overlay per video, sharing one MediaSession.
+
+    Opening a window that is already open brings it to the front instead of creating another.
+    Closed windows are deleted, and the session of a video is released with its last window, so
+    opening and closing players repeatedly does not accumulate decoders or subtitle data.
+    """
+    WINDOW_CLASSES = {PLAYER: VideoPlayerWindow, OVERLAY: OverlaySubtitle}
+
+    def __init__(self, parent=None, data_service=None):
+        super().__init__(parent)
+        self.data_service = data_service  # Reads and saves of the sessions run on its worker
+        self.sessions = {}  # video id -> MediaSession
+        self.windows = {}  # (video id, kind) -> open window
+        self._closing = set()  # Closed windows kept alive until their background work finishes
+
+    def show_player(self, video):
+        return self.show_window(video, PLAYER)
+
+    def show_overlay(self, video):
+        return self.show_window(video, OVERLAY)
+
+    def show_window(self, video, kind):
+        """Focus the open window of this kind for the video, or open one"""
+        key = (video["id"], kind)
+        window = self.windows.get(key)
+        if window is not None:
+            window.showNormal()
+            window.raise_()
+            window.activateWindow()
+            return window
+        window = self.WINDOW_CLASSES[kind](video, self._session(video))
+        self.windows[key] = window
+        window.closed.connect(lambda: self._on_window_closed(key, window))
+        window.show()
+        return window
+
+    def show_overlay_queue(self, videos):
+        """Play videos back-to-back in one overlay, replacing the queue that is playing"""
+        videos = [video for video in videos if video.get("audio_path") and video.get("audio_exists") != 0]
+        if not videos:
+            return None
+        key = (QUEUE, OVERLAY)
+        previous = self.windows.get(key)
+        if previous is not None:
+            previous.close()
+        window = OverlaySubtitle(videos[0], self._session(videos[0]), queue=videos, session_factory=self._session)
+        self.windows[key] = window
+        window.closed.connect(lambda: self._on_window_closed(key, window))
+        window.show()
+        return window
+
+    def _session(self, video):
+        session = self.sessions.get(video["id"])
+        if session is None:
+            session = MediaSession(video, self, self.data_service)
+            self.sessions[video["id"]] = session
+            session.released.connect(lambda: self.sessions.pop(video["id"], None))
+        return session
+
+    def _on_window_closed(self, key, window):
+        if self.windows.get(key) is window:
+            del self.windows[key]
+        running = [thread for thread in getattr(window, "translation_threads", ()) if thread.isRunning()]
+        if running:
+            # Let the translations finish and save their results before the window goes away
+            self._closing.add(window)
+            remaining = [len(running)]
+            def on_finished():
+                remaining[0] -= 1
+                if not remaining[0]:
+                    self._delete_window(window)
+            for thread in running:
+                thread.finished.connect(on_finished)
+            return
+        window.deleteLater()
+
+    def _delete_window(self, window):
+        self._closing.discard(window)
+        window.deleteLater()
+
+    def close_all(self):
+        for window in list(self.windows.values()):
+            window.close()
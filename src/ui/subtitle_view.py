@@ -0,0 +1,161 @@
+import time
+from collections import OrderedDict
+
+from PyQt6.QtCore import Qt, QPointF, QSize
+from PyQt6.QtGui import QColor, QFont, QFontMetricsF, QPainter, QPainterPath, QPen, QTextLayout, QTextOption
+from PyQt6.QtWidgets import QWidget, QSizePolicy
+
+from src.utils import profiling
+
+LAYOUT_CACHE_SIZE = 64  # Laid out cues kept, keyed by text, width and font size
+SWITCH_BUDGET_MS = 8.0  # Layout + paint time allowed for one cue switch (half a 60 Hz frame)
+OUTLINE_WIDTH = 3.0  # Pen width of the text outline; half of it shows outside the glyphs
+PRIMARY_COLOR = QColor("white")
+SECONDARY_COLOR = QColor("#cccccc")
+OUTLINE_COLOR = QColor(0, 0, 0, 220)
+
+class SubtitleView(QWidget):
+    """Paints the current cue (text and optional translation below it) centered, with a dark outline.
+
+    Each cue is laid out once with QTextLayout and turned into glyph outlines (QPainterPath), cached
+    per text, width and font size: showing a cached cue costs only a paint. prepare() lays out the
+    upcoming cue ahead of time. Cue switch costs are recorded by the profiler, which also reports
+    the switches that take longer than SWITCH_BUDGET_MS.
+    """
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.primary_font = QFont()
+        self.primary_font.setBold(True)
+        self.secondary_font = QFont(self.primary_font)
+        self.secondary_font.setItalic(True)
+        self.outline_pen = QPen(OUTLINE_COLOR, OUTLINE_WIDTH)
+        self.outline_pen.setJoinStyle(Qt.PenJoinStyle.RoundJoin)
+        self.text_option = QTextOption()
+        self.text_option.setWrapMode(QTextOption.WrapMode.WrapAtWordBoundaryOrAnywhere)
+        self._layouts = OrderedDict()  # (text, secondary, width, sizes) -> (blocks, height)
+        self._current = None  # (text, secondary) shown
+        self._current_layout = None
+        self._switch_cost = None  # Seconds spent in the last set_cue(), until its paint
+        self.setSizePolicy(QSizePolicy.Policy.Expanding, QSizePolicy.Policy.Preferred)
+        self.setAttribute(Qt.WidgetAttribute.WA_TransparentForMouseEvents)  # Dragging moves the overlay
+
+    def text(self):
+        return self._current[0] if self._current else ""
+
+    def set_font_sizes(self, size, secondary_size):
+        """Font sizes (points) of the cue text and of the translation"""
+        self.primary_font.setPointSize(size)
+        self.secondary_font.setPointSize(secondary_size)
+        self._layouts.clear()
+        self._update_minimum_height()
+        self._relayout()
+
+    def set_cue(self, text, secondary=None):
+        """Show text, with secondary (the translation) in a smaller font below it"""
+        if self._current == (text, secondary):
+            return
+        started = time.perf_counter()
+        self._current = (text, secondary)
+        self._current_layout = self._layout(text, secondary)
+        self._fit_height()
+        self._switch_cost = time.perf_counter() - started
+        self.update()
+
+    def clear(self):
+        if self._current is not None:
+            self._current = None
+            self._current_layout = None
+            self.update()
+
+    def prepare(self, text, secondary=None):
+        """Lay out a cue ahead of time, so switching to it later only paints"""
+        self._layout(text, secondary)
+
+    def _width(self):
+        return max(self.width() - 2 * OUTLINE_WIDTH, 1.0)
+
+    def _layout(self, text, secondary):
+        key = (text, secondary, self._width(), self.primary_font.pointSize(), self.secondary_font.pointSize())
+        layout = self._layouts.get(key)
+        if layout is not None:
+            self._layouts.move_to_end(key)
+            return layout
+        width = self._width()
+        blocks = []
+        path, height = self._layout_block(text, self.primary_font, width, 0.0)
+        blocks.append((path, PRIMARY_COLOR))
+        if secondary:
+            path, height = self._layout_block(secondary, self.secondary_font, width, height)
+            blocks.append((path, SECONDARY_COLOR))
+        layout = (blocks, height)
+        self._layouts[key] = layout
+        if len(self._layouts) > LAYOUT_CACHE_SIZE:
+            self._layouts.popitem(last=False)
+        return layout
+
+    def _fit_height(self):
+        """Grow the widget for a shown cue taller than the reserved room (not for prepared ones)"""
+        height = int(self._current_layout[1] + 2 * OUTLINE_WIDTH) + 1
+        if height > self.minimumHeight():
+            self.setMinimumHeight(height)
+
+    def _layout_block(self, text, font, width, y):
+        """Wrap text into centered lines starting at y; returns the glyph outlines and the y below them"""
+        layout = QTextLayout(text.replace("\n", " "), font)
+        layout.setTextOption(self.text_option)
+        layout.beginLayout()
+        while True:
+            line = layout.createLine()
+            if not line.isValid():
+                break
+            line.setLineWidth(width)
+            line.setPosition(QPointF((width - line.naturalTextWidth()) / 2, y))
+            y += line.height()
+        layout.endLayout()
+        path = QPainterPath()
+        for run in layout.glyphRuns():
+            raw_font = run.rawFont()
+            for glyph, position in zip(run.glyphIndexes(), run.positions()):
+                path.addPath(raw_font.pathForGlyph(glyph).translated(position))
+        return path, y
+
+    def _relayout(self):
+        if self._current is not None:
+            self._current_layout = self._layout(*self._current)
+            self._fit_height()
+        self.update()
+
+    def _update_minimum_height(self):
+        """Room for two lines of text and one of translation, so most cues do not resize the overlay"""
+        height = 2 * QFontMetricsF(self.primary_font).height() + QFontMetricsF(self.secondary_font).height()
+        self.setMinimumHeight(int(height + 2 * OUTLINE_WIDTH) + 1)
+        self.updateGeometry()
+
+    def sizeHint(self):
+        return QSize(400, self.minimumHeight())
+
+    def resizeEvent(self, event):
+        if event.oldSize().width() != event.size().width():
+            self._layouts.clear()
+            self._relayout()
+        super().resizeEvent(event)
+
+    def paintEvent(self, event):
+        started = time.perf_counter()
+        if self._current_layout is not None:
+            blocks, height = self._current_layout
+            painter = QPainter(self)
+            painter.setRenderHint(QPainter.RenderHint.Antialiasing)
+            painter.translate(OUTLINE_WIDTH, (self.height() - height) / 2)
+            for path, color in blocks:
+                # Outline first: the fill covers its inner half
+                painter.strokePath(path, self.outline_pen)
+                painter.fillPath(path, color)
+            painter.end()
+        if self._switch_cost is not None:
+            cost = self._switch_cost + time.perf_counter() - started
+            self._switch_cost = None
+            profiling.record("SubtitleView cue switch", cost)
+            if profiling.ENABLED and cost * 1000 > SWITCH_BUDGET_MS:
+                print(f"Subtitle switch took {cost * 1000:.1f} ms (budget {SWITCH_BUDGET_MS:.0f} ms)")
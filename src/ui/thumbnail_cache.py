@@ -0,0 +1,105 @@
+import os
+
+from PyQt6.QtCore import Qt, QSize
+from PyQt6.QtGui import QImageReader, QPixmap, QPixmapCache
+
+from src.utils import profiling
+from src.utils.youtube_utils import (scaled_thumbnail_path, THUMBNAIL_VARIANT_SIZES, THUMBNAIL_LIST_SIZE,
+                                     THUMBNAIL_PLAYER_SIZE)
+
+# Two tiers: pre-scaled JPEG variants on disk (decoding 160x90 is far cheaper than the 480x360 original)
+# and a byte-bounded LRU of ready pixmaps in memory, so refreshing the list decodes nothing.
+MEMORY_CACHE_KB = 32 * 1024 # ~32 MB, about 570 list thumbnails or 140 player thumbnails
+VARIANT_QUALITY = 85
+
+def configure_thumbnail_cache(limit_kb=MEMORY_CACHE_KB):
+    """Set the in-memory budget (QPixmapCache is global, call once from the GUI thread)"""
+    QPixmapCache.setCacheLimit(limit_kb)
+
+def _cache_key(thumbnail_path, size):
+    return f"thumb:{size[0]}x{size[1]}:{thumbnail_path}"
+
+def _is_fresh(variant_path, thumbnail_path):
+    """A variant is valid if it is not older than the original (thumbnails can be re-downloaded)"""
+    try:
+        return os.stat(variant_path).st_mtime >= os.stat(thumbnail_path).st_mtime
+    except OSError:
+        return False
+
+def _write_variant(image, variant_path):
+    os.makedirs(os.path.dirname(variant_path), exist_ok=True)
+    tmp_path = variant_path + ".part"
+    if image.save(tmp_path, "JPG", VARIANT_QUALITY):
+        os.replace(tmp_path, variant_path)
+    else:
+        print(f"Could not write thumbnail variant {variant_path}")
+
+def read_scaled(path, size):
+    """Decode an image straight at the size that fits size (JPEG decoders scale while decoding,
+    the full-size image is never materialized). Returns None if it cannot be read."""
+    reader = QImageReader(path)
+    original_size = reader.size()
+    if original_size.isValid():
+        reader.setScaledSize(original_size.scaled(QSize(size[0], size[1]), Qt.AspectRatioMode.KeepAspectRatio))
+    image = reader.read()
+    if image.isNull():
+        return None
+    return image
+
+@profiling.timed("load_scaled_image")
+def load_scaled_image(thumbnail_path, size):
+    """QImage of a thumbnail scaled to fit size, from its on-disk variant (created if missing or stale).
+
+    Safe outside the GUI thread. Returns None if the original cannot be read.
+    """
+    if not thumbnail_path:
+        return None
+    variant_path = scaled_thumbnail_path(thumbnail_path, size)
+    if _is_fresh(variant_path, thumbnail_path):
+        image = read_scaled(variant_path, size)
+        if image is not None:
+            return image
+    image = read_scaled(thumbnail_path, size)
+    if image is not None:
+        _write_variant(image, variant_path)
+    return image
+
+def generate_thumbnail_variants(thumbnail_path):
+    """Write every pre-scaled variant of a freshly downloaded thumbnail (ingest time, any thread)"""
+    if not thumbnail_path:
+        return
+    for size in THUMBNAIL_VARIANT_SIZES:
+        image = read_scaled(thumbnail_path, size)
+        if image is not None:
+            _write_variant(image, scaled_thumbnail_path(thumbnail_path, size))
+
+def generate_variants_batch(thumbnail_paths):
+    """generate_thumbnail_variants for several thumbnails (backfill of headless ingests). Returns how many were processed."""
+    for thumbnail_path in thumbnail_paths:
+        try:
+            generate_thumbnail_variants(thumbnail_path)
+        except Exception as e:
+            print(f"Could not create thumbnail variants for {thumbnail_path}: {e}")
+    return len(thumbnail_paths)
+
+def cached_thumbnail(thumbnail_path, size=THUMBNAIL_LIST_SIZE):
+    """Pixmap from the in-memory LRU, None on a miss (GUI thread only)"""
+    if not thumbnail_path:
+        return None
+    pixmap = QPixmapCache.find(_cache_key(thumbnail_path, size))
+    return pixmap if pixmap is not None and not pixmap.isNull() else None
+
+def cache_thumbnail(thumbnail_path, image, size=THUMBNAIL_LIST_SIZE):
+    """Convert a decoded image to a pixmap and keep it in the in-memory LRU (GUI thread only)"""
+    pixmap = QPixmap.fromImage(image)
+    QPixmapCache.insert(_cache_key(thumbnail_path, size), pixmap)
+    return pixmap
+
+def thumbnail_pixmap(thumbnail_path, size=THUMBNAIL_PLAYER_SIZE):
+    """Pixmap for a single widget: memory, then disk variant, then the original (GUI thread only)"""
+    pixmap = cached_thumbnail(thumbnail_path, size)
+    if pixmap is None:
+        image = load_scaled_image(thumbnail_path, size)
+        if image is not None:
+            pixmap = cache_thumbnail(thumbnail_path, image, size)
+    return pixmap
@@ -0,0 +1,95 @@
+import threading
+
+from PyQt6.QtCore import QObject, QRunnable, QThreadPool, pyqtSignal
+from PyQt6.QtGui import QImage
+
+from src.utils.youtube_utils import THUMBNAIL_LIST_SIZE
+from src.ui.thumbnail_cache import load_scaled_image, cached_thumbnail, cache_thumbnail
+
+THUMBNAIL_THREADS = 4
+
+class _ThumbnailJob(QRunnable):
+    """Decode one thumbnail at its target size on a pool thread"""
+
+    def __init__(self, loader, path, size):
+        super().__init__()
+        self.loader = loader
+        self.path = path
+        self.size = size
+        self.cancelled = threading.Event()
+        # The loader keeps the job alive until it finishes or is taken back from the queue
+        self.setAutoDelete(False)
+
+    def run(self):
+        image = None
+        if not self.cancelled.is_set():
+            try:
+                image = load_scaled_image(self.path, self.size)
+            except Exception as e:
+                print(f"Error decoding thumbnail {self.path}: {e}")
+        # Always reported (also when cancelled) so the loader can release the job. Emitted from
+        # the pool thread, delivered on the GUI thread (queued connection)
+        self.loader._job_finished.emit(self, image if image is not None else QImage())
+
+class ThumbnailLoader(QObject):
+    """Asynchronous thumbnail decoding with a QThreadPool.
+
+    request() returns the cached pixmap right away if there is one, otherwise it queues a decode
+    and thumbnail_ready(path, pixmap) is emitted later on the GUI thread. cancel() drops queued
+    work for thumbnails that are no longer needed (e.g. rows scrolled out of view).
+    """
+    thumbnail_ready = pyqtSignal(str, object)
+    _job_finished = pyqtSignal(object, QImage)
+
+    def __init__(self, parent=None, size=THUMBNAIL_LIST_SIZE, max_threads=THUMBNAIL_THREADS):
+        super().__init__(parent)
+        self.size = size
+        self.pool = QThreadPool(self)
+        self.pool.setMaxThreadCount(max_threads)
+        self._jobs = {} # path -> job still wanted
+        self._started = set() # Every job handed to the pool and not finished yet
+        self._job_finished.connect(self._on_job_finished)
+
+    def request(self, path):
+        """Cached pixmap for path, or None after queueing its decode (GUI thread only)"""
+        pixmap = cached_thumbnail(path, self.size)
+        if pixmap is not None or not path:
+            return pixmap
+        if path not in self._jobs:
+            job = _ThumbnailJob(self, path, self.size)
+            self._jobs[path] = job
+            self._started.add(job)
+            self.pool.start(job)
+        return None
+
+    def is_pending(self, path):
+        return path in self._jobs
+
+    def pending_paths(self):
+        return list(self._jobs)
+
+    def cancel(self, path):
+        """Stop waiting for path; a decode that already started finishes but is not delivered"""
+        job = self._jobs.pop(path, None)
+        if job is not None:
+            job.cancelled.set()
+            if self.pool.tryTake(job):
+                self._started.discard(job)  # Never ran
+
+    def cancel_all(self):
+        for path in list(self._jobs):
+            self.cancel(path)
+
+    def shutdown(self):
+        self.cancel_all()
+        self.pool.waitForDone(1000)
+
+    def _on_job_finished(self, job, image):
+        self._started.discard(job)
+        if job.cancelled.is_set() or self._jobs.get(job.path) is not job:
+            return
+        del self._jobs[job.path]
+        if image.isNull():
+            self.thumbnail_ready.emit(job.path, None)
+            return
+        self.thumbnail_ready.emit(job.path, cache_thumbnail(job.path, image, self.size))
@@ -2,9 +2,13 @@ import os
 import json
 from PyQt6.QtWidgets import (QMainWindow, QWidget, QVBoxLayout, QHBoxLayout, QLabel,
                            QPushButton, QSlider, QComboBox, QListWidget, QListWidgetItem, QMessageBox)
-from PyQt6.QtCore import Qt, QUrl, QTimer
+from PyQt6.QtCore import Qt, QTimer, pyqtSignal
 from PyQt6.QtGui import QPixmap, QIcon
-from PyQt6.QtMultimedia import QMediaPlayer, QAudioOutput
+from PyQt6.QtMultimedia import QMediaPlayer
+
+from src.utils.youtube_utils import THUMBNAIL_PLAYER_SIZE
+from src.ui.thumbnail_loader import ThumbnailLoader
+from src.ui.media_session import MediaSession
 
 class SubtitleItem(QListWidgetItem):
     def __init__(self, text, start_time, duration):
@@ -15,7 +19,9 @@ class SubtitleItem(QListWidgetItem):
         self.setTextAlignment(Qt.AlignmentFlag.AlignLeft)
 
 class VideoPlayerWindow(QMainWindow):
-    def __init__(self, video):
+    closed = pyqtSignal()
+    
+    def __init__(self, video, session=None):
         super().__init__()
         
         self.video = video
@@ -32,14 +38,11 @@ class VideoPlayerWindow(QMainWindow):
                 else:
                     video[key] = ""
         
-        # Tải phụ đề
-        if self.video.get("subtitle_path") and os.path.exists(self.video["subtitle_path"]):
-            try:
-                with open(self.video["subtitle_path"], 'r', encoding='utf-8') as f:
-                    self.subtitles = json.load(f)
-            except Exception as e:
-                print(f"Lỗi khi đọc file phụ đề: {str(e)}")
-                self.subtitles = []
+        # Bộ phát và phụ đề dùng chung với overlay của cùng video (PlaybackManager),
+        # hoặc của riêng cửa sổ này nếu không có session
+        self.session = session or MediaSession(video)
+        self.session.attach(self)
+        self.player = self.session.player
         
         self.setWindowTitle(f"Phát - {self.video.get('title', 'Video không tiêu đề')}")
         self.setGeometry(100, 100, 900, 600)
@@ -53,19 +56,25 @@ class VideoPlayerWindow(QMainWindow):
         
         # Hiển thị thumbnail
         thumbnail_layout = QHBoxLayout()
-        thumbnail_label = QLabel()
+        self.thumbnail_label = QLabel()
+        thumbnail_label = self.thumbnail_label
+        thumbnail_label.setStyleSheet("background-color: #eee; color: #666; font-size: 14px;")
+        thumbnail_label.setFixedSize(320, 180)
+        thumbnail_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
         
-        # Kiểm tra thumbnail_path có tồn tại và không phải None
-        if self.video.get("thumbnail_path") and os.path.exists(self.video["thumbnail_path"]):
-            pixmap = QPixmap(self.video["thumbnail_path"])
-            thumbnail_label.setPixmap(pixmap.scaled(320, 180, Qt.AspectRatioMode.KeepAspectRatio))
+        # Bản thu nhỏ 320x180: lấy ngay từ bộ nhớ đệm RAM, nếu không thì giải mã trên luồng nền
+        # (file đã thu nhỏ sẵn, rồi file gốc) và hiện chữ thay thế cho tới khi xong; bỏ qua file mà lần quét báo thiếu
+        self.thumbnail_loader = ThumbnailLoader(self, THUMBNAIL_PLAYER_SIZE, max_threads=1)
+        self.thumbnail_loader.thumbnail_ready.connect(self.on_thumbnail_ready)
+        self.thumbnail_path = self.video.get("thumbnail_path")
+        pixmap = None
+        if self.thumbnail_path and self.video.get("thumbnail_exists") != 0:
+            pixmap = self.thumbnail_loader.request(self.thumbnail_path)
+            thumbnail_label.setText("Đang tải thumbnail...")
         else:
-            # Tạo hình ảnh mặc định nếu không có thumbnail
             thumbnail_label.setText("Không có thumbnail")
-            thumbnail_label.setStyleSheet("background-color: #eee; color: #666; font-size: 14px;")
-            
-        thumbnail_label.setFixedSize(320, 180)
-        thumbnail_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
+        if pixmap is not None:
+            self.set_thumbnail(pixmap)
         
         # Thông tin video
         info_layout = QVBoxLayout()
@@ -138,77 +147,90 @@ class VideoPlayerWindow(QMainWindow):
         """)
         self.subtitle_list.itemClicked.connect(self.on_subtitle_clicked)
         
-        # Thêm phụ đề vào danh sách
-        if self.subtitles:
-            for subtitle in self.subtitles:
-                time_text = f"{int(subtitle['start'] // 60):02d}:{int(subtitle['start'] % 60):02d}"
-                item = SubtitleItem(f"{time_text} - {subtitle['text']}", subtitle['start'], subtitle['duration'])
-                self.subtitle_list.addItem(item)
+        # Phụ đề (từ bảng cues, hoặc file JSON cũ) được đọc trên luồng nền, một lần cho mỗi session
+        self.session.connect(self, "subtitles_ready", self.on_subtitles_ready)
+        subtitles = self.session.request_subtitles()
+        if subtitles is not None:
+            self.show_subtitles(subtitles)
         else:
-            self.subtitle_list.addItem("Không có phụ đề")
+            self.subtitle_list.addItem("Đang tải phụ đề...")
         
         subtitle_layout.addWidget(self.subtitle_list)
         main_layout.addLayout(subtitle_layout)
         
-        # Thiết lập trình phát media
-        self.player = QMediaPlayer()
-        self.audio_output = QAudioOutput()
-        self.player.setAudioOutput(self.audio_output)
-        
-        # Kiểm tra đường dẫn audio_path tồn tại trước khi sử dụng
+        # Trạng thái file lấy từ lần quét thư viện gần nhất, không kiểm tra file trên luồng giao diện.
+        # Nếu file mất sau lần quét, QMediaPlayer báo lỗi qua handle_player_error.
         audio_path = self.video.get("audio_path", "")
-        if audio_path:
-            # Chuyển đổi đường dẫn tương đối thành đường dẫn tuyệt đối
-            # Tìm đường dẫn file âm thanh theo cả đường dẫn tương đối và tuyệt đối
-            abs_audio_path = os.path.abspath(audio_path)
-            
-            # Kiểm tra xem file có tồn tại không
-            if os.path.exists(abs_audio_path):
-                self.player.setSource(QUrl.fromLocalFile(abs_audio_path))
-                print(f"Đã tìm thấy file âm thanh tại: {abs_audio_path}")
-            else:
-                # Thử với đường dẫn tương đối từ thư mục hiện tại
-                current_dir = os.getcwd()
-                alternative_path = os.path.join(current_dir, audio_path)
-                
-                if os.path.exists(alternative_path):
-                    self.player.setSource(QUrl.fromLocalFile(alternative_path))
-                    print(f"Đã tìm thấy file âm thanh tại: {alternative_path}")
-                else:
-                    print(f"Không tìm thấy file âm thanh: {audio_path}")
-                    print(f"Đã thử tìm tại: {abs_audio_path}")
-                    print(f"Đã thử tìm tại: {alternative_path}")
-                    
-                    # Hiển thị thông báo lỗi
-                    QMessageBox.warning(self, "Lỗi", "Không tìm thấy file âm thanh!")
-        else:
+        if not audio_path:
             print("Không có đường dẫn đến file âm thanh")
             QMessageBox.warning(self, "Lỗi", "Không có đường dẫn đến file âm thanh!")
-        
-        # Kết nối các signal
-        self.player.durationChanged.connect(self.update_duration)
-        self.player.positionChanged.connect(self.update_position)
-        self.player.mediaStatusChanged.connect(self.handle_status_changed)
+        elif self.video.get("audio_exists") == 0:
+            print(f"Không tìm thấy file âm thanh: {audio_path}")
+            QMessageBox.warning(self, "Lỗi", "Không tìm thấy file âm thanh!")
+        else:
+            self.session.set_source(audio_path)
         
         # Timer để cập nhật phụ đề
         self.timer = QTimer(self)
         self.timer.setInterval(100)  # 100ms
         self.timer.timeout.connect(self.update_subtitle)
         
+        # Kết nối các signal (qua session để được gỡ khi cửa sổ đóng)
+        self.session.connect(self, "durationChanged", self.update_duration)
+        self.session.connect(self, "positionChanged", self.update_position)
+        self.session.connect(self, "mediaStatusChanged", self.handle_status_changed)
+        self.session.connect(self, "errorOccurred", self.handle_player_error)
+        self.session.connect(self, "playbackStateChanged", self.update_playback_state)
+        
+        # Session đã được overlay mở trước đó: hiển thị trạng thái hiện tại
+        self.update_duration(self.player.duration())
+        self.update_playback_state(self.player.playbackState())
+        
+    def set_thumbnail(self, pixmap):
+        self.thumbnail_label.setStyleSheet("")
+        self.thumbnail_label.setPixmap(pixmap)
+    
+    def on_thumbnail_ready(self, path, pixmap):
+        if path != self.thumbnail_path:
+            return
+        if pixmap is not None:
+            self.set_thumbnail(pixmap)
+        else:
+            self.thumbnail_label.setText("Không có thumbnail")
+    
+    def on_subtitles_ready(self):
+        self.show_subtitles(self.session.subtitles)
+    
+    def show_subtitles(self, subtitles):
+        """Điền danh sách phụ đề"""
+        self.subtitles = subtitles
+        self.current_subtitle_index = -1
+        self.subtitle_list.clear()
+        if self.subtitles:
+            for subtitle in self.subtitles:
+                time_text = f"{int(subtitle['start'] // 60):02d}:{int(subtitle['start'] % 60):02d}"
+                item = SubtitleItem(f"{time_text} - {subtitle['text']}", subtitle['start'], subtitle['duration'])
+                self.subtitle_list.addItem(item)
+        else:
+            self.subtitle_list.addItem("Không có phụ đề")
+    
     def toggle_play(self):
         if self.player.playbackState() == QMediaPlayer.PlaybackState.PlayingState:
             self.player.pause()
-            self.play_button.setText("Phát")
-            self.timer.stop()
         else:
             self.player.play()
+    
+    def update_playback_state(self, state):
+        """Nút phát và timer theo trạng thái bộ phát (có thể do overlay thay đổi)"""
+        if state == QMediaPlayer.PlaybackState.PlayingState:
             self.play_button.setText("Tạm dừng")
             self.timer.start()
+        else:
+            self.play_button.setText("Phát")
+            self.timer.stop()
     
     def stop_playback(self):
         self.player.stop()
-        self.play_button.setText("Phát")
-        self.timer.stop()
     
     def set_position(self, position):
         self.player.setPosition(position)
@@ -229,8 +251,10 @@ class VideoPlayerWindow(QMainWindow):
         if status == QMediaPlayer.MediaStatus.EndOfMedia:
             self.player.setPosition(0)
             self.player.stop()
-            self.play_button.setText("Phát")
-            self.timer.stop()
+    
+    def handle_player_error(self, error, error_string):
+        print(f"Lỗi phát âm thanh ({self.video.get('audio_path')}): {error_string}")
+        QMessageBox.warning(self, "Lỗi", f"Không phát được file âm thanh!\n{error_string}")
     
     def change_playback_speed(self, index):
         speeds = [0.25, 0.5, 0.75, 1.0, 1.25, 1.5, 1.75, 2.0]
@@ -265,6 +289,10 @@ class VideoPlayerWindow(QMainWindow):
                 self.toggle_play()
     
     def closeEvent(self, event):
-        self.player.stop()
+        # Bộ phát chỉ dừng và được giải phóng khi cửa sổ cuối cùng của video đóng
         self.timer.stop()
-        super().closeEvent(event) 
\ No newline at end of file
+        self.thumbnail_loader.cancel_all()
+        self.session.detach(self)
+        self.player = None
+        super().closeEvent(event)
+        self.closed.emit() 
\ No newline at end of file
@@ -0,0 +1,208 @@
+"""Headless batch ingestion: download many videos with a worker pool, without Qt.
+
+Scaled thumbnail variants are decoded with Qt, so they are not written here: the app's library scan
+finds the thumbnails without variants and creates them in the background (see library_scanner).
+"""
+import os
+import sys
+import time
+import threading
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from src.utils.youtube_utils import (download_youtube_video, extract_video_id, is_collection_url,
+                                     flush_thumbnail_cache, children_cpu_seconds, NoEnglishTranscriptError,
+                                     AUDIO_MODE_MP3, MP3_BITRATE_KBPS)
+from src.utils.source_sync import list_new_videos
+from src.models.database import save_videos, get_existing_video_ids
+
+DEFAULT_WORKERS = 4
+SAVE_BATCH_SIZE = 50 # Finished videos are written to the database in one transaction per batch
+
+def read_urls(lines):
+    """Read URLs one per line, skipping blank lines and '#' comments (same cleanup as the GUI)"""
+    urls = []
+    for line in lines:
+        url = line.strip().lstrip('@')
+        if url and not url.startswith('#'):
+            urls.append(url)
+    return urls
+
+def expand_sources(urls, full_resync=False):
+    """Replace playlist/channel URLs with the URLs of their videos that are not in the library.
+
+    Returns (video_urls, listings); pass the listings to mark_source_synced once ingest is done.
+    """
+    video_urls = []
+    listings = []
+    for url in urls:
+        if not is_collection_url(url):
+            video_urls.append(url)
+            continue
+        try:
+            listing = list_new_videos(url, full=full_resync)
+        except Exception as e:
+            print(f"Could not list source {url}: {e}", file=sys.stderr)
+            continue
+        listings.append(listing)
+        video_urls.extend(listing.video_urls)
+    return video_urls, listings
+
+def classify_failure(error):
+    """Return a short cause label for an ingest failure"""
+    # download_youtube_video wraps the original error, so look at the whole chain
+    current = error
+    while current is not None:
+        if isinstance(current, NoEnglishTranscriptError):
+            return "no_english_subtitles"
+        message = str(current)
+        if "HTTP Error" in message:
+            # e.g. "HTTP Error 403: Forbidden" -> "http_403"
+            code = message.split("HTTP Error", 1)[1].strip().split(':')[0].strip()
+            return f"http_{code}"
+        if "Video unavailable" in message or "Private video" in message:
+            return "unavailable"
+        current = current.__cause__
+    return type(error).__name__
+
+def _files_size(video_info):
+    total = 0
+    for key in ("audio_path", "subtitle_path", "thumbnail_path"):
+        path = video_info.get(key)
+        if path and os.path.exists(path):
+            total += os.path.getsize(path)
+    return total
+
+class IngestStats:
+    """Throughput, CPU and failure counters for one batch run.
+
+    CPU time is measured for the whole run (ffmpeg child processes and this process), which stays
+    exact with concurrent workers; bytes_saved adds up the audio_stats of the saved videos.
+    """
+
+    def __init__(self, total):
+        self.total = total
+        self.succeeded = 0
+        self.skipped = 0
+        self.bytes_downloaded = 0
+        self.bytes_saved = 0  # Audio size saved compared with the MP3 encode
+        self.failures = Counter()
+        self.started_at = time.monotonic()
+        self.process_cpu_started = time.process_time()
+        self.children_cpu_started = children_cpu_seconds()
+        self._lock = threading.Lock()
+
+    def record_success(self, video_info):
+        with self._lock:
+            self.succeeded += 1
+            self.bytes_downloaded += _files_size(video_info)
+            self.bytes_saved += (video_info.get("audio_stats") or {}).get("bytes_saved") or 0
+
+    def record_failure(self, cause):
+        with self._lock:
+            self.failures[cause] += 1
+
+    @property
+    def failed(self):
+        return sum(self.failures.values())
+
+    def summary(self):
+        elapsed = max(time.monotonic() - self.started_at, 1e-6)
+        lines = [
+            f"Processed {self.succeeded + self.failed}/{self.total} videos in {elapsed:.1f}s "
+            f"({self.skipped} already in library)",
+            f"  Succeeded: {self.succeeded}, failed: {self.failed}",
+            f"  Throughput: {self.succeeded / (elapsed / 60):.2f} videos/min, "
+            f"{self.bytes_downloaded / 1048576 / elapsed:.2f} MB/s ({self.bytes_downloaded / 1048576:.1f} MB total)",
+        ]
+        process_cpu = time.process_time() - self.process_cpu_started
+        children_cpu = children_cpu_seconds()
+        cpu_line = f"  CPU: {process_cpu:.1f}s in this process"
+        if children_cpu is not None:
+            children_cpu -= self.children_cpu_started
+            cpu_line += f", {children_cpu:.1f}s in ffmpeg"
+            if self.succeeded:
+                cpu_line += f" ({(process_cpu + children_cpu) / self.succeeded:.2f}s per video)"
+        lines.append(cpu_line)
+        lines.append(f"  Audio saved compared with MP3 {MP3_BITRATE_KBPS}k: {self.bytes_saved / 1048576:.1f} MB")
+        if self.failures:
+            lines.append("  Failures by cause:")
+            for cause, count in self.failures.most_common():
+                lines.append(f"    {cause}: {count}")
+        return "\n".join(lines)
+
+def ingest_urls(urls, download_folder, workers=DEFAULT_WORKERS, audio_mode=AUDIO_MODE_MP3, skip_existing=True):
+    """Download every URL with a pool of workers and save results into the database.
+
+    Results are saved from the calling thread in batches of SAVE_BATCH_SIZE. Returns an IngestStats.
+    """
+    os.makedirs(download_folder, exist_ok=True)
+
+    # Drop invalid URLs, duplicates and videos already in the library before starting any work
+    existing_ids = get_existing_video_ids() if skip_existing else set()
+    jobs = {}
+    invalid = 0
+    skipped = 0
+    for url in urls:
+        video_id = extract_video_id(url)
+        if not video_id:
+            invalid += 1
+            continue
+        if video_id in existing_ids or video_id in jobs:
+            skipped += 1
+            continue
+        jobs[video_id] = url
+
+    stats = IngestStats(len(jobs) + invalid)
+    stats.skipped = skipped
+    for _ in range(invalid):
+        stats.record_failure("invalid_url")
+
+    pending = []
+    def flush():
+        """Save the pending results; a database error fails this batch only, the run goes on"""
+        if not pending:
+            return
+        try:
+            save_videos(pending)
+        except Exception as e:
+            cause = classify_failure(e)
+            print(f"Could not save {len(pending)} videos ({cause}): {e}", file=sys.stderr)
+            for video_info in pending:
+                stats.record_failure(cause)
+                print(f"  FAILED ({cause}) {video_info['video_id']}", file=sys.stderr)
+        else:
+            for video_info in pending:
+                stats.record_success(video_info)
+        pending.clear()
+
+    try:
+        with ThreadPoolExecutor(max_workers=max(1, workers)) as executor:
+            futures = {
+                executor.submit(download_youtube_video, url, download_folder, None, audio_mode, flush_cache=False): url
+                for url in jobs.values()
+            }
+            done = invalid  # Invalid URLs are already counted as failed
+            for future in as_completed(futures):
+                url = futures[future]
+                done += 1
+                try:
+                    video_info = future.result()
+                except Exception as e:
+                    cause = classify_failure(e)
+                    stats.record_failure(cause)
+                    print(f"[{done}/{stats.total}] FAILED ({cause}) {url}: {e}", file=sys.stderr)
+                    continue
+
+                # Counted as succeeded once saved
+                pending.append(video_info)
+                print(f"[{done}/{stats.total}] OK {video_info['video_id']} - {video_info['title']}")
+                if len(pending) >= SAVE_BATCH_SIZE:
+                    flush()
+    finally:
+        # Also save what finished before an interruption (Ctrl+C) or error
+        flush()
+        # Thumbnail ETag/Last-Modified index, written once for the whole run
+        flush_thumbnail_cache(download_folder)
+
+    return stats
@@ -0,0 +1,81 @@
+"""Delete videos from the library together with their audio, subtitle and thumbnail files."""
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from src.utils.youtube_utils import thumbnail_variant_paths
+from src.models.database import write_transaction, get_video_files, delete_videos, delete_all_videos
+
+DELETE_WORKERS = 8 # Files removed in parallel
+
+class DeleteProgress:
+    """Thread-safe progress of a delete_library_videos call, polled by the GUI"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.files_total = 0
+        self.files_done = 0
+
+    def start(self, files_total):
+        with self._lock:
+            self.files_total = files_total
+            self.files_done = 0
+
+    def advance(self):
+        with self._lock:
+            self.files_done += 1
+
+    def fraction(self):
+        with self._lock:
+            return self.files_done / self.files_total if self.files_total else 0.0
+
+class DeleteResult:
+    def __init__(self, videos_deleted, files_deleted, failures):
+        self.videos_deleted = videos_deleted
+        self.files_deleted = files_deleted
+        self.failures = failures # (path, error message)
+
+def _remove_file(path, progress):
+    """Remove one file; returns (removed, error message or None). A file that is already gone is not an error."""
+    try:
+        os.remove(path)
+        return True, None
+    except FileNotFoundError:
+        return False, None
+    except OSError as e:
+        print(f"Error deleting file {path}: {e}")
+        return False, str(e)
+    finally:
+        if progress is not None:
+            progress.advance()
+
+def delete_library_videos(video_ids=None, progress=None, workers=DELETE_WORKERS):
+    """Delete the given videos (None for the whole library) and their files.
+
+    Rows are removed first, in one transaction, so the library never lists a video whose files are
+    half deleted. Files that cannot be removed are left as orphans for the library scanner to report.
+    """
+    with write_transaction():
+        if video_ids is None:
+            rows = delete_all_videos()
+            videos_deleted = len(rows)
+        else:
+            rows = get_video_files(video_ids)
+            videos_deleted = delete_videos(video_ids)
+
+    paths = set()
+    for row in rows:
+        paths.update(path for path in (row["audio_path"], row["subtitle_path"], row["thumbnail_path"]) if path)
+        if row["thumbnail_path"]:
+            # Pre-scaled copies made by the thumbnail cache
+            paths.update(thumbnail_variant_paths(row["thumbnail_path"]))
+    paths = sorted(paths)
+    if progress is not None:
+        progress.start(len(paths))
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        results = list(executor.map(lambda path: _remove_file(path, progress), paths))
+
+    files_deleted = sum(1 for removed, _ in results if removed)
+    failures = [(path, error) for path, (_, error) in zip(paths, results) if error]
+    print(f"Deleted {videos_deleted} videos and {files_deleted} files ({len(failures)} failed)")
+    return DeleteResult(videos_deleted, files_deleted, failures)
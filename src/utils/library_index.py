@@ -0,0 +1,146 @@
+"""In-memory filter index over the titles and video ids of the library (no Qt)."""
+import re
+import unicodedata
+from bisect import bisect_left, insort
+
+from src.models.database import get_video_titles
+
+_WORD = re.compile(r"\w+")
+
+def normalize(text):
+    """Lowercase text without accents, so "Tiếng Việt" matches "tieng viet" """
+    text = text or ""
+    if text.isascii():
+        return text.lower()
+    text = unicodedata.normalize("NFKD", text.casefold().replace("đ", "d"))
+    return "".join(char for char in text if not unicodedata.combining(char))
+
+def tokenize(text):
+    return _WORD.findall(normalize(text))
+
+def _trigrams(token):
+    return {token[i:i + 3] for i in range(len(token) - 2)}
+
+class LibraryIndex:
+    """Token index of the library with a trigram index over its vocabulary.
+
+    Each query word matches the videos having a token that contains it: words of three or more
+    characters go through the trigrams of the (much smaller) vocabulary, shorter ones through a
+    prefix range of the sorted vocabulary. A video matches when every query word does.
+    add() and remove() update the index in place, only build_library_index() reads the whole library.
+    """
+
+    def __init__(self, rows=()):
+        self._tokens = {}  # id -> tokens of the video
+        self._keys = {}  # id -> library sort key (download_date, id)
+        self._postings = {}  # token -> ids
+        self._trigram_tokens = {}  # trigram -> tokens
+        self._vocabulary = []  # sorted tokens, None until the next short query needs it again
+        if rows:
+            # Sorted once afterwards instead of one insort per new token
+            self._vocabulary = None
+            self.add_rows(rows)
+
+    def __len__(self):
+        return len(self._tokens)
+
+    def __contains__(self, video_id):
+        return video_id in self._tokens
+
+    def add(self, video_id, youtube_id, title, download_date):
+        """Index a video, replacing what was indexed for it before"""
+        tokens = frozenset(tokenize(title))
+        if youtube_id:
+            tokens |= {normalize(youtube_id)}
+        self._keys[video_id] = (str(download_date or ""), video_id)
+        old_tokens = self._tokens.get(video_id)
+        if old_tokens == tokens:
+            return
+        if old_tokens is not None:
+            for token in old_tokens - tokens:
+                self._remove_posting(token, video_id)
+        for token in tokens - (old_tokens or frozenset()):
+            ids = self._postings.get(token)
+            if ids is None:
+                ids = self._postings[token] = set()
+                if self._vocabulary is not None:
+                    insort(self._vocabulary, token)
+                for trigram in _trigrams(token):
+                    self._trigram_tokens.setdefault(trigram, set()).add(token)
+            ids.add(video_id)
+        self._tokens[video_id] = tokens
+
+    def add_rows(self, rows):
+        """Index rows with id, video_id, title and download_date (database rows or video dictionaries)"""
+        for row in rows:
+            self.add(row["id"], row["video_id"], row["title"], row["download_date"])
+
+    def remove(self, video_ids):
+        for video_id in video_ids:
+            self._keys.pop(video_id, None)
+            for token in self._tokens.pop(video_id, ()):
+                self._remove_posting(token, video_id)
+
+    def _remove_posting(self, token, video_id):
+        ids = self._postings[token]
+        ids.discard(video_id)
+        if ids:
+            return
+        del self._postings[token]
+        if self._vocabulary is not None:
+            del self._vocabulary[bisect_left(self._vocabulary, token)]
+        for trigram in _trigrams(token):
+            tokens = self._trigram_tokens[trigram]
+            tokens.discard(token)
+            if not tokens:
+                del self._trigram_tokens[trigram]
+
+    def _tokens_containing(self, word):
+        if len(word) < 3:
+            # Too short for trigrams: tokens starting with word
+            if self._vocabulary is None:
+                self._vocabulary = sorted(self._postings)
+            start = bisect_left(self._vocabulary, word)
+            end = bisect_left(self._vocabulary, word + "\U0010ffff")
+            return self._vocabulary[start:end]
+        candidates = None
+        for trigram in sorted(_trigrams(word), key=lambda t: len(self._trigram_tokens.get(t, ()))):
+            tokens = self._trigram_tokens.get(trigram)
+            if not tokens:
+                return []
+            candidates = set(tokens) if candidates is None else candidates & tokens
+            if not candidates:
+                return []
+        # Shared trigrams do not guarantee the word is contained in that order
+        return [token for token in candidates if word in token]
+
+    def search(self, text):
+        """Set of ids matching every word of text, None if text has no words (no filter)"""
+        words = tokenize(text)
+        if not words:
+            return None
+        result = None
+        # Longest words first, they are usually the most selective
+        for word in sorted(set(words), key=len, reverse=True):
+            ids = set()
+            for token in self._tokens_containing(word):
+                ids |= self._postings[token]
+            result = ids if result is None else result & ids
+            if not result:
+                return set()
+        return result
+
+    def sort_key(self, video_id):
+        return self._keys.get(video_id)
+
+    def sorted_ids(self, video_ids, before=None):
+        """video_ids in library order (newest first), only those sorting after the key before if given"""
+        keys = self._keys
+        if before is not None:
+            before = (str(before[0] or ""), before[1])
+            video_ids = [video_id for video_id in video_ids if video_id in keys and keys[video_id] < before]
+        return sorted((video_id for video_id in video_ids if video_id in keys), key=keys.__getitem__, reverse=True)
+
+def build_library_index():
+    """Index the whole library (runs on a worker thread)"""
+    return LibraryIndex(get_video_titles())
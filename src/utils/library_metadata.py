@@ -0,0 +1,79 @@
+"""Backfill of the precomputed library metadata columns for videos saved before they existed."""
+import os
+import json
+import shutil
+import subprocess
+
+from src.utils.youtube_utils import MP3_BITRATE_KBPS
+from src.models.database import get_videos_pending_metadata, save_video_metadata, DEFAULT_TRANSLATION_LANG
+
+BACKFILL_BATCH_SIZE = 50
+PROBE_TIMEOUT = 10
+
+def probe_audio(path):
+    """Return (duration_seconds, codec) of an audio file using ffprobe, (None, None) if unavailable"""
+    ffprobe = shutil.which("ffprobe")
+    if not ffprobe:
+        return None, None
+    try:
+        result = subprocess.run(
+            [ffprobe, "-v", "error", "-select_streams", "a:0",
+             "-show_entries", "format=duration:stream=codec_name", "-of", "json", path],
+            capture_output=True, text=True, timeout=PROBE_TIMEOUT, check=True
+        )
+        info = json.loads(result.stdout)
+    except (OSError, subprocess.SubprocessError, ValueError) as e:
+        print(f"Could not probe {path}: {e}")
+        return None, None
+    duration = info.get("format", {}).get("duration")
+    streams = info.get("streams") or [{}]
+    return (float(duration) if duration else None), streams[0].get("codec_name")
+
+def collect_file_metadata(row):
+    """Compute the metadata of one videos row from its files (the only place that reads them)"""
+    metadata = {"id": row["id"]}
+    audio_path = row["audio_path"]
+    if audio_path and os.path.exists(audio_path):
+        audio_bytes = os.path.getsize(audio_path)
+        duration, codec = probe_audio(audio_path)
+        extension = os.path.splitext(audio_path)[1].lstrip('.').lower()
+        if duration is None and extension == "mp3":
+            # No ffprobe: download_audio encodes MP3s at a constant bitrate, so the size gives the duration
+            duration = round(audio_bytes * 8 / (MP3_BITRATE_KBPS * 1000), 1)
+        metadata["audio_bytes"] = audio_bytes
+        metadata["duration"] = duration
+        metadata["codec"] = codec or extension or None
+
+    # Subtitles stored in the database were counted by the migration, only legacy JSON files are read
+    if row["cue_count"] is None and row["subtitle_path"] and os.path.exists(row["subtitle_path"]):
+        try:
+            with open(row["subtitle_path"], 'r', encoding='utf-8') as f:
+                cues = json.load(f)
+            translation_key = f"{DEFAULT_TRANSLATION_LANG}_text"
+            metadata["cue_count"] = len(cues)
+            metadata["translated_cue_count"] = sum(1 for cue in cues if cue.get(translation_key))
+        except (OSError, ValueError) as e:
+            print(f"Could not read subtitles {row['subtitle_path']}: {e}")
+    return metadata
+
+def backfill_metadata_batch(batch_size=BACKFILL_BATCH_SIZE):
+    """Fill the metadata of the next batch of pending videos.
+
+    Returns the number of videos processed; 0 means the backfill is complete. Rows whose files
+    are missing are still marked as done, so they are not probed again on every start.
+    """
+    rows = get_videos_pending_metadata(batch_size)
+    if not rows:
+        return 0
+    save_video_metadata([collect_file_metadata(row) for row in rows])
+    print(f"Backfilled metadata of {len(rows)} videos")
+    return len(rows)
+
+def backfill_metadata(batch_size=BACKFILL_BATCH_SIZE):
+    """Run the backfill to completion, returns the total number of videos processed"""
+    total = 0
+    while True:
+        processed = backfill_metadata_batch(batch_size)
+        if not processed:
+            return total
+        total += processed
@@ -0,0 +1,123 @@
+"""Background integrity check of the files referenced by the library."""
+import os
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+
+from src.utils.youtube_utils import THUMBNAIL_CACHE_FILE, thumbnail_variant_paths
+from src.models.database import get_file_references, save_file_status
+
+SCAN_WORKERS = 8 # stat() calls in flight, mostly useful on network drives and cold disks
+FILE_KINDS = ("audio", "subtitle", "thumbnail")
+# Files in the download folder that belong to the app, not to a video
+IGNORED_FILES = {THUMBNAIL_CACHE_FILE}
+IGNORED_SUFFIXES = (".part", ".ytdl", ".tmp") # Downloads still in progress
+
+def _normalize(path):
+    return os.path.normcase(os.path.abspath(path))
+
+def _file_size(path):
+    """Size of path in bytes, None if it does not exist"""
+    try:
+        return os.stat(path).st_size
+    except OSError:
+        return None
+
+def _needs_variants(thumbnail_path):
+    """True if a pre-scaled variant of the thumbnail is missing or older than the original"""
+    try:
+        original_mtime = os.stat(thumbnail_path).st_mtime
+        return any(os.stat(path).st_mtime < original_mtime for path in thumbnail_variant_paths(thumbnail_path))
+    except OSError:
+        return True
+
+class ScanReport:
+    """Result of scan_library"""
+
+    def __init__(self):
+        self.checked = 0
+        self.changed = 0
+        self.missing = Counter() # kind -> number of rows whose file is missing
+        self.dangling = [] # (id, title, audio_path) of rows whose audio file is missing
+        self.orphans = [] # Files in the download folder that no row references
+        self.missing_variants = [] # Thumbnails without up-to-date pre-scaled variants (e.g. from a headless ingest)
+        self.orphan_bytes = 0
+        self.total_bytes = 0
+        self.elapsed = 0.0
+
+    def summary(self):
+        lines = [
+            f"Checked {self.checked} videos in {self.elapsed:.2f}s, {self.total_bytes / 1048576:.1f} MB on disk",
+            f"Missing files: " + (", ".join(f"{kind} {count}" for kind, count in sorted(self.missing.items())) or "none"),
+            f"Dangling videos (audio missing): {len(self.dangling)}",
+            f"Orphaned files: {len(self.orphans)} ({self.orphan_bytes / 1048576:.1f} MB)",
+            f"Thumbnails without scaled variants: {len(self.missing_variants)}",
+        ]
+        return "\n".join(lines)
+
+def find_orphans(download_folder, referenced):
+    """Files directly in download_folder that are not in the referenced set of normalized paths"""
+    orphans = []
+    try:
+        entries = list(os.scandir(download_folder))
+    except OSError:
+        return orphans
+    for entry in entries:
+        if not entry.is_file() or entry.name in IGNORED_FILES or entry.name.endswith(IGNORED_SUFFIXES):
+            continue
+        if _normalize(entry.path) not in referenced:
+            orphans.append(entry.path)
+    return orphans
+
+def scan_library(download_folder, workers=SCAN_WORKERS):
+    """Stat every file referenced by the library in parallel and cache existence and size in the database.
+
+    Also reports dangling rows (audio missing), orphaned files in download_folder and thumbnails
+    whose pre-scaled variants still have to be generated.
+    Only reads the file system, nothing is deleted.
+    """
+    started_at = time.monotonic()
+    report = ScanReport()
+    rows = get_file_references()
+
+    paths = {row[f"{kind}_path"] for row in rows for kind in FILE_KINDS if row[f"{kind}_path"]}
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        sizes = dict(zip(paths, executor.map(_file_size, paths)))
+
+    statuses = []
+    for row in rows:
+        status = {"id": row["id"], "files_bytes": 0}
+        for kind in FILE_KINDS:
+            path = row[f"{kind}_path"]
+            if not path:
+                # Subtitle/thumbnail may legitimately be absent, only a missing audio path is an error
+                status[f"{kind}_exists"] = 0 if kind == "audio" else None
+                if kind == "audio":
+                    report.missing[kind] += 1
+                continue
+            size = sizes.get(path)
+            status[f"{kind}_exists"] = int(size is not None)
+            if size is None:
+                report.missing[kind] += 1
+            else:
+                status["files_bytes"] += size
+        if not status["audio_exists"]:
+            report.dangling.append((row["id"], row["title"], row["audio_path"]))
+        report.total_bytes += status["files_bytes"]
+        statuses.append(status)
+
+    thumbnails = sorted({row["thumbnail_path"] for row in rows
+                         if row["thumbnail_path"] and sizes.get(row["thumbnail_path"]) is not None})
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        report.missing_variants = [path for path, missing in zip(thumbnails, executor.map(_needs_variants, thumbnails))
+                                   if missing]
+
+    report.checked = len(rows)
+    report.changed = save_file_status(statuses)
+
+    referenced = {_normalize(path) for path in paths}
+    report.orphans = find_orphans(download_folder, referenced)
+    report.orphan_bytes = sum(_file_size(path) or 0 for path in report.orphans)
+    report.elapsed = time.monotonic() - started_at
+    print(report.summary())
+    return report
@@ -0,0 +1,160 @@
+"""Opt-in instrumentation: startup phase timings, hot-path counters and a cProfile session.
+
+Turned on with OVERLAY_PROFILE=1 (or main.py --profile), OVERLAY_PROFILE=cprofile (or --profile=cprofile)
+also profiles the GUI thread for the whole session. The report is written to OVERLAY_PROFILE_DIR
+(default: profiles/) when the process exits, ready to attach to a bug report.
+
+When it is off, begin()/end()/mark()/record() return after one check and timed() returns the function
+unchanged, so the calls can stay in the code. timed() decides when the function is defined:
+enable() must run before the modules using it are imported.
+"""
+import os
+import sys
+import time
+import atexit
+import threading
+import functools
+from contextlib import contextmanager, nullcontext
+from datetime import datetime
+
+PROFILE_ENV = "OVERLAY_PROFILE"
+PROFILE_DIR_ENV = "OVERLAY_PROFILE_DIR"
+DEFAULT_PROFILE_DIR = "profiles"
+REPORT_TOP_FUNCTIONS = 40 # Functions listed from the cProfile stats in the text report
+
+ENABLED = False
+_started_at = time.perf_counter()
+_lock = threading.Lock()
+_open_phases = {}  # name -> start offset
+_phases = []  # (name, start offset, duration or None for a mark)
+_hot_paths = {}  # name -> [calls, total seconds, max seconds]
+_profiler = None
+_output_dir = DEFAULT_PROFILE_DIR
+
+def elapsed():
+    """Seconds since this module was imported (the start of main.py)"""
+    return time.perf_counter() - _started_at
+
+def enable(cprofile=False, output_dir=None):
+    global ENABLED, _profiler, _output_dir
+    if ENABLED:
+        return
+    ENABLED = True
+    _output_dir = output_dir or os.environ.get(PROFILE_DIR_ENV) or DEFAULT_PROFILE_DIR
+    if cprofile:
+        import cProfile
+        _profiler = cProfile.Profile()
+        _profiler.enable()
+    atexit.register(write_report)
+
+def enable_from_environment(argv=None):
+    """Enable from OVERLAY_PROFILE or a --profile[=cprofile] argument; returns ENABLED"""
+    value = os.environ.get(PROFILE_ENV, "")
+    for arg in argv or ():
+        if arg == "--profile" or arg.startswith("--profile="):
+            value = arg.partition("=")[2] or "1"
+    if value and value != "0":
+        enable(cprofile=value.lower() == "cprofile")
+    return ENABLED
+
+def begin(name):
+    """Start timing a phase that ends in another call (e.g. when an asynchronous result arrives)"""
+    if ENABLED:
+        with _lock:
+            _open_phases.setdefault(name, elapsed())
+
+def end(name):
+    if ENABLED:
+        with _lock:
+            started = _open_phases.pop(name, None)
+            if started is not None:
+                _phases.append((name, started, elapsed() - started))
+
+def mark(name):
+    """Record that something happened now (e.g. first paint)"""
+    if ENABLED:
+        with _lock:
+            _phases.append((name, elapsed(), None))
+
+@contextmanager
+def _timed_phase(name):
+    begin(name)
+    try:
+        yield
+    finally:
+        end(name)
+
+_NO_PHASE = nullcontext()
+
+def phase(name):
+    """Context manager timing a synchronous phase"""
+    return _timed_phase(name) if ENABLED else _NO_PHASE
+
+def record(name, seconds):
+    """Count one call of a hot path measured by the caller (e.g. work split across two events)"""
+    if ENABLED:
+        _record_call(name, seconds)
+
+def _record_call(name, seconds):
+    with _lock:
+        stats = _hot_paths.get(name)
+        if stats is None:
+            stats = _hot_paths[name] = [0, 0.0, 0.0]
+        stats[0] += 1
+        stats[1] += seconds
+        stats[2] = max(stats[2], seconds)
+
+def timed(name):
+    """Decorator counting calls and time of a hot-path function (any thread); no wrapper when off"""
+    def decorator(fn):
+        if not ENABLED:
+            return fn
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            started = time.perf_counter()
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                _record_call(name, time.perf_counter() - started)
+        return wrapper
+    return decorator
+
+def summary():
+    """Text report of the phases and hot paths recorded so far"""
+    lines = ["Startup (seconds since start, duration):"]
+    with _lock:
+        phases = sorted(_phases, key=lambda item: item[1])
+        hot_paths = sorted(_hot_paths.items(), key=lambda item: item[1][1], reverse=True)
+    for name, start, duration in phases:
+        lines.append(f"  {name:<32} {start:8.3f}" + (f"  +{duration:.3f}" if duration is not None else ""))
+    if hot_paths:
+        lines.append("")
+        lines.append("Hot paths (calls, total ms, mean ms, max ms):")
+        for name, (calls, total, longest) in hot_paths:
+            lines.append(f"  {name:<32} {calls:8d} {total * 1000:10.1f} {total * 1000 / calls:8.3f} {longest * 1000:8.3f}")
+    return "\n".join(lines)
+
+def write_report():
+    """Write the summary (and the cProfile stats, if enabled) to the profile folder; returns the summary path"""
+    if not ENABLED:
+        return None
+    stamp = datetime.now().strftime("%Y%m%d-%H%M%S")
+    base = os.path.join(_output_dir, f"profile-{stamp}-{os.getpid()}")
+    try:
+        os.makedirs(_output_dir, exist_ok=True)
+        text = summary()
+        if _profiler is not None:
+            _profiler.disable()
+            import io
+            import pstats
+            _profiler.dump_stats(base + ".prof")
+            stream = io.StringIO()
+            pstats.Stats(_profiler, stream=stream).sort_stats("cumulative").print_stats(REPORT_TOP_FUNCTIONS)
+            text += f"\n\ncProfile of the GUI thread (full stats in {base}.prof):\n{stream.getvalue()}"
+        with open(base + ".txt", "w", encoding="utf-8") as f:
+            f.write(f"{' '.join(sys.argv)}\n{sys.version}\n\n{text}\n")
+    except OSError as e:
+        print(f"Could not write profile report: {e}")
+        return None
+    print(f"Profile report written to {base}.txt")
+    return base + ".txt"
@@ -0,0 +1,80 @@
+"""Incremental sync of playlist and channel sources."""
+from datetime import datetime
+
+from src.utils.youtube_utils import expand_collection, get_collection_kind
+from src.models.database import get_source, save_source_sync, get_existing_video_ids
+
+def video_url(video_id):
+    return f"https://www.youtube.com/watch?v={video_id}"
+
+class SourceListing:
+    """Result of listing one source: the new videos to queue and the position to remember"""
+
+    def __init__(self, url, kind, title, head_video_id, new_video_ids, listed_ids=(), previous_video_id=None):
+        self.url = url
+        self.kind = kind
+        self.title = title
+        self.head_video_id = head_video_id
+        self.new_video_ids = new_video_ids
+        self.listed_ids = list(listed_ids)  # Newest first, as listed
+        self.previous_video_id = previous_video_id  # Position saved by the previous sync
+
+    @property
+    def video_urls(self):
+        return [video_url(video_id) for video_id in self.new_video_ids]
+
+def list_new_videos(url, full=False):
+    """List a playlist/channel and return the videos that are not in the library yet.
+
+    Channels list newest first, so the listing stops at the newest video seen by the previous
+    sync and only new uploads are fetched. Playlists can change anywhere, so they are always
+    listed in full (flat, one listing request). full=True ignores the remembered position.
+    """
+    kind = get_collection_kind(url)
+    source = get_source(url)
+    stop_at = None
+    if kind == "channel" and source and not full:
+        stop_at = source["last_video_id"]
+
+    title, listed_ids = expand_collection(url, stop_at)
+    existing_ids = get_existing_video_ids()
+    new_video_ids = []
+    seen = set()
+    for video_id in listed_ids:
+        if video_id not in existing_ids and video_id not in seen:
+            seen.add(video_id)
+            new_video_ids.append(video_id)
+
+    previous_video_id = source["last_video_id"] if source else None
+    head_video_id = listed_ids[0] if listed_ids else previous_video_id
+    print(f"Source '{title}': {len(listed_ids)} listed, {len(new_video_ids)} new")
+    return SourceListing(url, kind, title, head_video_id, new_video_ids, listed_ids, previous_video_id)
+
+def sync_position(listing, library_ids):
+    """Position to remember after ingesting a listing, given the video ids now in the library.
+
+    The head of the listing when every new video was saved. Otherwise the newest listed video that
+    is older than the oldest missing one (or the previous position), so the next incremental sync
+    lists the failed videos again.
+    """
+    new_ids = set(listing.new_video_ids)
+    missing = [i for i, video_id in enumerate(listing.listed_ids)
+               if video_id in new_ids and video_id not in library_ids]
+    if not missing:
+        return listing.head_video_id
+    older = missing[-1] + 1
+    return listing.listed_ids[older] if older < len(listing.listed_ids) else listing.previous_video_id
+
+def mark_source_synced(listing):
+    """Remember the listing position. Call after the listed videos have been processed (and saved),
+    so videos that failed or an interrupted ingest are listed again on the next sync."""
+    position = sync_position(listing, get_existing_video_ids())
+    if position != listing.head_video_id:
+        print(f"Source '{listing.title}': some new videos were not saved, keeping the sync position before them")
+    save_source_sync(
+        listing.url,
+        listing.kind,
+        listing.title,
+        position,
+        datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    )
@@ -1,31 +1,129 @@
 import os
 import re
 import json
-import urllib.request
-import urllib.error
-import requests
 import time
 import tempfile
 import shutil
-from pytube import YouTube
-from youtube_transcript_api import YouTubeTranscriptApi, NoTranscriptFound, TranscriptsDisabled
+import threading
 from datetime import datetime
-import yt_dlp # Make sure to import yt_dlp at the beginning of the file
 
-# Try importing translation library
-try:
-    import translators as ts
-    TRANSLATORS_AVAILABLE = True
-except ImportError:
-    TRANSLATORS_AVAILABLE = False
-    print("WARNING: The 'translators' library is not installed. Automatic subtitles translation will not work.")
-    print("Run 'pip install translators' to install it.")
+# yt_dlp, youtube_transcript_api, requests and translators are among the slowest packages to import
+# and are only needed once a download or a translation starts, so they are imported by the functions
+# that use them. The UI imports this module at startup for its constants and helpers.
+
+_translators = None
+_translators_lock = threading.Lock()
+
+def get_translators():
+    """The translators module, imported on first use. None if it is not installed."""
+    global _translators
+    with _translators_lock:
+        if _translators is None:
+            try:
+                import translators
+                _translators = translators
+            except ImportError:
+                _translators = False
+                print("WARNING: The 'translators' library is not installed. Automatic subtitles translation will not work.")
+                print("Run 'pip install translators' to install it.")
+        return _translators or None
 
 # --- Custom Exception ---
 class NoEnglishTranscriptError(Exception):
     """Error thrown when English subtitles are not found."""
     pass
 
+# --- Progress events ---
+# Stages of a single video download, in order, with their weight in the overall progress (total = 100)
+STAGE_PREPARE = "prepare"
+STAGE_AUDIO = "audio"
+STAGE_SUBTITLE = "subtitle"
+STAGE_THUMBNAIL = "thumbnail"
+STAGE_DONE = "done"
+STAGE_WEIGHTS = {
+    STAGE_PREPARE: 5,
+    STAGE_AUDIO: 60,
+    STAGE_SUBTITLE: 25,
+    STAGE_THUMBNAIL: 10,
+}
+
+class ProgressEvent:
+    """Structured progress report for one download job.
+
+    fraction is the completion of the current stage (0.0-1.0). Byte counts, speed (bytes/s)
+    and eta (seconds) are only known while downloading and are None otherwise.
+    """
+    __slots__ = ("stage", "fraction", "downloaded_bytes", "total_bytes", "speed", "eta", "message")
+
+    def __init__(self, stage, fraction=0.0, downloaded_bytes=None, total_bytes=None, speed=None, eta=None, message=None):
+        self.stage = stage
+        self.fraction = max(0.0, min(1.0, fraction))
+        self.downloaded_bytes = downloaded_bytes
+        self.total_bytes = total_bytes
+        self.speed = speed
+        self.eta = eta
+        self.message = message
+
+    def overall_fraction(self):
+        """Completion of the whole job (0.0-1.0) using STAGE_WEIGHTS"""
+        if self.stage == STAGE_DONE:
+            return 1.0
+        done = 0
+        for stage, weight in STAGE_WEIGHTS.items():
+            if stage == self.stage:
+                return (done + weight * self.fraction) / 100
+            done += weight
+        return 0.0
+
+    def __repr__(self):
+        return f"ProgressEvent({self.stage!r}, {self.fraction:.2f}, message={self.message!r})"
+
+class ProgressAggregator:
+    """Thread-safe store of the latest ProgressEvent per job.
+
+    Download workers call update() as often as they like; each call only overwrites the
+    job's latest event. The consumer (e.g. a GUI timer) calls drain() at its own refresh
+    rate, so any number of ticks from any number of concurrent jobs cost one update per refresh.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._latest = {}
+        self._changed = set()
+
+    def update(self, job_id, event):
+        with self._lock:
+            self._latest[job_id] = event
+            self._changed.add(job_id)
+
+    def remove(self, job_id):
+        with self._lock:
+            self._latest.pop(job_id, None)
+            self._changed.discard(job_id)
+
+    def drain(self):
+        """Return {job_id: event} for jobs that changed since the last drain"""
+        with self._lock:
+            changed = {job_id: self._latest[job_id] for job_id in self._changed}
+            self._changed.clear()
+        return changed
+
+    def snapshot(self):
+        """Return {job_id: latest event} for every active job"""
+        with self._lock:
+            return dict(self._latest)
+
+    def overall_fraction(self):
+        """Average completion over all active jobs"""
+        events = self.snapshot()
+        if not events:
+            return 0.0
+        return sum(event.overall_fraction() for event in events.values()) / len(events)
+
+def _report_progress(progress_callback, stage, fraction, **kwargs):
+    if progress_callback:
+        progress_callback(ProgressEvent(stage, fraction, **kwargs))
+
 # Backup download method using yt-dlp
 def download_with_ytdlp(url, video_id, download_folder, safe_title):
     """Download audio from YouTube using yt-dlp (backup method)"""
@@ -101,19 +199,165 @@ def extract_video_id(url):
     
     return None
 
-def download_audio(url, download_folder, video_id, status_callback=None):
+# Playlist and channel URLs (a watch URL with &list= is still treated as a single video)
+COLLECTION_URL_PATTERNS = [
+    (r'youtube\.com\/playlist\?(?:.*&)?list=([0-9A-Za-z_-]+)', "playlist"),
+    (r'youtube\.com\/(?:channel\/[0-9A-Za-z_-]+|c\/[^\/?#]+|user\/[^\/?#]+|@[^\/?#]+)', "channel"),
+]
+CHANNEL_TABS = ('videos', 'shorts', 'streams', 'playlists', 'featured')
+
+def get_collection_kind(url):
+    """Return "playlist" or "channel" for collection URLs, None for anything else"""
+    for pattern, kind in COLLECTION_URL_PATTERNS:
+        if re.search(pattern, url):
+            return kind
+    return None
+
+def is_collection_url(url):
+    return get_collection_kind(url) is not None
+
+def _normalize_channel_url(url):
+    """Point a channel URL at its Videos tab so the listing is newest-first uploads, not the tab list"""
+    base = url.split('?')[0].split('#')[0].rstrip('/')
+    if base.rsplit('/', 1)[-1] in CHANNEL_TABS:
+        return base
+    return base + '/videos'
+
+def expand_collection(url, stop_at_video_id=None):
+    """List the video IDs of a playlist or channel without fetching per-video metadata.
+
+    Uses yt-dlp flat extraction with a lazy playlist, so pages are only requested while
+    entries are being consumed. If stop_at_video_id is given, listing stops as soon as that
+    ID is reached (channels list newest first, so everything after it is already known).
+    Returns (title, video_ids) with IDs in listing order.
+    """
+    kind = get_collection_kind(url)
+    if kind is None:
+        raise ValueError(f"Not a playlist or channel URL: {url}")
+    listing_url = _normalize_channel_url(url) if kind == "channel" else url
+    import yt_dlp
+    
+    ydl_opts = {
+        'extract_flat': True,
+        'lazy_playlist': True,
+        'skip_download': True,
+        'quiet': True,
+        'no_warnings': True,
+    }
+    video_ids = []
+    with yt_dlp.YoutubeDL(ydl_opts) as ydl:
+        # process=False keeps 'entries' as a lazy generator of flat url results
+        info = ydl.extract_info(listing_url, download=False, process=False)
+        title = info.get('title') or listing_url
+        for entry in info.get('entries') or []:
+            if not entry:
+                continue
+            video_id = entry.get('id')
+            if not video_id or len(video_id) != 11:
+                continue # Nested playlists/tabs, not videos
+            if video_id == stop_at_video_id:
+                break
+            video_ids.append(video_id)
+    print(f"Listed {len(video_ids)} videos from {kind} '{title}'")
+    return title, video_ids
+
+# Audio ingest modes
+# - AUDIO_MODE_MP3: re-encode to MP3 192k with FFmpegExtractAudio (legacy behaviour)
+# - AUDIO_MODE_NATIVE: keep the native m4a/opus stream as delivered by YouTube (no re-encoding).
+#   QMediaPlayer plays m4a directly, so this skips the most CPU-heavy step of ingest.
+AUDIO_MODE_MP3 = "mp3"
+AUDIO_MODE_NATIVE = "native"
+AUDIO_MODES = (AUDIO_MODE_MP3, AUDIO_MODE_NATIVE)
+MP3_BITRATE_KBPS = 192
+# yt-dlp error when a video has no format matching the selector (e.g. no audio-only stream)
+FORMAT_NOT_AVAILABLE = "Requested format is not available"
+
+try:
+    import resource  # CPU time of child processes (ffmpeg); not available on Windows
+except ImportError:
+    resource = None
+
+def children_cpu_seconds():
+    """User + system CPU time of the child processes (ffmpeg) that have finished, None if unknown"""
+    if resource is None:
+        return None
+    usage = resource.getrusage(resource.RUSAGE_CHILDREN)
+    return usage.ru_utime + usage.ru_stime
+
+def mp3_size_estimate(duration):
+    """Size in bytes of the MP3_BITRATE_KBPS encode of duration seconds of audio"""
+    return int(MP3_BITRATE_KBPS * 1000 / 8 * duration)
+
+def _resolve_downloaded_path(info, ydl):
+    """Get the exact path of the final file from yt-dlp's info dict (after post-processing)"""
+    for download in info.get('requested_downloads') or []:
+        if download.get('filepath'):
+            return download['filepath']
+    if info.get('filepath'):
+        return info['filepath']
+    return ydl.prepare_filename(info)
+
+def download_audio(url, download_folder, video_id, status_callback=None, audio_mode=AUDIO_MODE_MP3, progress_callback=None):
+    """Download audio for a video.
+
+    Returns (final_audio_path, title, audio_stats) where audio_stats reports, for this video:
+    the size of the stream as downloaded and of the file kept, bytes_saved compared with the MP3
+    encode (estimated from the duration), and the wall and CPU time of post-processing (the FFmpeg
+    MP3 encode). cpu_seconds is the CPU time of the ffmpeg processes that finished while this
+    video was being post-processed: exact with one worker, it can include the encodes of
+    concurrent workers otherwise (None on Windows).
+    """
+    if audio_mode not in AUDIO_MODES:
+        raise ValueError(f"Unknown audio mode: {audio_mode}")
+    import yt_dlp
     if status_callback: status_callback("Preparing to download audio...")
+    _report_progress(progress_callback, STAGE_AUDIO, 0.0, message="Preparing to download audio...")
+    
+    # Exact final path reported by yt-dlp once every post-processor has run
+    final_path_holder = {}
+    # Per-video measurements: size of the downloaded stream, time spent in each post-processor
+    job_stats = {"source_bytes": None, "postprocess_seconds": 0.0, "cpu_seconds": None}
+    postprocess_started = {}
     
-    # Progress callback for detailed monitoring
+    # Progress callback for detailed monitoring (called on every yt-dlp tick, so only structured events here)
     def progress_hook(d):
-        if status_callback and d['status'] == 'downloading':
-            if '_percent_str' in d and '_speed_str' in d:
-                status_callback(f"Downloading audio: {d['_percent_str']} ({d['_speed_str']})")
-        elif status_callback and d['status'] == 'finished':
-            status_callback(f"Download complete, processing audio...")
+        if d['status'] == 'downloading':
+            downloaded = d.get('downloaded_bytes') or 0
+            total = d.get('total_bytes') or d.get('total_bytes_estimate')
+            _report_progress(
+                progress_callback, STAGE_AUDIO,
+                # Leave the last 10% of the audio stage for post-processing
+                0.9 * downloaded / total if total else 0.0,
+                downloaded_bytes=downloaded,
+                total_bytes=total,
+                speed=d.get('speed'),
+                eta=d.get('eta'),
+            )
+        elif d['status'] == 'finished':
+            # Before post-processing, which replaces the downloaded file in MP3 mode
+            filename = d.get('filename')
+            if filename and os.path.exists(filename):
+                job_stats["source_bytes"] = os.path.getsize(filename)
+            else:
+                job_stats["source_bytes"] = d.get('downloaded_bytes') or d.get('total_bytes')
+            if status_callback: status_callback(f"Download complete, processing audio...")
+            _report_progress(progress_callback, STAGE_AUDIO, 0.9, downloaded_bytes=d.get('downloaded_bytes'),
+                             total_bytes=d.get('total_bytes'), message="Download complete, processing audio...")
     
     # Post-processor callback to monitor conversion process
     def postprocessor_hook(d):
+        name = d.get('postprocessor', '')
+        if d['status'] == 'started':
+            postprocess_started[name] = (time.perf_counter(), children_cpu_seconds())
+        elif d['status'] == 'finished':
+            started, cpu_started = postprocess_started.pop(name, (None, None))
+            if started is not None:
+                job_stats["postprocess_seconds"] += time.perf_counter() - started
+            if cpu_started is not None:
+                job_stats["cpu_seconds"] = (job_stats["cpu_seconds"] or 0.0) + children_cpu_seconds() - cpu_started
+            filepath = d.get('info_dict', {}).get('filepath')
+            if filepath:
+                final_path_holder['path'] = filepath
         if status_callback:
             if d['status'] == 'started':
                 status_callback(f"Processing audio... {d.get('postprocessor', '')}")
@@ -121,13 +365,7 @@ def download_audio(url, download_folder, video_id, status_callback=None):
                 status_callback(f"Audio processing complete")
     
     ydl_opts = {
-        'format': 'bestaudio/best',
         'outtmpl': os.path.join(download_folder, f'YouTube_Audio_{video_id}.%(ext)s'),
-        'postprocessors': [{
-            'key': 'FFmpegExtractAudio',
-            'preferredcodec': 'mp3', # or 'wav', 'm4a' as needed
-            'preferredquality': '192',
-        }],
         'quiet': True,
         'no_warnings': True,
         'progress_hooks': [progress_hook],
@@ -135,31 +373,72 @@ def download_audio(url, download_folder, video_id, status_callback=None):
         'nocheckcertificate': True, # Skip SSL certificate check if needed
         'http_chunk_size': 10485760 # Increase chunk size for downloads
     }
+    if audio_mode == AUDIO_MODE_MP3:
+        ydl_opts['format'] = 'bestaudio/best'
+        ydl_opts['postprocessors'] = [{
+            'key': 'FFmpegExtractAudio',
+            'preferredcodec': 'mp3',
+            'preferredquality': str(MP3_BITRATE_KBPS),
+        }]
+    else:
+        # Prefer m4a (AAC) since every QMediaPlayer backend can play it, fall back to any audio-only stream
+        ydl_opts['format'] = 'bestaudio[ext=m4a]/bestaudio'
+    attempts = [ydl_opts]
+    if audio_mode == AUDIO_MODE_NATIVE:
+        # No audio-only stream: download the best format and extract its audio track (-x),
+        # copying the stream instead of re-encoding it when the codec allows
+        attempts.append(dict(ydl_opts, format='best',
+                             postprocessors=[{'key': 'FFmpegExtractAudio', 'preferredcodec': 'best'}]))
     
     try:
-        with yt_dlp.YoutubeDL(ydl_opts) as ydl:
-            if status_callback: status_callback("Starting audio download...")
-            info = ydl.extract_info(url, download=True)
-            downloaded_path = ydl.prepare_filename(info)
-            # yt-dlp automatically adds codec extension, we need to get the exact path after processing
-            base, _ = os.path.splitext(downloaded_path)
-            final_audio_path = base + '.mp3' # Must match preferredcodec
-            
-            if not os.path.exists(final_audio_path):
-                 # Sometimes the actual file name may be slightly different, look for an mp3 file matching video_id
-                 found = False
-                 for f in os.listdir(download_folder):
-                      if f.startswith(f'YouTube_Audio_{video_id}') and f.endswith('.mp3'):
-                           final_audio_path = os.path.join(download_folder, f)
-                           found = True
-                           break
-                 if not found:
-                    raise FileNotFoundError(f"MP3 audio file not found after download: {final_audio_path}")
-
-            if status_callback: status_callback("Audio download and processing complete.")
-            print(f"Audio downloaded to: {final_audio_path}")
-            return final_audio_path, info.get('title', f'Video_{video_id}') # Return title too
-            
+        for attempt, opts in enumerate(attempts):
+            try:
+                with yt_dlp.YoutubeDL(opts) as ydl:
+                    if status_callback: status_callback("Starting audio download...")
+                    info = ydl.extract_info(url, download=True)
+                    final_audio_path = final_path_holder.get('path') or _resolve_downloaded_path(info, ydl)
+            except yt_dlp.utils.DownloadError as e:
+                if attempt + 1 < len(attempts) and FORMAT_NOT_AVAILABLE in str(e):
+                    print(f"No audio-only format for {video_id}, extracting the audio track of the best format")
+                    continue
+                raise
+            break
+        
+        if not os.path.exists(final_audio_path):
+            raise FileNotFoundError(f"Audio file not found after download: {final_audio_path}")
+
+        audio_bytes = os.path.getsize(final_audio_path)
+        source_bytes = job_stats["source_bytes"] or audio_bytes
+        postprocess_seconds = job_stats["postprocess_seconds"]
+        cpu_seconds = job_stats["cpu_seconds"]
+        if cpu_seconds is None and resource is not None:
+            cpu_seconds = 0.0  # No post-processor ran
+        duration = info.get('duration') or 0
+        # Saving over the MP3 path: none in MP3 mode, otherwise against the size of the MP3 encode
+        if audio_mode == AUDIO_MODE_MP3:
+            bytes_saved = 0
+        else:
+            bytes_saved = mp3_size_estimate(duration) - audio_bytes if duration else None
+        audio_stats = {
+            "audio_mode": audio_mode,
+            # acodec describes the downloaded stream, after the MP3 re-encode the file is mp3
+            "codec": 'mp3' if audio_mode == AUDIO_MODE_MP3 else (info.get('acodec') or os.path.splitext(final_audio_path)[1].lstrip('.')),
+            "duration": duration,
+            "source_bytes": source_bytes, # Stream as downloaded
+            "audio_bytes": audio_bytes, # File kept (after the MP3 encode, if any)
+            "bytes_saved": bytes_saved,
+            "postprocess_seconds": round(postprocess_seconds, 3),
+            "cpu_seconds": round(cpu_seconds, 3) if cpu_seconds is not None else None,
+        }
+
+        if status_callback: status_callback("Audio download and processing complete.")
+        _report_progress(progress_callback, STAGE_AUDIO, 1.0, downloaded_bytes=audio_bytes, total_bytes=audio_bytes,
+                         message="Audio download and processing complete.")
+        print(f"Audio downloaded to: {final_audio_path}")
+        print(f"Audio stats ({audio_mode}): downloaded {source_bytes} bytes, kept {audio_bytes} bytes, "
+              f"saved {bytes_saved} bytes vs MP3, post-processing {postprocess_seconds:.2f}s, CPU {cpu_seconds}s")
+        return final_audio_path, info.get('title', f'Video_{video_id}'), audio_stats # Return title and stats too
+
     except yt_dlp.utils.DownloadError as e:
         # Print more detailed error
         print(f"yt-dlp download error: {e}")
@@ -175,8 +454,10 @@ def download_audio(url, download_folder, video_id, status_callback=None):
         if status_callback: status_callback(f"Unexpected error when downloading audio: {e}")
         raise
 
-def download_subtitles(video_id, download_folder, title, status_callback=None):
+def download_subtitles(video_id, download_folder, title, status_callback=None, progress_callback=None):
+    from youtube_transcript_api import YouTubeTranscriptApi, NoTranscriptFound, TranscriptsDisabled
     if status_callback: status_callback("Searching for automatic English subtitles...")
+    _report_progress(progress_callback, STAGE_SUBTITLE, 0.0, message="Searching for automatic English subtitles...")
     subtitles_data_fetched = None
     transcript = None
     try:
@@ -206,7 +487,8 @@ def download_subtitles(video_id, download_folder, title, status_callback=None):
     if subtitles_data_fetched:
         subtitles_data_processed = []
 
-        if TRANSLATORS_AVAILABLE:
+        ts = get_translators()
+        if ts is not None:
             if status_callback: status_callback("Translating subtitles (may take a few minutes)...")
             print("Starting to translate subtitles to Vietnamese...")
             translated_count = 0
@@ -214,10 +496,9 @@ def download_subtitles(video_id, download_folder, title, status_callback=None):
             total_subs = len(subtitles_data_fetched)
             
             for i, sub_obj in enumerate(subtitles_data_fetched):
-                # Update translation progress by count
-                if status_callback and i % 10 == 0:  # Update every 10 sentences to avoid too many updates
-                    percent_done = min(100, int((i / total_subs) * 100))
-                    status_callback(f"Translating subtitles: {percent_done}% ({i}/{total_subs})")
+                # Translation covers 10%-90% of the subtitle stage
+                _report_progress(progress_callback, STAGE_SUBTITLE, 0.1 + 0.8 * i / total_subs,
+                                 message=f"Translating subtitles ({i}/{total_subs})")
                 
                 # Create dictionary from object's direct properties
                 sub_dict = {
@@ -263,8 +544,10 @@ def download_subtitles(video_id, download_folder, title, status_callback=None):
             with open(subtitle_path, 'w', encoding='utf-8') as f:
                 json.dump(subtitles_data_processed, f, ensure_ascii=False, indent=4)
             if status_callback: status_callback("Saving subtitles complete.")
+            _report_progress(progress_callback, STAGE_SUBTITLE, 1.0, message="Saving subtitles complete.")
             print(f"Subtitles saved to: {subtitle_path}")
-            return subtitle_path
+            # Cues are returned too so they can be saved to the database with the video row
+            return subtitle_path, subtitles_data_processed
         except Exception as e:
             print(f"Error when saving JSON subtitle file: {e}")
             if status_callback: status_callback(f"Error saving subtitle file: {e}")
@@ -273,71 +556,201 @@ def download_subtitles(video_id, download_folder, title, status_callback=None):
         print(f"No subtitle data to process for {video_id} despite no prior errors.")
         raise NoEnglishTranscriptError(f"Logic error: no subtitle data for {video_id}.")
 
-def download_thumbnail(video_id, download_folder, status_callback=None):
+# --- Thumbnails ---
+THUMBNAIL_BASE_URL = "https://img.youtube.com/vi"
+THUMBNAIL_POOL_SIZE = 8 # Max concurrent thumbnail fetches / pooled keep-alive connections
+THUMBNAIL_TIMEOUT = 10
+THUMBNAIL_CACHE_FILE = "thumbnail_cache.json" # ETag/Last-Modified of downloaded thumbnails
+THUMBNAIL_VARIANT_DIR = "scaled" # Pre-scaled copies (see src/ui/thumbnail_cache.py), next to the originals
+THUMBNAIL_LIST_SIZE = (160, 90)
+THUMBNAIL_PLAYER_SIZE = (320, 180)
+THUMBNAIL_VARIANT_SIZES = (THUMBNAIL_LIST_SIZE, THUMBNAIL_PLAYER_SIZE)
+
+def scaled_thumbnail_path(thumbnail_path, size):
+    """Path of the pre-scaled variant of a thumbnail for size (width, height)"""
+    folder, filename = os.path.split(thumbnail_path)
+    name = os.path.splitext(filename)[0]
+    return os.path.join(folder, THUMBNAIL_VARIANT_DIR, f"{name}_{size[0]}x{size[1]}.jpg")
+
+def thumbnail_variant_paths(thumbnail_path):
+    """Paths of every pre-scaled variant of a thumbnail (existing or not)"""
+    return [scaled_thumbnail_path(thumbnail_path, size) for size in THUMBNAIL_VARIANT_SIZES]
+
+_http_session = None
+_http_session_lock = threading.Lock()
+
+def get_http_session():
+    """Shared requests.Session with a keep-alive connection pool, safe to use from worker threads"""
+    global _http_session
+    with _http_session_lock:
+        if _http_session is None:
+            import requests
+            from requests.adapters import HTTPAdapter
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=2, pool_maxsize=THUMBNAIL_POOL_SIZE, max_retries=1)
+            session.mount('https://', adapter)
+            session.mount('http://', adapter)
+            _http_session = session
+        return _http_session
+
+class ThumbnailValidatorCache:
+    """ETag/Last-Modified of each downloaded thumbnail, stored as JSON in the download folder.
+
+    Used to send conditional requests so an unchanged thumbnail costs a 304 with no body.
+    """
+
+    def __init__(self, download_folder):
+        self.path = os.path.join(download_folder, THUMBNAIL_CACHE_FILE)
+        self._lock = threading.Lock()
+        self._entries = None
+        self._dirty = False
+
+    def _load(self):
+        if self._entries is None:
+            try:
+                with open(self.path, 'r', encoding='utf-8') as f:
+                    self._entries = json.load(f)
+            except (OSError, ValueError):
+                self._entries = {}
+        return self._entries
+
+    def get(self, filename):
+        with self._lock:
+            return self._load().get(filename)
+
+    def set(self, filename, etag, last_modified):
+        with self._lock:
+            self._load()[filename] = {"etag": etag, "last_modified": last_modified}
+            self._dirty = True
+
+    def set_missing(self, filename):
+        """Remember that the server has no such thumbnail (404), so later fetches skip it"""
+        with self._lock:
+            self._load()[filename] = {"missing": True}
+            self._dirty = True
+
+    def flush(self):
+        """Write pending changes to disk"""
+        with self._lock:
+            if not self._dirty:
+                return
+            tmp_path = self.path + ".tmp"
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(self._entries, f)
+            os.replace(tmp_path, self.path)
+            self._dirty = False
+
+_validator_caches = {}
+
+def _get_validator_cache(download_folder):
+    key = os.path.abspath(download_folder)
+    with _http_session_lock:
+        if key not in _validator_caches:
+            _validator_caches[key] = ThumbnailValidatorCache(download_folder)
+        return _validator_caches[key]
+
+def flush_thumbnail_cache(download_folder):
+    """Write the ETag/Last-Modified index of download_folder (once per batch, see download_thumbnail)"""
+    _get_validator_cache(download_folder).flush()
+
+def _fetch_thumbnail(url, thumbnail_path, validator_cache, timeout):
+    """Fetch one thumbnail with a conditional request. Returns True if the file is up to date on disk,
+    False if the server has no such thumbnail (404)."""
+    filename = os.path.basename(thumbnail_path)
+    headers = {}
+    validators = validator_cache.get(filename)
+    if validators and os.path.exists(thumbnail_path):
+        if validators.get("etag"):
+            headers["If-None-Match"] = validators["etag"]
+        if validators.get("last_modified"):
+            headers["If-Modified-Since"] = validators["last_modified"]
+
+    response = get_http_session().get(url, headers=headers, timeout=timeout)
+    if response.status_code == 304:
+        return True
+    if response.status_code == 404:
+        validator_cache.set_missing(filename)
+        return False
+    response.raise_for_status()
+
+    # Thumbnails are ~20 KB, so write the whole body at once (atomically, a reader never sees half a file)
+    tmp_path = thumbnail_path + ".part"
+    with open(tmp_path, 'wb') as f:
+        f.write(response.content)
+    os.replace(tmp_path, thumbnail_path)
+    validator_cache.set(filename, response.headers.get('ETag'), response.headers.get('Last-Modified'))
+    return True
+
+def download_thumbnail(video_id, download_folder, status_callback=None, progress_callback=None, flush_cache=True):
+    """Download (or revalidate) the thumbnail of a video; returns its path, None on failure.
+
+    hqdefault is tried first and default.jpg when the server has no hqdefault (404). Which one a
+    video has is remembered, so revalidating it later costs a single request. Batches pass
+    flush_cache=False and call flush_thumbnail_cache() once at the end.
+    """
+    import requests
     if status_callback: status_callback("Downloading thumbnail image...")
-    thumbnail_path = None
+    _report_progress(progress_callback, STAGE_THUMBNAIL, 0.0, message="Downloading thumbnail image...")
+    validator_cache = _get_validator_cache(download_folder)
     try:
-        # Get highest quality thumbnail
-        thumbnail_url = f"https://img.youtube.com/vi/{video_id}/hqdefault.jpg"
-
-        # Create filename
-        thumbnail_filename = f"YouTube_Thumbnail_{video_id}.jpg"
-        thumbnail_path = os.path.join(download_folder, thumbnail_filename)
-        
-        # Download image with progress tracking
-        response = requests.get(thumbnail_url, stream=True, timeout=10)
-        response.raise_for_status()
-        
-        # Get file size if available
-        content_length = response.headers.get('content-length')
-        if content_length:
-            content_length = int(content_length)
-            downloaded = 0
-            
-            with open(thumbnail_path, 'wb') as f:
-                for chunk in response.iter_content(chunk_size=8192):
-                    f.write(chunk)
-                    downloaded += len(chunk)
-                    if status_callback and content_length > 0:
-                        percent = int((downloaded / content_length) * 100)
-                        if percent % 20 == 0:  # Update every 20%
-                            status_callback(f"Downloading thumbnail: {percent}%")
-        else:
-            # If content-length is not available
-            with open(thumbnail_path, 'wb') as f:
-                for chunk in response.iter_content(chunk_size=8192):
-                    f.write(chunk)
-
-        if status_callback: status_callback("Thumbnail download complete.")
-        print(f"Thumbnail saved to: {thumbnail_path}")
-        return thumbnail_path
-
-    except requests.exceptions.RequestException as e:
-        print(f"Network error when downloading thumbnail: {e}")
-        # Try fallback to default thumbnail if error
-        thumbnail_url = f"https://img.youtube.com/vi/{video_id}/default.jpg"
-        try:
-            response = requests.get(thumbnail_url, stream=True, timeout=5)
-            response.raise_for_status()
-            thumbnail_filename = f"YouTube_Thumbnail_{video_id}_default.jpg"
+        # Get highest quality thumbnail, fall back to the default one if it doesn't exist
+        candidates = [
+            (f"{THUMBNAIL_BASE_URL}/{video_id}/hqdefault.jpg", f"YouTube_Thumbnail_{video_id}.jpg"),
+            (f"{THUMBNAIL_BASE_URL}/{video_id}/default.jpg", f"YouTube_Thumbnail_{video_id}_default.jpg"),
+        ]
+        # Skip the hqdefault request when an earlier fetch found the video has none
+        hq_entry = validator_cache.get(candidates[0][1])
+        if hq_entry and hq_entry.get("missing"):
+            candidates.pop(0)
+        last_error = None
+        for thumbnail_url, thumbnail_filename in candidates:
             thumbnail_path = os.path.join(download_folder, thumbnail_filename)
-            with open(thumbnail_path, 'wb') as f:
-                for chunk in response.iter_content(chunk_size=8192):
-                    f.write(chunk)
-            if status_callback: status_callback("Default thumbnail downloaded.")
-            print(f"Default thumbnail saved to: {thumbnail_path}")
+            try:
+                if not _fetch_thumbnail(thumbnail_url, thumbnail_path, validator_cache, THUMBNAIL_TIMEOUT):
+                    last_error = f"{thumbnail_url} not found"
+                    continue
+            except requests.exceptions.RequestException as e:
+                print(f"Network error when downloading thumbnail {thumbnail_url}: {e}")
+                last_error = e
+                continue
+            if flush_cache:
+                validator_cache.flush()
+            if status_callback: status_callback("Thumbnail download complete.")
+            _report_progress(progress_callback, STAGE_THUMBNAIL, 1.0, message="Thumbnail download complete.")
+            print(f"Thumbnail saved to: {thumbnail_path}")
             return thumbnail_path
-        except requests.exceptions.RequestException as e2:
-             print(f"Network error when downloading default thumbnail: {e2}")
-             if status_callback: status_callback(f"Error downloading thumbnail: {e}")
-             return None
+
+        if flush_cache:
+            validator_cache.flush()
+        if status_callback: status_callback(f"Error downloading thumbnail: {last_error}")
+        return None
     except Exception as e:
         print(f"Unexpected error when downloading thumbnail: {e}")
         if status_callback: status_callback(f"Error downloading thumbnail: {e}")
         return None
 
-def download_youtube_video(url, download_folder, status_callback=None):
-    """Download audio, subtitles (with translation if possible), and thumbnail for YouTube video."""
+def download_thumbnails(video_ids, download_folder, max_workers=THUMBNAIL_POOL_SIZE):
+    """Download (or revalidate) many thumbnails concurrently with a bounded pool.
+
+    Returns {video_id: thumbnail_path or None}.
+    """
+    from concurrent.futures import ThreadPoolExecutor
+    video_ids = list(video_ids)
+    try:
+        with ThreadPoolExecutor(max_workers=max(1, min(max_workers, THUMBNAIL_POOL_SIZE))) as executor:
+            paths = executor.map(
+                lambda video_id: download_thumbnail(video_id, download_folder, flush_cache=False), video_ids)
+            return dict(zip(video_ids, paths))
+    finally:
+        # Write the ETag/Last-Modified index once for the whole batch
+        flush_thumbnail_cache(download_folder)
+
+def download_youtube_video(url, download_folder, status_callback=None, audio_mode=AUDIO_MODE_MP3, progress_callback=None,
+                           flush_cache=True):
+    """Download audio, subtitles (with translation if possible), and thumbnail for YouTube video.
+
+    Batches pass flush_cache=False and call flush_thumbnail_cache() once at the end.
+    """
     video_id = extract_video_id(url) # Get video_id first for use in filenames
     if not video_id:
         raise ValueError("Could not extract Video ID from URL.")
@@ -352,20 +765,22 @@ def download_youtube_video(url, download_folder, status_callback=None):
     try:
         # 1. Download Audio and get Title from yt-dlp
         if status_callback: status_callback("Preparing to download audio and get information...")
+        _report_progress(progress_callback, STAGE_PREPARE, 1.0, message="Preparing to download audio and get information...")
         
         # Options to get info without downloading again if the file already exists? (Difficult with yt-dlp)
         # For now, just download audio again
         
-        audio_path, title = download_audio(url, download_folder, video_id, status_callback)
+        audio_path, title, audio_stats = download_audio(url, download_folder, video_id, status_callback, audio_mode, progress_callback)
         
         if not audio_path or not title:
              raise Exception("Audio download or title retrieval failed.")
 
         # 2. Download Subtitles (and translate if possible) - Use retrieved video_id and title
-        subtitle_path = download_subtitles(video_id, download_folder, title, status_callback)
+        subtitle_path, cues = download_subtitles(video_id, download_folder, title, status_callback, progress_callback)
         
         # 3. Download Thumbnail - Use video_id
-        thumbnail_path = download_thumbnail(video_id, download_folder, status_callback)
+        thumbnail_path = download_thumbnail(video_id, download_folder, status_callback, progress_callback,
+                                            flush_cache=flush_cache)
 
         download_date = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
 
@@ -375,10 +790,13 @@ def download_youtube_video(url, download_folder, status_callback=None):
             "audio_path": audio_path,
             "subtitle_path": subtitle_path, 
             "thumbnail_path": thumbnail_path,
-            "download_date": download_date
+            "download_date": download_date,
+            "audio_stats": audio_stats,
+            "cues": cues
         }
         
         if status_callback: status_callback("Download completed!")
+        _report_progress(progress_callback, STAGE_DONE, 1.0, message="Download completed!")
         return video_info
 
     except NoEnglishTranscriptError as e:
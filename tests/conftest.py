@@ -0,0 +1,12 @@
+import pytest
+
+from src.models import database
+
+@pytest.fixture
+def library_db(tmp_path, monkeypatch):
+    """An empty library database at the current schema version, in tmp_path"""
+    database.close_connections()
+    monkeypatch.setattr(database, "DATABASE_PATH", str(tmp_path / "library.db"))
+    database.init_db()
+    yield database
+    database.close_connections()
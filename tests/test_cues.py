@@ -0,0 +1,34 @@
+"""Time-range queries on the cues table."""
+from src.models.database import save_cues, get_cues_in_range
+
+def cue(start, duration, text, vi_text=""):
+    return {"start": start, "duration": duration, "text": text, "vi_text": vi_text}
+
+CUES = [
+    cue(0.0, 30.0, "long"),  # Much longer than the others, still showing in the window
+    cue(1.0, 2.0, "before"),  # Ends before the window
+    cue(3.0, 2.0, "ends at start"),  # Ends exactly at the window start
+    cue(4.0, 2.0, "overlaps start", "chồng lên đầu"),  # Starts before the window, ends inside it
+    cue(7.0, 1.0, "inside"),
+    cue(10.0, 2.0, "starts at end"),  # Starts exactly at the window end
+]
+
+def texts(cues):
+    return [c["text"] for c in cues]
+
+def test_range_returns_the_cues_overlapping_the_window(library_db):
+    save_cues("vid", CUES)
+    cues = get_cues_in_range("vid", 5000, 10000)
+    assert texts(cues) == ["long", "overlaps start", "inside"]
+    assert cues[1]["idx"] == 3
+    assert cues[1]["start"] == 4.0 and cues[1]["duration"] == 2.0
+    assert cues[1]["vi_text"] == "chồng lên đầu"
+
+def test_long_cue_found_far_from_its_start(library_db):
+    # Lower bound start_ms >= start - max_duration_ms must still reach the 30 s cue
+    save_cues("vid", CUES)
+    assert texts(get_cues_in_range("vid", 29000, 29500)) == ["long"]
+    assert get_cues_in_range("vid", 30000, 31000) == []
+
+def test_unknown_video_has_no_cues(library_db):
+    assert get_cues_in_range("missing", 0, 10000) == []
@@ -0,0 +1,107 @@
+"""Schema migrations and keyset pagination of the library."""
+import json
+import sqlite3
+import time
+
+from src.models import database
+from src.models.database import (get_videos_page, page_cursor, save_videos, get_cues, save_cues, delete_videos,
+                                 get_existing_video_ids, add_change_listener, remove_change_listener, CHANGE_DELETE)
+
+LIBRARY_ROWS = 50000
+PAGE_SIZE = 50
+PAGE_BUDGET_MS = 5.0  # "Low milliseconds" per page; measured well under 1 ms (bench/db_pagination.py)
+
+# Schema of the first release (no user_version), subtitles only in JSON files
+BASELINE_SCHEMA = '''
+CREATE TABLE IF NOT EXISTS videos (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    video_id TEXT UNIQUE,
+    title TEXT,
+    audio_path TEXT,
+    subtitle_path TEXT,
+    thumbnail_path TEXT,
+    download_date TIMESTAMP
+)
+'''
+
+def test_baseline_database_is_migrated_to_current_version(tmp_path, monkeypatch):
+    path = tmp_path / "youtube_subtitles.db"
+    subtitle_path = tmp_path / "sub.json"
+    subtitle_path.write_text(json.dumps([
+        {"start": 0.5, "duration": 2.0, "text": "Hello", "vi_text": "Xin chào"},
+        {"start": 3.0, "duration": 1.5, "text": "World"},
+    ]), encoding="utf-8")
+    conn = sqlite3.connect(path)
+    conn.execute(BASELINE_SCHEMA)
+    conn.execute(
+        "INSERT INTO videos (video_id, title, audio_path, subtitle_path, thumbnail_path, download_date) "
+        "VALUES (?, ?, ?, ?, ?, ?)",
+        ("abc", "Old video", "audio.mp3", str(subtitle_path), None, "2024-01-01 10:00:00"))
+    conn.commit()
+    conn.close()
+
+    database.close_connections()
+    monkeypatch.setattr(database, "DATABASE_PATH", str(path))
+    try:
+        assert database.apply_migrations() == [1, 2, 3, 4, 5]
+        conn = database.get_connection()
+        assert conn.execute("PRAGMA user_version").fetchone()[0] == database.SCHEMA_VERSION == 5
+        row = conn.execute("SELECT * FROM videos WHERE video_id = 'abc'").fetchone()
+        assert row["title"] == "Old video"
+        # Migration 3 imported the JSON file, migration 4 counted its cues
+        assert row["cue_count"] == 2 and row["translated_cue_count"] == 1
+        assert row["metadata_ready"] == 0 and row["audio_exists"] is None
+        assert [cue["text"] for cue in get_cues("abc")] == ["Hello", "World"]
+        assert get_cues("abc")[0]["vi_text"] == "Xin chào"
+        # Already current: nothing to apply
+        assert database.apply_migrations() == []
+    finally:
+        database.close_connections()
+
+def test_keyset_pages_use_the_index_and_stay_fast_at_50k_rows(library_db):
+    save_videos([{
+        "video_id": f"v{n:06d}", "title": f"Video {n}", "audio_path": f"a{n}.mp3",
+        "subtitle_path": None, "thumbnail_path": None,
+        # Shared timestamps: the id breaks ties
+        "download_date": f"2024-01-01 00:00:00.{n // 3:06d}",
+    } for n in range(LIBRARY_ROWS)])
+
+    plan = " ".join(row[3] for row in library_db.get_connection().execute(
+        "EXPLAIN QUERY PLAN SELECT * FROM videos WHERE (download_date, id) < (?, ?) "
+        "ORDER BY download_date DESC, id DESC LIMIT ?", ("", 0, PAGE_SIZE)))
+    assert "idx_videos_download_date" in plan
+    assert "TEMP B-TREE" not in plan
+
+    seen = []
+    latencies = []
+    page = get_videos_page(PAGE_SIZE)
+    while page:
+        seen.extend(row["id"] for row in page)
+        started = time.perf_counter()
+        page = get_videos_page(PAGE_SIZE, page_cursor(page[-1]))
+        latencies.append((time.perf_counter() - started) * 1000)
+    # Every row exactly once, newest first
+    assert len(seen) == len(set(seen)) == LIBRARY_ROWS
+    assert seen[:3] == [LIBRARY_ROWS, LIBRARY_ROWS - 1, LIBRARY_ROWS - 2]
+    latencies.sort()
+    assert latencies[len(latencies) // 2] < PAGE_BUDGET_MS
+
+def test_delete_notifies_only_the_rows_it_deleted(library_db):
+    save_videos([{"video_id": f"d{n}", "title": f"Video {n}", "audio_path": "a.mp3",
+                  "download_date": "2024-01-01 00:00:00"} for n in range(3)])
+    ids = {row["video_id"]: row["id"] for row in get_videos_page(10)}
+    save_cues("d0", [{"start": 0, "duration": 1, "text": "cue"}])
+    changes = []
+    listener = lambda kind, changed: changes.append((kind, sorted(changed)))
+    add_change_listener(listener)
+    try:
+        # One id deleted twice in the list, one that was never there
+        assert delete_videos([ids["d0"], ids["d2"], ids["d0"], 9999]) == 2
+        assert changes == [(CHANGE_DELETE, sorted([ids["d0"], ids["d2"]]))]
+        assert get_existing_video_ids() == {"d1"}
+        assert get_cues("d0") is None
+        # Nothing left to delete: no notification
+        assert delete_videos([ids["d0"], 9999]) == 0
+        assert len(changes) == 1
+    finally:
+        remove_change_listener(listener)
@@ -0,0 +1,88 @@
+"""Accent folding, incremental updates and search time of the library filter index."""
+import random
+import time
+
+from src.utils.library_index import LibraryIndex, normalize
+
+LIBRARY_ROWS = 50000
+KEYSTROKE_BUDGET_MS = 16.0  # One frame at 60 Hz for a typical word
+SHORT_WORD_BUDGET_MS = 100.0  # One or two letters match a large part of the vocabulary
+
+def video(video_id, title, youtube_id=None, download_date="2024-01-01 00:00:00"):
+    return {"id": video_id, "video_id": youtube_id or f"yt{video_id:05d}", "title": title,
+            "download_date": download_date}
+
+def test_normalize_folds_case_accents_and_d_stroke():
+    assert normalize("Tiếng Việt") == "tieng viet"
+    assert normalize("ĐÀ NẴNG") == "da nang"
+    assert normalize("đường") == "duong"
+
+def test_accent_free_words_match_vietnamese_titles():
+    index = LibraryIndex([video(1, "Học Tiếng Việt mỗi ngày"), video(2, "Learn English fast")])
+    assert index.search("viet") == {1}
+    assert index.search("Việt") == {1}
+    assert index.search("tieng viet") == {1}
+    assert index.search("tiếng english") == set()
+
+def test_d_stroke_matches_both_ways():
+    index = LibraryIndex([video(1, "Du lịch Đà Nẵng"), video(2, "Dạy nấu ăn")])
+    assert index.search("da nang") == {1}
+    assert index.search("ĐÀ NẴNG") == {1}
+    assert index.search("dạy") == {2}
+    assert index.search("đ") == {1, 2}
+
+def test_short_words_match_by_prefix_and_ids_are_indexed():
+    index = LibraryIndex([video(1, "Go tutorial", youtube_id="dQw4w9WgXcQ"), video(2, "Golang in depth")])
+    assert index.search("go") == {1, 2}
+    assert index.search("dqw4") == {1}
+    assert index.search("  ") is None
+
+def test_remove_then_add_again():
+    index = LibraryIndex([video(1, "Tiếng Việt cơ bản"), video(2, "Tiếng Anh cơ bản")])
+    index.remove([1])
+    assert 1 not in index
+    assert index.search("viet") == set()
+    assert index.search("co ban") == {2}
+    # Short queries read the sorted vocabulary: it must have lost the removed tokens too
+    assert index.search("vi") == set()
+
+    index.add(1, "yt00001", "Tiếng Việt nâng cao", "2024-01-02 00:00:00")
+    assert index.search("viet") == {1}
+    assert index.search("vi") == {1}
+    assert index.search("nang cao") == {1}
+    assert index.search("co ban") == {2}
+    assert index.sorted_ids({1, 2}) == [1, 2]
+
+def test_add_replaces_the_title_of_an_indexed_video():
+    index = LibraryIndex([video(1, "Old title")])
+    index.add(1, "yt00001", "New name", "2024-01-01 00:00:00")
+    assert index.search("old") == set()
+    assert index.search("new") == {1}
+    assert len(index) == 1
+
+def test_search_takes_a_keystroke_at_50k_rows():
+    rng = random.Random(44)
+    words = ["tiếng", "việt", "english", "lesson", "podcast", "news", "đà", "nẵng", "music", "live",
+             "interview", "review", "học", "nấu", "ăn", "travel", "vlog", "story", "science", "history"]
+    index = LibraryIndex([
+        video(n, " ".join(rng.choice(words) for _ in range(6)) + f" part {n}",
+              download_date=f"2024-01-01 00:00:{n:06d}")
+        for n in range(LIBRARY_ROWS)
+    ])
+    assert len(index) == LIBRARY_ROWS
+
+    def best_of_three(text):
+        times = []
+        for _ in range(3):
+            started = time.perf_counter()
+            result = index.search(text)
+            times.append((time.perf_counter() - started) * 1000)
+        return result, min(times)
+
+    for text in ("viet", "nang", "podcast lesson", "interview 4999"):
+        result, elapsed = best_of_three(text)
+        assert result, text
+        assert elapsed < KEYSTROKE_BUDGET_MS, f"{text!r} took {elapsed:.1f} ms"
+    result, elapsed = best_of_three("v")
+    assert result
+    assert elapsed < SHORT_WORD_BUDGET_MS, f"'v' took {elapsed:.1f} ms"
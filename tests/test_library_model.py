@@ -0,0 +1,67 @@
+"""LibraryModel row bookkeeping and scroll frame time of the delegate-painted list at 10k rows."""
+import os
+import time
+
+import pytest
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+pytest.importorskip("PyQt6.QtWidgets")
+
+from PyQt6.QtWidgets import QApplication, QListView
+
+from src.ui.library_model import LibraryModel, LibraryFilterProxy, LibraryDelegate, VideoRole
+
+LIBRARY_ROWS = 10000
+SCROLL_STEPS = 200
+FRAME_BUDGET_MS = 16.0  # 60 Hz
+
+@pytest.fixture(scope="module")
+def qapp():
+    return QApplication.instance() or QApplication([])
+
+def video(n, date=None):
+    return {"id": n, "video_id": f"v{n:05d}", "title": f"Video {n}", "thumbnail_path": None,
+            "download_date": date or f"2024-01-01 00:00:{n:06d}", "duration": 600, "cue_count": 10}
+
+def test_rows_stay_sorted_through_insert_update_and_remove(qapp):
+    model = LibraryModel()
+    model.append_videos([video(n) for n in range(LIBRARY_ROWS, 0, -1)])
+    assert model.rowCount() == LIBRARY_ROWS
+    assert model.row_of(LIBRARY_ROWS) == 0 and model.row_of(1) == LIBRARY_ROWS - 1
+
+    model.remove_video(5000)
+    assert model.row_of(5000) == -1 and model.rowCount() == LIBRARY_ROWS - 1
+    model.insert_video(video(5000))
+    assert model.row_of(5000) == LIBRARY_ROWS - 5000
+    # A newer download date moves the row to the top
+    model.update_video(video(1, "2025-01-01 00:00:00"))
+    assert model.row_of(1) == 0
+    assert model.index(0).data(VideoRole)["id"] == 1
+
+def test_scrolling_10k_rows_fits_a_frame(qapp):
+    model = LibraryModel()
+    proxy = LibraryFilterProxy()
+    proxy.setSourceModel(model)
+    delegate = LibraryDelegate()
+    view = QListView()
+    view.setModel(proxy)
+    view.setItemDelegate(delegate)
+    view.setUniformItemSizes(True)
+    view.setVerticalScrollMode(QListView.ScrollMode.ScrollPerPixel)
+    model.append_videos([video(n) for n in range(LIBRARY_ROWS, 0, -1)])
+    view.resize(800, 600)
+    view.show()
+    qapp.processEvents()
+
+    scroll_bar = view.verticalScrollBar()
+    assert scroll_bar.maximum() > 0
+    frames = []
+    for step in range(SCROLL_STEPS + 1):
+        scroll_bar.setValue(scroll_bar.maximum() * step // SCROLL_STEPS)
+        started = time.perf_counter()
+        qapp.processEvents()
+        view.viewport().repaint()
+        frames.append((time.perf_counter() - started) * 1000)
+    view.close()
+    frames.sort()
+    assert frames[int(len(frames) * 0.95)] < FRAME_BUDGET_MS, f"p95 frame {frames[int(len(frames) * 0.95)]:.1f} ms"
@@ -0,0 +1,34 @@
+"""scan_library reports the thumbnails a headless ingest left without scaled variants."""
+import os
+
+from src.models.database import save_videos
+from src.utils.library_scanner import scan_library
+from src.utils.youtube_utils import thumbnail_variant_paths
+
+def add_video(folder, n, with_variants):
+    audio_path = folder / f"audio_{n}.mp3"
+    audio_path.write_bytes(b"audio")
+    thumbnail_path = folder / f"thumb_{n}.jpg"
+    thumbnail_path.write_bytes(b"jpeg")
+    if with_variants:
+        for path in thumbnail_variant_paths(str(thumbnail_path)):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(path, "wb") as f:
+                f.write(b"small jpeg")
+    return {"video_id": f"scan{n}", "title": f"Video {n}", "audio_path": str(audio_path),
+            "subtitle_path": None, "thumbnail_path": str(thumbnail_path),
+            "download_date": f"2024-01-01 00:00:0{n}"}
+
+def test_thumbnails_without_fresh_variants_are_reported(library_db, tmp_path):
+    downloads = tmp_path / "downloads"
+    downloads.mkdir()
+    videos = [add_video(downloads, 1, True), add_video(downloads, 2, False), add_video(downloads, 3, True)]
+    save_videos(videos)
+    # Thumbnail 3 was re-downloaded after its variants were made
+    variant_mtime = os.stat(thumbnail_variant_paths(videos[2]["thumbnail_path"])[0]).st_mtime
+    os.utime(videos[2]["thumbnail_path"], (variant_mtime + 10, variant_mtime + 10))
+
+    report = scan_library(str(downloads))
+
+    assert report.missing_variants == [videos[1]["thumbnail_path"], videos[2]["thumbnail_path"]]
+    assert not report.orphans  # The scaled/ folder is not a file of the download folder
@@ -0,0 +1,88 @@
+"""download_thumbnail against a local HTTP stand-in for img.youtube.com."""
+import os
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+pytest.importorskip("requests")
+
+from src.utils import youtube_utils
+from src.utils.youtube_utils import download_thumbnail, flush_thumbnail_cache, THUMBNAIL_CACHE_FILE
+
+IMAGES = {
+    "/vi/video_hq/hqdefault.jpg": b"hq image",
+    "/vi/video_hq/default.jpg": b"default image",
+    "/vi/video_sd/default.jpg": b"sd default image",  # No hqdefault: 404
+}
+
+class ThumbnailHandler(BaseHTTPRequestHandler):
+    requests_seen = []
+
+    def do_GET(self):
+        self.requests_seen.append((self.path, self.headers.get("If-None-Match")))
+        body = IMAGES.get(self.path)
+        if body is None:
+            self.send_response(404)
+            self.end_headers()
+            return
+        etag = f'"{len(body)}"'
+        if self.headers.get("If-None-Match") == etag:
+            self.send_response(304)
+            self.end_headers()
+            return
+        self.send_response(200)
+        self.send_header("ETag", etag)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+@pytest.fixture
+def thumbnail_server(monkeypatch):
+    server = ThreadingHTTPServer(("127.0.0.1", 0), ThumbnailHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    ThumbnailHandler.requests_seen = []
+    monkeypatch.setattr(youtube_utils, "THUMBNAIL_BASE_URL", f"http://127.0.0.1:{server.server_port}/vi")
+    yield ThumbnailHandler.requests_seen
+    server.shutdown()
+    server.server_close()
+
+def test_download_then_revalidate_with_304(thumbnail_server, tmp_path):
+    path = download_thumbnail("video_hq", str(tmp_path))
+    assert path == os.path.join(str(tmp_path), "YouTube_Thumbnail_video_hq.jpg")
+    with open(path, "rb") as f:
+        assert f.read() == b"hq image"
+    assert thumbnail_server == [("/vi/video_hq/hqdefault.jpg", None)]
+
+    # The ETag is sent back and the 304 keeps the file on disk
+    assert download_thumbnail("video_hq", str(tmp_path)) == path
+    assert thumbnail_server[-1] == ("/vi/video_hq/hqdefault.jpg", '"8"')
+    with open(path, "rb") as f:
+        assert f.read() == b"hq image"
+
+def test_falls_back_to_default_on_404(thumbnail_server, tmp_path):
+    path = download_thumbnail("video_sd", str(tmp_path))
+    assert path == os.path.join(str(tmp_path), "YouTube_Thumbnail_video_sd_default.jpg")
+    with open(path, "rb") as f:
+        assert f.read() == b"sd default image"
+    assert [request[0] for request in thumbnail_server] == ["/vi/video_sd/hqdefault.jpg", "/vi/video_sd/default.jpg"]
+
+    # The missing hqdefault is remembered: revalidating is one conditional request
+    thumbnail_server.clear()
+    assert download_thumbnail("video_sd", str(tmp_path)) == path
+    assert thumbnail_server == [("/vi/video_sd/default.jpg", '"16"')]
+
+def test_missing_thumbnail_returns_none(thumbnail_server, tmp_path):
+    assert download_thumbnail("unknown", str(tmp_path)) is None
+
+def test_batch_writes_validator_index_once(thumbnail_server, tmp_path):
+    cache_path = os.path.join(str(tmp_path), THUMBNAIL_CACHE_FILE)
+    download_thumbnail("video_hq", str(tmp_path), flush_cache=False)
+    download_thumbnail("video_sd", str(tmp_path), flush_cache=False)
+    assert not os.path.exists(cache_path)
+    flush_thumbnail_cache(str(tmp_path))
+    assert os.path.exists(cache_path)